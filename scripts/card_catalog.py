@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+BrickQuest Card Catalog
+Loads the card sets once and indexes them for fast lookups by id, type,
+faction, rarity and icon. Shared by all card scripts.
+"""
+
+import json
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, List, Any, Iterator, Optional, Tuple, Union
+
+CARDS_DIR = Path(__file__).parent.parent / 'cards'
+
+# Card sets indexed by the catalog, in load order. Later sets take precedence
+# when two sets define the same card id (core_plus overrides base_set).
+CATALOG_FILES = [
+    'base_set.json',
+    'factions/*.json',
+    'expansions/core_plus.json',
+]
+
+
+def catalog_sources(cards_dir: Path = CARDS_DIR) -> List[Path]:
+    """Expand CATALOG_FILES into the list of card files to load."""
+    sources = []
+    for pattern in CATALOG_FILES:
+        sources.extend(sorted(cards_dir.glob(pattern)))
+    return sources
+
+
+def read_card_file(path: Union[str, Path]) -> List[Dict[str, Any]]:
+    """Read the cards list from a card set JSON file."""
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    if isinstance(data, list):
+        return data
+    return data.get('cards', [])
+
+
+class CardCatalog:
+    def __init__(self, sources: Optional[List[Path]] = None, use_db: bool = True):
+        self.sources = [Path(p) for p in sources] if sources is not None else catalog_sources()
+        self.use_db = use_db
+        self._sets: Dict[Path, List[Dict[str, Any]]] = {}
+        self._db: Optional[Dict[str, List[Dict[str, Any]]]] = None
+        self._loaded = False
+
+        self._by_id: Dict[str, Dict[str, Any]] = {}
+        self._by_type: Dict[str, Tuple[Dict[str, Any], ...]] = {}
+        self._by_faction: Dict[str, Tuple[Dict[str, Any], ...]] = {}
+        self._by_rarity: Dict[str, Tuple[Dict[str, Any], ...]] = {}
+        self._by_icon: Dict[str, Tuple[Dict[str, Any], ...]] = {}
+
+    def set_cards(self, path: Union[str, Path]) -> List[Dict[str, Any]]:
+        """Return the cards of a single set file, reading it at most once."""
+        key = Path(path).resolve()
+        if key not in self._sets:
+            cards = self._db_set(key) if self.use_db else None
+            self._sets[key] = cards if cards is not None else read_card_file(key)
+        return self._sets[key]
+
+    def _db_set(self, path: Path) -> Optional[List[Dict[str, Any]]]:
+        """Fetch a set from the compiled card database, if it covers the file."""
+        import card_db
+
+        if self._db is None:
+            sources = card_db.db_sources()
+            if path not in [source.resolve() for source in sources]:
+                return None
+            self._db = card_db.load_card_db(sources)
+        return self._db.get(card_db.source_key(path))
+
+    def load(self) -> 'CardCatalog':
+        """Load every source and build the lookup indexes."""
+        by_type = defaultdict(list)
+        by_faction = defaultdict(list)
+        by_rarity = defaultdict(list)
+        by_icon = defaultdict(list)
+
+        by_id = {}
+        for source in self.sources:
+            for card in self.set_cards(source):
+                by_id[card.get('id')] = card
+
+        # Secondary indexes hold each id once, in the version that won above
+        for card in by_id.values():
+            by_type[card.get('type')].append(card)
+            by_faction[card.get('faction')].append(card)
+            by_rarity[card.get('rarity')].append(card)
+            for icon in card.get('icons') or []:
+                by_icon[icon].append(card)
+
+        # Pools are stored as tuples so they can be handed straight to
+        # random.choice() without callers copying or filtering them.
+        self._by_id = by_id
+        self._by_type = {k: tuple(v) for k, v in by_type.items()}
+        self._by_faction = {k: tuple(v) for k, v in by_faction.items()}
+        self._by_rarity = {k: tuple(v) for k, v in by_rarity.items()}
+        self._by_icon = {k: tuple(v) for k, v in by_icon.items()}
+        self._loaded = True
+        return self
+
+    def _ensure_loaded(self) -> None:
+        if not self._loaded:
+            self.load()
+
+    def get(self, card_id: str) -> Optional[Dict[str, Any]]:
+        """Look up a card by id."""
+        self._ensure_loaded()
+        return self._by_id.get(card_id)
+
+    def templates_for_type(self, card_type: str) -> Tuple[Dict[str, Any], ...]:
+        """Precomputed template pool for a card type."""
+        self._ensure_loaded()
+        return self._by_type.get(card_type, ())
+
+    def cards_of_faction(self, faction: str) -> Tuple[Dict[str, Any], ...]:
+        """All cards belonging to a faction."""
+        self._ensure_loaded()
+        return self._by_faction.get(faction, ())
+
+    def cards_of_rarity(self, rarity: str) -> Tuple[Dict[str, Any], ...]:
+        """All cards of a rarity."""
+        self._ensure_loaded()
+        return self._by_rarity.get(rarity, ())
+
+    def cards_with_icon(self, icon: str) -> Tuple[Dict[str, Any], ...]:
+        """All cards showing an icon."""
+        self._ensure_loaded()
+        return self._by_icon.get(icon, ())
+
+    def types(self) -> List[str]:
+        self._ensure_loaded()
+        return list(self._by_type)
+
+    def factions(self) -> List[str]:
+        self._ensure_loaded()
+        return list(self._by_faction)
+
+    def rarities(self) -> List[str]:
+        self._ensure_loaded()
+        return list(self._by_rarity)
+
+    def icons(self) -> List[str]:
+        self._ensure_loaded()
+        return list(self._by_icon)
+
+    def __contains__(self, card_id: str) -> bool:
+        self._ensure_loaded()
+        return card_id in self._by_id
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        """Each card id once, in the version that takes precedence."""
+        self._ensure_loaded()
+        return iter(self._by_id.values())
+
+    def __len__(self) -> int:
+        self._ensure_loaded()
+        return len(self._by_id)
+
+
+_catalog: Optional[CardCatalog] = None
+
+
+def get_catalog() -> CardCatalog:
+    """Return the process-wide catalog shared by all scripts."""
+    global _catalog
+    if _catalog is None:
+        _catalog = CardCatalog()
+    return _catalog
+
+
+def main():
+    catalog = get_catalog()
+    print(f"📚 Loaded {len(catalog)} cards from {len(catalog.sources)} files")
+    for label, keys, lookup in [
+        ('Types', catalog.types(), catalog.templates_for_type),
+        ('Factions', catalog.factions(), catalog.cards_of_faction),
+        ('Rarities', catalog.rarities(), catalog.cards_of_rarity),
+    ]:
+        counts = ', '.join(f"{key}: {len(lookup(key))}" for key in keys)
+        print(f"  {label}: {counts}")
+
+
+if __name__ == '__main__':
+    main()
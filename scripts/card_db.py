@@ -0,0 +1,314 @@
+#!/usr/bin/env python3
+"""
+BrickQuest Card Database
+Compiles the JSON and CSV card sources into a single binary database so
+scripts can skip re-parsing every card file on startup. The database is
+rebuilt automatically whenever a source file changes.
+"""
+
+import csv
+import hashlib
+import json
+import os
+import pickle
+import time
+import argparse
+from pathlib import Path
+from typing import Dict, List, Any, Iterator, Optional, Tuple
+
+from card_catalog import CARDS_DIR, catalog_sources, read_card_file
+
+DB_PATH = CARDS_DIR / '.cache' / 'cards.db'
+DB_VERSION = 1
+
+CSV_SOURCES = 'sources/*.csv'
+
+# Column layout of the rows in cards/sources/*.csv. The header line in those
+# files omits build_stl and designerNotes, so rows are read positionally.
+CSV_COLUMNS = [
+    'id', 'name', 'type', 'subtype', 'faction', 'classLock', 'rarity',
+    'cost_energy', 'cost_exhaust', 'cost_sacrifice', 'stats', 'build_lego',
+    'build_stl', 'build_footprint', 'text', 'rules', 'icons', 'flavor',
+    'limits_perDeck', 'limits_perField', 'designerNotes', 'tags',
+]
+STALE_CSV_HEADER = [column for column in CSV_COLUMNS if column not in ('build_stl', 'designerNotes')]
+
+
+def db_sources(cards_dir: Path = CARDS_DIR) -> List[Path]:
+    """All card source files compiled into the database."""
+    return catalog_sources(cards_dir) + sorted(cards_dir.glob(CSV_SOURCES))
+
+
+def split_list(value: str) -> List[str]:
+    return [item.strip() for item in value.split(';') if item.strip()]
+
+
+def parse_json_field(value: str, cache: Optional[Dict[str, Any]] = None) -> Any:
+    """Parse an embedded JSON column, reusing results for repeated strings."""
+    if cache is not None and value in cache:
+        return cache[value]
+    try:
+        parsed = json.loads(value)
+    except ValueError:
+        parsed = value
+    if cache is not None:
+        cache[value] = parsed
+    return parsed
+
+
+def csv_row_to_card(row: List[str], columns: List[str] = CSV_COLUMNS,
+                    rules_cache: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Convert one CSV row into a card dict in the cards/*.json layout."""
+    if len(row) > len(columns) and 'flavor' in columns:
+        # Unquoted commas in the flavor text spill into extra fields
+        flavor = columns.index('flavor')
+        extra = len(row) - len(columns)
+        row = (row[:flavor]
+               + [','.join(row[flavor:flavor + extra + 1])]
+               + row[flavor + extra + 1:])
+    values = {column: value.strip() for column, value in zip(columns, row)}
+
+    card: Dict[str, Any] = {
+        'id': values['id'],
+        'name': values['name'],
+        'type': values['type'][:1].upper() + values['type'][1:],
+    }
+    if values.get('subtype'):
+        card['subtype'] = split_list(values['subtype'])
+    card['faction'] = values['faction'][:1].upper() + values['faction'][1:]
+    if values.get('classLock'):
+        card['classLock'] = split_list(values['classLock'])
+    card['rarity'] = values['rarity'][:1].upper() + values['rarity'][1:]
+
+    cost: Dict[str, Any] = {'energy': int(values.get('cost_energy') or 0)}
+    if values.get('cost_exhaust') in ('true', '1'):
+        cost['exhaust'] = True
+    if values.get('cost_sacrifice'):
+        cost['sacrifice'] = values['cost_sacrifice']
+    card['cost'] = cost
+
+    if values.get('stats'):
+        card['stats'] = parse_json_field(values['stats'])
+    if values.get('build_lego') or values.get('build_stl') or values.get('build_footprint'):
+        build_req: Dict[str, Any] = {}
+        if values.get('build_lego'):
+            build_req['lego'] = split_list(values['build_lego'])
+        if values.get('build_stl'):
+            build_req['stl'] = split_list(values['build_stl'])
+        if values.get('build_footprint'):
+            build_req['footprint'] = values['build_footprint']
+        card['buildReq'] = build_req
+
+    card['text'] = values.get('text', '')
+    rules = parse_json_field(values['rules'], rules_cache) if values.get('rules') else {}
+    card['rules'] = rules if isinstance(rules, dict) else {}
+    if values.get('icons'):
+        card['icons'] = split_list(values['icons'])
+    if values.get('flavor'):
+        card['flavor'] = values['flavor']
+
+    limits = {}
+    for key in ('perDeck', 'perField'):
+        if values.get(f'limits_{key}', '').isdigit():
+            limits[key] = int(values[f'limits_{key}'])
+    if limits:
+        card['limits'] = limits
+    if values.get('designerNotes'):
+        card['designerNotes'] = values['designerNotes']
+
+    card['v'] = 2
+    return card
+
+
+def csv_columns(header: List[str]) -> List[str]:
+    """Column layout of a CSV source, chosen from its header line.
+    
+    Files with the stale header are written in the full CSV_COLUMNS layout;
+    any other header names its own columns.
+    """
+    names = [name.strip() for name in header]
+    return CSV_COLUMNS if names == STALE_CSV_HEADER else names
+
+
+def iter_csv_cards(path: Path, rules_cache: Optional[Dict[str, Any]] = None) -> Iterator[Dict[str, Any]]:
+    """Stream cards out of a CSV source file one row at a time."""
+    with open(path, 'r', encoding='utf-8', newline='') as f:
+        reader = csv.reader(f, escapechar='\\')
+        header = next(reader, None)
+        if header is None:
+            return
+        columns = csv_columns(header)
+        for row in reader:
+            if not row or not row[0].strip():
+                continue
+            yield csv_row_to_card(row, columns, rules_cache)
+
+
+def read_source(path: Path) -> List[Dict[str, Any]]:
+    """Read the cards from a JSON or CSV source."""
+    if path.suffix == '.csv':
+        return list(iter_csv_cards(path))
+    return read_card_file(path)
+
+
+def file_digest(path: Path) -> str:
+    """Content hash of a source file."""
+    digest = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 16), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def source_key(path: Path, cards_dir: Path = CARDS_DIR) -> str:
+    """Database key for a source file, relative to the cards directory."""
+    try:
+        return path.resolve().relative_to(cards_dir.resolve()).as_posix()
+    except ValueError:
+        return path.resolve().as_posix()
+
+
+def source_stamp(path: Path) -> Dict[str, Any]:
+    stat = path.stat()
+    return {'mtime': stat.st_mtime_ns, 'size': stat.st_size}
+
+
+def write_card_db(header: Dict[str, Any], sets: Dict[str, List[Dict[str, Any]]],
+                  db_path: Path = DB_PATH) -> None:
+    """Write the database as a header record followed by the card sets."""
+    db_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = db_path.with_suffix('.tmp')
+    with open(tmp_path, 'wb') as f:
+        pickle.dump(header, f, protocol=pickle.HIGHEST_PROTOCOL)
+        pickle.dump(sets, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_path, db_path)
+
+
+def read_db_header(db_path: Path = DB_PATH) -> Optional[Dict[str, Any]]:
+    """Read only the header record, without unpickling the card sets."""
+    try:
+        with open(db_path, 'rb') as f:
+            header = pickle.load(f)
+    except (OSError, EOFError, pickle.UnpicklingError):
+        return None
+    if not isinstance(header, dict) or header.get('version') != DB_VERSION:
+        return None
+    return header
+
+
+def compile_card_db(sources: Optional[List[Path]] = None,
+                    db_path: Path = DB_PATH) -> Dict[str, List[Dict[str, Any]]]:
+    """Parse every source and write a fresh database."""
+    sources = sources if sources is not None else db_sources()
+    header = {'version': DB_VERSION, 'sources': {}}
+    sets = {}
+    for path in sources:
+        key = source_key(path)
+        stamp = source_stamp(path)
+        stamp['sha1'] = file_digest(path)
+        header['sources'][key] = stamp
+        sets[key] = read_source(path)
+    try:
+        write_card_db(header, sets, db_path)
+    except OSError as e:
+        print(f"Warning: could not write card database {db_path}: {e}")
+    return sets
+
+
+def stale_sources(header: Dict[str, Any], sources: List[Path]) -> Tuple[List[str], bool]:
+    """Return the keys whose content changed, and whether any stamp moved.
+
+    Files whose mtime or size changed are re-hashed, so touching a file
+    without editing it does not force a rebuild.
+    """
+    stored = header['sources']
+    changed = []
+    touched = False
+    keys = set()
+    for path in sources:
+        key = source_key(path)
+        keys.add(key)
+        if key not in stored:
+            changed.append(key)
+            continue
+        stamp = source_stamp(path)
+        if stamp['mtime'] == stored[key]['mtime'] and stamp['size'] == stored[key]['size']:
+            continue
+        touched = True
+        if file_digest(path) != stored[key]['sha1']:
+            changed.append(key)
+        else:
+            stored[key].update(stamp)
+    changed.extend(key for key in stored if key not in keys)
+    return changed, touched
+
+
+def load_card_db(sources: Optional[List[Path]] = None, db_path: Path = DB_PATH,
+                 rebuild: bool = False) -> Dict[str, List[Dict[str, Any]]]:
+    """Load the card sets, recompiling the database only if a source changed."""
+    sources = sources if sources is not None else db_sources()
+    header = None if rebuild else read_db_header(db_path)
+    if header is None:
+        return compile_card_db(sources, db_path)
+
+    changed, touched = stale_sources(header, sources)
+    if changed:
+        return compile_card_db(sources, db_path)
+
+    with open(db_path, 'rb') as f:
+        pickle.load(f)
+        sets = pickle.load(f)
+    if touched:
+        # Content is unchanged; refresh the stored stamps so the next
+        # startup skips hashing again.
+        try:
+            write_card_db(header, sets, db_path)
+        except OSError:
+            pass
+    return sets
+
+
+def benchmark(rounds: int = 20) -> None:
+    """Compare cold JSON/CSV parsing against loading the compiled database."""
+    sources = db_sources()
+    load_card_db(sources)
+
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for path in sources:
+            read_source(path)
+    cold = (time.perf_counter() - start) / rounds
+
+    start = time.perf_counter()
+    for _ in range(rounds):
+        load_card_db(sources)
+    cached = (time.perf_counter() - start) / rounds
+
+    total = sum(len(cards) for cards in load_card_db(sources).values())
+    print(f"📊 {len(sources)} source files, {total} cards ({rounds} rounds)")
+    print(f"  Cold parse:      {cold * 1000:8.2f} ms")
+    print(f"  Cached database: {cached * 1000:8.2f} ms")
+    if cached > 0:
+        print(f"  Speedup:         {cold / cached:8.1f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compile the BrickQuest card database')
+    parser.add_argument('--rebuild', action='store_true', help='Force a full rebuild')
+    parser.add_argument('--benchmark', action='store_true', help='Compare cold and cached startup time')
+    parser.add_argument('--rounds', type=int, default=20, help='Benchmark rounds')
+
+    args = parser.parse_args()
+
+    if args.benchmark:
+        benchmark(args.rounds)
+        return
+
+    sets = load_card_db(rebuild=args.rebuild)
+    print(f"✅ Card database: {DB_PATH}")
+    for key, cards in sets.items():
+        print(f"  {key}: {len(cards)} cards")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+"""
+BrickQuest Card Model
+Compact, immutable card records. Cards keep the common fields in slots,
+intern their repeated strings and share nested data between variants, so a
+copy with a changed field costs one small object instead of a deep copy.
+"""
+
+import json
+import sys
+from typing import Dict, List, Any, Iterator, Tuple
+
+# Fields stored in slots; anything else a card carries lives in 'extra'
+CARD_FIELDS = (
+    'id', 'name', 'type', 'faction', 'rarity', 'cost', 'text', 'rules',
+    'icons', 'description', 'effects', 'range', 'damage',
+)
+_SLOT_FIELDS = frozenset(CARD_FIELDS)
+_INTERNED_FIELDS = frozenset(['type', 'faction', 'rarity'])
+
+# Key orders are shared between every card with the same layout
+_orders: Dict[Tuple[str, ...], Tuple[str, ...]] = {}
+
+
+class FrozenDict(dict):
+    """A dict that refuses changes after construction.
+
+    It is still a dict, so json, printing and read-only callers handle it
+    unchanged.
+    """
+
+    def _readonly(self, *args, **kwargs):
+        raise TypeError("card data is immutable; use Card.replace() to make a changed copy")
+
+    __setitem__ = __delitem__ = clear = pop = popitem = setdefault = update = __ior__ = _readonly
+
+    def __reduce__(self):
+        return FrozenDict, (dict(self),)
+
+
+def freeze(value: Any) -> Any:
+    """Recursively convert JSON data to immutable, interned form."""
+    if isinstance(value, FrozenDict):
+        return value
+    if isinstance(value, dict):
+        return FrozenDict((sys.intern(k) if isinstance(k, str) else k, freeze(v)) for k, v in value.items())
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(v) for v in value)
+    return value
+
+
+def thaw(value: Any) -> Any:
+    """Recursively convert frozen data back to plain dicts and lists."""
+    if isinstance(value, dict):
+        return {k: thaw(v) for k, v in value.items()}
+    if isinstance(value, tuple):
+        return [thaw(v) for v in value]
+    return value
+
+
+def _intern_field(key: str, value: Any) -> Any:
+    if key in _INTERNED_FIELDS and isinstance(value, str):
+        return sys.intern(value)
+    if key == 'icons' and isinstance(value, (list, tuple)):
+        return tuple(sys.intern(v) if isinstance(v, str) else v for v in value)
+    return freeze(value)
+
+
+class Card:
+    """An immutable card.
+
+    Supports read-only mapping access (card['name'], card.get('cost'),
+    'range' in card) so code written against card dicts keeps working.
+    Keys are reported in their original order, which to_dict() and
+    to_json() preserve.
+    """
+
+    __slots__ = CARD_FIELDS + ('extra', 'order')
+
+    def __init__(self, **fields: Any):
+        extra = {}
+        for key in CARD_FIELDS:
+            object.__setattr__(self, key, None)
+        for key, value in fields.items():
+            value = _intern_field(key, value)
+            if key in _SLOT_FIELDS:
+                object.__setattr__(self, key, value)
+            else:
+                extra[sys.intern(key)] = value
+        object.__setattr__(self, 'extra', FrozenDict(extra) if extra else None)
+        order = tuple(fields)
+        object.__setattr__(self, 'order', _orders.setdefault(order, order))
+
+    def __setattr__(self, key, value):
+        raise AttributeError("Card is immutable; use replace()")
+
+    __delattr__ = __setattr__
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'Card':
+        return cls(**data)
+
+    @classmethod
+    def from_json(cls, text: str) -> 'Card':
+        return cls(**json.loads(text))
+
+    @classmethod
+    def _restore(cls, values: Tuple[Any, ...]) -> 'Card':
+        card = cls.__new__(cls)
+        for key, value in zip(cls.__slots__, values):
+            object.__setattr__(card, key, value)
+        return card
+
+    def __reduce__(self):
+        return Card._restore, (tuple(getattr(self, key) for key in self.__slots__),)
+
+    def replace(self, **changes: Any) -> 'Card':
+        """Copy with some fields changed. Unchanged values are shared, not copied."""
+        card = Card.__new__(Card)
+        extra = dict(self.extra) if self.extra else {}
+        new_keys = []
+        for key in self.__slots__:
+            object.__setattr__(card, key, getattr(self, key))
+        for key, value in changes.items():
+            value = _intern_field(key, value)
+            if key in _SLOT_FIELDS:
+                object.__setattr__(card, key, value)
+            else:
+                extra[sys.intern(key)] = value
+            if key not in self.order:
+                new_keys.append(key)
+        if extra != (self.extra or {}):
+            object.__setattr__(card, 'extra', FrozenDict(extra))
+        if new_keys:
+            order = self.order + tuple(new_keys)
+            object.__setattr__(card, 'order', _orders.setdefault(order, order))
+        return card
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in self.order:
+            raise KeyError(key)
+        if key in _SLOT_FIELDS:
+            return getattr(self, key)
+        return self.extra[key]
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return self[key] if key in self.order else default
+
+    def __contains__(self, key: object) -> bool:
+        return key in self.order
+
+    def keys(self) -> Tuple[str, ...]:
+        return self.order
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.order)
+
+    def __len__(self) -> int:
+        return len(self.order)
+
+    def items(self) -> List[Tuple[str, Any]]:
+        return [(key, self[key]) for key in self.order]
+
+    def json_view(self) -> Dict[str, Any]:
+        """Shallow dict of the card for json encoding; nested data stays shared."""
+        return {key: self[key] for key in self.order}
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Plain, independently mutable dict copy of the card."""
+        return {key: thaw(self[key]) for key in self.order}
+
+    def to_json(self, **kwargs: Any) -> str:
+        return json.dumps(self.json_view(), **kwargs)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Card):
+            return NotImplemented
+        return self.items() == other.items()
+
+    def __repr__(self) -> str:
+        return f"Card(id={self.id!r}, name={self.name!r}, type={self.type!r}, rarity={self.rarity!r})"
+
+
+def json_default(value: Any) -> Any:
+    """json.dump(s) hook so Card objects can be written alongside plain data."""
+    if isinstance(value, Card):
+        return value.json_view()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def cards_from_dicts(cards: List[Dict[str, Any]]) -> List[Card]:
+    return [Card.from_dict(card) for card in cards]
+
+
+def card_memory(cards: List[Any]) -> int:
+    """Approximate bytes held by a list of cards, counting shared objects once."""
+    seen = set()
+    total = 0
+    stack = list(cards)
+    while stack:
+        value = stack.pop()
+        if id(value) in seen:
+            continue
+        seen.add(id(value))
+        total += sys.getsizeof(value)
+        if isinstance(value, Card):
+            stack.extend(getattr(value, key) for key in Card.__slots__)
+        elif isinstance(value, dict):
+            stack.extend(value.keys())
+            stack.extend(value.values())
+        elif isinstance(value, (list, tuple)):
+            stack.extend(value)
+    return total
+
+
+def check_rarity_variants(catalog) -> bool:
+    """Scale every base_set template to every rarity and confirm the
+    catalog's copies of the templates come through unchanged."""
+    from generate_cards import CardGenerator, RARITY_MULTIPLIERS
+
+    generator = CardGenerator(catalog, seed=1)
+    before = json.dumps(generator.card_templates, sort_keys=True)
+    scaled = 0
+    for card_type in sorted({template['type'] for template in generator.card_templates}):
+        for template in generator.template_cards(card_type):
+            for rarity in RARITY_MULTIPLIERS:
+                variant = template.replace(**generator.rarity_changes(template, rarity))
+                scaled += variant.to_dict() != template.to_dict()
+            generator.generate_random_card(card_type, 'legendary')
+    return scaled > 0 and json.dumps(generator.card_templates, sort_keys=True) == before
+
+
+def main():
+    from card_catalog import get_catalog
+
+    catalog = get_catalog()
+    dicts = list(catalog)
+    cards = cards_from_dicts(dicts)
+    round_trip = [card.to_dict() for card in cards] == dicts
+    rarity_copies = check_rarity_variants(catalog)
+    print(f"📚 {len(cards)} catalog cards")
+    print(f"  Round trip: {'ok' if round_trip else 'MISMATCH'}")
+    print(f"  Rarity variants leave templates unchanged: {'ok' if rarity_copies else 'FAILED'}")
+    print(f"  As dicts: {card_memory(dicts):>10,} bytes")
+    print(f"  As Cards: {card_memory(cards):>10,} bytes")
+    if not (round_trip and rarity_copies):
+        raise SystemExit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+BrickQuest Booster Pack Simulator
+Opens weighted booster packs of catalog cards for generate_cards.py --packs
+and reports collation statistics. Needs numpy, so it is only imported in
+pack mode.
+"""
+
+import json
+import time
+import random
+from pathlib import Path
+from typing import Dict, List, Any, Iterable, Iterator, Optional
+
+import numpy as np
+
+from card_catalog import CardCatalog, get_catalog
+
+# Pack opening: share of pack slots per rarity (docs/CARD_PRINTING_GUIDE.md).
+# The catalog's Mythic tier takes the Legendary share.
+PACK_SIZE = 10
+PACK_RARITY_WEIGHTS = {
+    'common': 60,
+    'uncommon': 25,
+    'rare': 12,
+    'legendary': 3,
+    'mythic': 3
+}
+
+# Packs per vectorized batch; like generator shards, batches own their random streams
+PACK_BATCH = 100000
+
+class AliasTable:
+    """Walker's alias method: O(1) draws from a fixed discrete distribution.
+    
+    Each column holds a probability and an alias, so a draw is one uniform
+    column pick plus one biased coin flip, however many outcomes there are.
+    """
+    
+    def __init__(self, weights: Iterable[float]):
+        weights = np.asarray(list(weights), dtype=float)
+        if len(weights) == 0 or weights.min() < 0 or weights.sum() <= 0:
+            raise ValueError("alias table needs non-negative weights with a positive total")
+        n = len(weights)
+        scaled = weights * n / weights.sum()
+        self.prob = np.ones(n)
+        self.alias = np.arange(n)
+        small = [i for i in range(n) if scaled[i] < 1.0]
+        large = [i for i in range(n) if scaled[i] >= 1.0]
+        while small and large:
+            low, high = small.pop(), large.pop()
+            self.prob[low] = scaled[low]
+            self.alias[low] = high
+            scaled[high] -= 1.0 - scaled[low]
+            (small if scaled[high] < 1.0 else large).append(high)
+        # Whatever is left is 1 up to rounding error
+        self.prob[small + large] = 1.0
+    
+    def sample(self, rng: np.random.Generator, shape) -> np.ndarray:
+        columns = rng.integers(0, len(self.prob), size=shape)
+        return np.where(rng.random(shape) < self.prob[columns], columns, self.alias[columns])
+
+def parse_rarity_weights(text: str) -> Dict[str, float]:
+    """Parse 'common=60,uncommon=25,...' into rarity weights."""
+    weights = {}
+    for part in text.split(','):
+        rarity, sep, value = part.partition('=')
+        if not sep:
+            raise ValueError(f"expected rarity=weight, got {part!r}")
+        weights[rarity.strip().lower()] = float(value)
+    return weights
+
+class PackSimulator:
+    """Opens booster packs of real catalog cards, weighted by rarity.
+    
+    A rarity's pack share is split evenly between its cards, and cards are
+    drawn independently from one alias table, so duplicates within a pack
+    are possible. Rarities without a weight are never pulled.
+    """
+    
+    def __init__(self, catalog: Optional[CardCatalog] = None, weights: Optional[Dict[str, float]] = None,
+                 pack_size: int = PACK_SIZE):
+        catalog = catalog if catalog is not None else get_catalog()
+        weights = {k.lower(): v for k, v in (weights or PACK_RARITY_WEIGHTS).items()}
+        self.pack_size = pack_size
+        
+        by_rarity: Dict[str, List[str]] = {}
+        for card in catalog:
+            by_rarity.setdefault(str(card.get('rarity')), []).append(card.get('id'))
+        
+        self.excluded = {r: len(ids) for r, ids in by_rarity.items() if weights.get(r.lower(), 0) <= 0}
+        self.rarities = [r for r in by_rarity if r not in self.excluded]
+        if not self.rarities:
+            raise ValueError("no catalog rarity has a positive pack weight")
+        self.ids: List[str] = []
+        card_weights = []
+        rarity_codes = []
+        for code, rarity in enumerate(self.rarities):
+            ids = by_rarity[rarity]
+            self.ids.extend(ids)
+            card_weights.extend([weights[rarity.lower()] / len(ids)] * len(ids))
+            rarity_codes.extend([code] * len(ids))
+        self.card_rarity = np.array(rarity_codes)
+        self.table = AliasTable(card_weights)
+        total = sum(weights[r.lower()] for r in self.rarities)
+        self.expected_share = np.array([weights[r.lower()] / total for r in self.rarities])
+    
+    def open_packs(self, count: int, seed: int, batch: int = 0, stream: int = 0) -> np.ndarray:
+        """A (count x pack_size) array of card indexes."""
+        rng = np.random.default_rng(np.random.SeedSequence([seed, stream, batch]))
+        return self.table.sample(rng, (count, self.pack_size))
+    
+    def iter_pack_batches(self, packs: int, seed: int) -> Iterator[np.ndarray]:
+        for batch, start in enumerate(range(0, packs, PACK_BATCH)):
+            yield self.open_packs(min(PACK_BATCH, packs - start), seed, batch)
+    
+    def collation(self, packs: int, seed: int, output: Optional[Path] = None) -> Dict[str, Any]:
+        """Pull counts and within-pack duplicate rates over many packs."""
+        pulls = np.zeros(len(self.ids), dtype=np.int64)
+        packs_with_duplicates = 0
+        duplicate_cards = 0
+        out = open(output, 'w', encoding='utf-8') if output else None
+        try:
+            for batch in self.iter_pack_batches(packs, seed):
+                pulls += np.bincount(batch.ravel(), minlength=len(self.ids))
+                repeats = (np.diff(np.sort(batch, axis=1), axis=1) == 0).sum(axis=1)
+                packs_with_duplicates += int((repeats > 0).sum())
+                duplicate_cards += int(repeats.sum())
+                if out:
+                    ids = np.array(self.ids)[batch]
+                    out.writelines(json.dumps(row) + '\n' for row in ids.tolist())
+        finally:
+            if out:
+                out.close()
+        return {
+            'packs': packs,
+            'pulls': pulls,
+            'rarity_share': np.bincount(self.card_rarity, weights=pulls, minlength=len(self.rarities)) / max(pulls.sum(), 1),
+            'packs_with_duplicates': packs_with_duplicates,
+            'duplicate_cards': duplicate_cards,
+        }
+    
+    def packs_to_complete(self, collectors: int, seed: int, chunk: int = 50) -> np.ndarray:
+        """Packs each collector opens before owning every card.
+        
+        All collectors open packs in chunks at once; each card's first
+        appearance is tracked and a collector is done when every card has
+        appeared.
+        """
+        first_seen = np.full((collectors, len(self.ids)), np.iinfo(np.int64).max, dtype=np.int64)
+        active = np.arange(collectors)
+        opened = 0
+        batch = 0
+        while len(active):
+            packs = self.open_packs(len(active) * chunk, seed, batch, stream=1).reshape(len(active), -1)
+            pack_number = np.broadcast_to(opened + 1 + np.arange(chunk).repeat(self.pack_size), packs.shape)
+            rows = np.broadcast_to(np.arange(len(active))[:, None], packs.shape)
+            seen = first_seen[active]
+            np.minimum.at(seen, (rows, packs), pack_number)
+            first_seen[active] = seen
+            opened += chunk
+            batch += 1
+            active = active[first_seen[active].max(axis=1) == np.iinfo(np.int64).max]
+        return first_seen.max(axis=1)
+
+def print_pack_report(simulator: PackSimulator, stats: Dict[str, Any], completion: np.ndarray, elapsed: float) -> None:
+    packs = stats['packs']
+    cards = packs * simulator.pack_size
+    print(f"\n📦 Opened {packs:,} packs of {simulator.pack_size} ({cards:,} cards) in {elapsed:.2f}s "
+          f"({packs / elapsed if elapsed > 0 else float('inf'):,.0f} packs/sec)")
+    print(f"  Pool: {len(simulator.ids)} cards")
+    for rarity, count in simulator.excluded.items():
+        print(f"  ⚠️  {count} {rarity} cards have no pack weight and are never pulled")
+    print("  Rarity share (pulled vs configured):")
+    for code, rarity in enumerate(simulator.rarities):
+        print(f"    {rarity:<10} {stats['rarity_share'][code]:6.2%}  {simulator.expected_share[code]:6.2%}")
+    print(f"  Packs with a duplicate: {stats['packs_with_duplicates'] / packs:.2%}; "
+          f"{stats['duplicate_cards'] / cards:.2%} of pulled cards repeat one in the same pack")
+    pulls = stats['pulls']
+    print(f"  Pulls per card: min {pulls.min():,} ({simulator.ids[int(pulls.argmin())]}), "
+          f"max {pulls.max():,} ({simulator.ids[int(pulls.argmax())]})")
+    if len(completion):
+        owned = len(simulator.ids)
+        print(f"\n🏆 Time to a full set ({len(completion):,} collectors):")
+        print(f"  Packs: mean {completion.mean():.1f}, median {np.median(completion):.0f}, "
+              f"90th pct {np.percentile(completion, 90):.0f}, max {completion.max()}")
+        print(f"  Duplicate rate at completion: {1 - owned / (completion.mean() * simulator.pack_size):.1%} of cards pulled")
+
+def run_pack_mode(args) -> None:
+    """Open packs, report collation statistics, and optionally write the packs."""
+    weights = parse_rarity_weights(args.pack_weights) if args.pack_weights else None
+    seed = args.seed if args.seed is not None else random.SystemRandom().getrandbits(64)
+    simulator = PackSimulator(weights=weights, pack_size=args.pack_size if args.pack_size is not None else PACK_SIZE)
+    output = Path(args.pack_output) if args.pack_output else None
+    
+    start = time.perf_counter()
+    stats = simulator.collation(args.packs, seed, output)
+    elapsed = time.perf_counter() - start
+    completion = simulator.packs_to_complete(args.collectors, seed) if args.collectors else np.array([])
+    print_pack_report(simulator, stats, completion, elapsed)
+    if output:
+        print(f"\nWrote {args.packs:,} packs to {output}")
@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""
+BrickQuest Card PDF Renderer
+Draws printable card sheets straight to PDF with reportlab, so print runs
+no longer need a browser. Uses the same 3x3 A4 layout as the HTML sheets.
+"""
+
+import time
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, Any, Optional, Tuple
+
+from reportlab.lib.colors import Color, HexColor, white
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.units import inch
+from reportlab.lib.utils import simpleSplit
+from reportlab.pdfbase.pdfmetrics import stringWidth
+from reportlab.pdfgen import canvas
+
+from print_cards import CardPrinter, CARDS_PER_PAGE
+
+CARD_WIDTH = 2.5 * inch
+CARD_HEIGHT = 3.5 * inch
+GAP = 0.1 * inch
+COLUMNS = 3
+
+# Pages per PDF volume; reportlab keeps a document in memory until it is saved
+PAGES_PER_FILE = 500
+
+FONT = 'Helvetica'
+FONT_BOLD = 'Helvetica-Bold'
+
+# Text labels stand in for the HTML emoji, which the base PDF fonts lack
+TYPE_BADGES = {
+    'action': 'ACT',
+    'structure': 'STR',
+    'program': 'PRG',
+    'event': 'EVT',
+    'upgrade': 'UPG',
+    'reaction': 'REA',
+    'loot': 'LOT',
+}
+
+STAT_LABELS = [('damage', 'DMG'), ('range', 'RNG'), ('duration', 'DUR')]
+
+
+@lru_cache(maxsize=None)
+def rarity_colors(hex_color: str) -> Tuple[Color, Color]:
+    """Border color and the pale header tint (the HTML's '20' alpha) for a rarity."""
+    border = HexColor(hex_color)
+    alpha = 0x20 / 255
+    tint = Color(1 - (1 - border.red) * alpha, 1 - (1 - border.green) * alpha, 1 - (1 - border.blue) * alpha)
+    return border, tint
+
+
+@lru_cache(maxsize=4096)
+def wrap_text(text: str, font: str, size: float, width: float) -> Tuple[str, ...]:
+    """Line-wrap text once per distinct (text, font, size, width)."""
+    return tuple(simpleSplit(text, font, size, width))
+
+
+@lru_cache(maxsize=4096)
+def fit_font_size(text: str, font: str, size: float, width: float) -> float:
+    """Shrink a single-line label until it fits the given width."""
+    while size > 6 and stringWidth(text, font, size) > width:
+        size -= 0.5
+    return size
+
+
+class CardPdfRenderer:
+    def __init__(self, printer: CardPrinter = None):
+        self.printer = printer or CardPrinter()
+        page_width, page_height = A4
+        grid_width = COLUMNS * CARD_WIDTH + (COLUMNS - 1) * GAP
+        rows = CARDS_PER_PAGE // COLUMNS
+        grid_height = rows * CARD_HEIGHT + (rows - 1) * GAP
+        left = (page_width - grid_width) / 2
+        top = (page_height + grid_height) / 2
+        self.slots = [
+            (left + col * (CARD_WIDTH + GAP), top - (row + 1) * CARD_HEIGHT - row * GAP)
+            for row in range(rows) for col in range(COLUMNS)
+        ]
+        self._forms: Dict[str, str] = {}
+
+    def card_frame(self, c: canvas.Canvas, rarity: str) -> str:
+        """Card border and header band for a rarity, drawn once per PDF as a
+        reusable form and then referenced by every card of that rarity."""
+        name = f"frame_{rarity}"
+        if name not in self._forms:
+            border, tint = rarity_colors(self.printer.get_rarity_color(rarity))
+            c.beginForm(name)
+            c.setFillColor(white)
+            c.setStrokeColor(border)
+            c.setLineWidth(2)
+            c.roundRect(0, 0, CARD_WIDTH, CARD_HEIGHT, 8, stroke=1, fill=1)
+            c.setFillColor(tint)
+            c.rect(1, CARD_HEIGHT - 0.45 * inch, CARD_WIDTH - 2, 0.45 * inch - 1, stroke=0, fill=1)
+            c.setStrokeColor(HexColor('#dddddd'))
+            c.setLineWidth(0.75)
+            c.line(1, CARD_HEIGHT - 0.45 * inch, CARD_WIDTH - 1, CARD_HEIGHT - 0.45 * inch)
+            c.line(1, 0.3 * inch, CARD_WIDTH - 1, 0.3 * inch)
+            c.endForm()
+            self._forms[name] = name
+        return self._forms[name]
+
+    def type_badge(self, c: canvas.Canvas, card_type: str) -> str:
+        """Type badge drawn once per PDF as a reusable form."""
+        name = f"badge_{card_type}"
+        if name not in self._forms:
+            label = TYPE_BADGES.get(card_type, card_type[:3].upper() or '?')
+            c.beginForm(name)
+            c.setFillColor(HexColor('#333333'))
+            c.roundRect(0, 0, 0.36 * inch, 0.2 * inch, 3, stroke=0, fill=1)
+            c.setFillColor(white)
+            c.setFont(FONT_BOLD, 7)
+            c.drawCentredString(0.18 * inch, 0.065 * inch, label)
+            c.endForm()
+            self._forms[name] = name
+        return self._forms[name]
+
+    def draw_card(self, c: canvas.Canvas, card: Dict[str, Any], x: float, y: float) -> None:
+        """Draw one card with its bottom-left corner at (x, y)."""
+        rarity = str(card.get('rarity', 'common')).lower()
+        card_type = str(card.get('type', 'action')).lower()
+        cost = card.get('cost', {})
+        energy = cost.get('energy', 0) if isinstance(cost, dict) else cost
+
+        c.saveState()
+        c.translate(x, y)
+        c.doForm(self.card_frame(c, rarity))
+
+        # Header: type badge, name, cost
+        header_y = CARD_HEIGHT - 0.3 * inch
+        c.saveState()
+        c.translate(6, header_y - 2)
+        c.doForm(self.type_badge(c, card_type))
+        c.restoreState()
+        name = str(card.get('name', 'Unknown'))
+        name_width = CARD_WIDTH - 0.36 * inch - 0.45 * inch
+        c.setFillColor(HexColor('#111111'))
+        c.setFont(FONT_BOLD, fit_font_size(name, FONT_BOLD, 12, name_width))
+        c.drawString(0.36 * inch + 10, header_y + 1, name)
+        c.setFillColor(HexColor('#333333'))
+        c.circle(CARD_WIDTH - 0.22 * inch, header_y + 4, 0.14 * inch, stroke=0, fill=1)
+        c.setFillColor(white)
+        c.setFont(FONT_BOLD, 10)
+        c.drawCentredString(CARD_WIDTH - 0.22 * inch, header_y + 0.5, str(energy))
+
+        # Body: rules text, effects and stats
+        text_width = CARD_WIDTH - 20
+        text_y = CARD_HEIGHT - 0.45 * inch - 14
+        c.setFillColor(HexColor('#333333'))
+        c.setFont(FONT, 9)
+        for line in wrap_text(str(card.get('text', '')), FONT, 9, text_width):
+            c.drawString(10, text_y, line)
+            text_y -= 11
+
+        for effect in card.get('effects') or []:
+            text_y -= 3
+            c.setFont(FONT, 8)
+            for line in wrap_text(str(effect.get('description', '')), FONT, 8, text_width - 8):
+                c.drawString(14, text_y, line)
+                text_y -= 10
+
+        stats = [f"{label} {card[field]}" for field, label in STAT_LABELS
+                 if isinstance(card.get(field), (int, float)) and card.get(field, 0) > 0]
+        if stats:
+            c.setFont(FONT_BOLD, 8)
+            c.drawString(10, 0.3 * inch + 8, '   '.join(stats))
+
+        # Footer: type and rarity
+        border, _ = rarity_colors(self.printer.get_rarity_color(rarity))
+        c.setFont(FONT_BOLD, 8)
+        c.setFillColor(HexColor('#666666'))
+        c.drawString(10, 0.12 * inch, str(card.get('type', 'action')).title())
+        c.setFillColor(border)
+        c.drawRightString(CARD_WIDTH - 10, 0.12 * inch, rarity.title())
+        c.restoreState()
+
+    def render(self, cards: List[Dict[str, Any]], output_file: str,
+               pages_per_file: Optional[int] = PAGES_PER_FILE) -> List[str]:
+        """Draw cards onto A4 sheets, 9 per page.
+
+        reportlab holds a document's pages until it is saved, so runs longer
+        than pages_per_file are split into numbered volumes to keep memory
+        bounded; a run that fits in one volume keeps output_file's name.
+        pages_per_file=0 writes one file however long the run is.
+        """
+        output = Path(output_file)
+        if pages_per_file is None:
+            pages_per_file = PAGES_PER_FILE
+        cards_per_file = pages_per_file * CARDS_PER_PAGE if pages_per_file else len(cards) or 1
+        split = len(cards) > cards_per_file
+        files = []
+        for volume, start in enumerate(range(0, max(len(cards), 1), cards_per_file), 1):
+            path = output.with_name(f"{output.stem}_{volume:04d}{output.suffix}") if split else output
+            self._forms.clear()
+            c = canvas.Canvas(str(path), pagesize=A4, pageCompression=1)
+            c.setTitle('BrickQuest Printable Cards')
+            chunk = cards[start:start + cards_per_file]
+            for page_start in range(0, len(chunk), CARDS_PER_PAGE):
+                for slot, card in zip(self.slots, chunk[page_start:page_start + CARDS_PER_PAGE]):
+                    self.draw_card(c, card, *slot)
+                c.showPage()
+            c.save()
+            files.append(str(path))
+        return files
+
+
+def render_pdf(cards: List[Dict[str, Any]], output_file: str,
+               pages_per_file: Optional[int] = PAGES_PER_FILE) -> List[str]:
+    """Render cards to PDF and report throughput."""
+    start = time.perf_counter()
+    files = CardPdfRenderer().render(cards, output_file, pages_per_file)
+    elapsed = time.perf_counter() - start
+    pages = (len(cards) + CARDS_PER_PAGE - 1) // CARDS_PER_PAGE
+    rate = pages / elapsed * 60 if elapsed > 0 else float('inf')
+    print(f"📄 Drew {pages} pages in {elapsed:.2f}s ({rate:,.0f} pages/min)")
+    return files
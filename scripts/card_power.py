@@ -0,0 +1,306 @@
+#!/usr/bin/env python3
+"""
+BrickQuest Card Power Scoring
+Scores every card's rules against its energy cost. Each card's 'rules' dict
+becomes one row of a dense feature matrix (damage, range, movement, push,
+duration, heal, ...), so power, power-per-energy and outlier flags for all
+sets come from a few array operations. Mutation variants are rescored by
+replacing only the rows of the cards they change.
+"""
+
+import csv
+import json
+import time
+import argparse
+from pathlib import Path
+from typing import Dict, List, Any, Iterable, Optional, Tuple
+
+import numpy as np
+
+from card_catalog import CardCatalog, catalog_sources
+from deck_analytics import card_energy
+
+# Feature columns: name, the rules keys summed into it, and its default
+# weight in power points. Booleans count as 1; symbolic values count as 0.
+FEATURES = (
+    ('damage', ('damage',), 1.0),
+    ('attack', ('attack', 'attackBonus', 'damageBonus'), 1.0),
+    ('range', ('range', 'rangeMax', 'rangeBonus'), 0.5),
+    ('area', ('area',), 1.0),
+    ('movement', ('movement', 'movementBonus', 'moveValue'), 0.5),
+    ('push', ('push',), 0.75),
+    ('duration', ('duration', 'durationRounds'), 0.5),
+    ('heal', ('heal', 'tempHP'), 1.0),
+    ('defense', ('defense', 'defenseBonus', 'cover', 'prevent'), 1.0),
+    ('hp', ('hp',), 0.5),
+    ('ar', ('ar',), 1.0),
+    ('draw', ('draw',), 1.5),
+    ('energy', ('energy', 'energyRegen', 'maxEnergy'), 1.5),
+    ('discount', ('spellDiscount', 'programDiscount', 'steamDiscount', 'cardDiscount'), 1.0),
+    ('self_damage', ('selfDamage',), -1.0),
+    ('keywords', (), 0.25),
+)
+FEATURE_NAMES = tuple(name for name, _, _ in FEATURES)
+DEFAULT_WEIGHTS = np.array([weight for _, _, weight in FEATURES])
+
+_COLUMN = {key: col for col, (_, keys, _) in enumerate(FEATURES) for key in keys}
+_KEYWORDS_COLUMN = FEATURE_NAMES.index('keywords')
+
+# Rules keys that describe how a card is played rather than what it does
+NEUTRAL_KEYS = frozenset(['target', 'trigger'])
+
+# Residuals of power against cost beyond this many standard deviations are flagged
+OUTLIER_Z = 2.0
+
+
+def feature_row(card: Any) -> np.ndarray:
+    """Feature vector of one card (a dict or a Card)."""
+    row = np.zeros(len(FEATURES))
+    for key, value in (card.get('rules') or {}).items():
+        col = _COLUMN.get(key)
+        if col is not None and isinstance(value, (bool, int, float)):
+            row[col] += float(value)
+        elif key not in NEUTRAL_KEYS and value not in (None, False, 0, '', [], {}):
+            # Flags and structured effects (auras, triggers, statuses) each add a keyword
+            row[_KEYWORDS_COLUMN] += 1
+    return row
+
+
+def fit_scores(power: np.ndarray, energy: np.ndarray, z_limit: float = OUTLIER_Z) -> Dict[str, np.ndarray]:
+    """Power-per-energy and outlier flags along the last axis.
+
+    Power is fitted as a + b * energy by least squares, independently for
+    each row when given (variants x cards) arrays, and cards whose residual
+    is more than z_limit standard deviations from the fit are flagged
+    (+1 over budget, -1 under budget).
+    """
+    energy = energy.astype(float)
+    ppe = power / np.maximum(energy, 1.0)
+    e_mean = energy.mean(axis=-1, keepdims=True)
+    p_mean = power.mean(axis=-1, keepdims=True)
+    e_dev = energy - e_mean
+    var = (e_dev ** 2).sum(axis=-1, keepdims=True)
+    slope = np.where(var > 0, (e_dev * (power - p_mean)).sum(axis=-1, keepdims=True) / np.where(var > 0, var, 1), 0.0)
+    intercept = p_mean - slope * e_mean
+    residual = power - (intercept + slope * energy)
+    std = residual.std(axis=-1, keepdims=True)
+    z = residual / np.where(std > 0, std, 1.0)
+    flags = np.where(z > z_limit, 1, np.where(z < -z_limit, -1, 0))
+    return {
+        'power_per_energy': ppe,
+        'expected': intercept + slope * energy,
+        'z': z,
+        'flags': flags,
+        'slope': slope[..., 0],
+        'intercept': intercept[..., 0],
+    }
+
+
+class PowerIndex:
+    """Feature matrix and energy costs for every card row of a set of files.
+
+    A card id that appears in several sets has one row per set, but a
+    mutation of that id updates only the row the catalog resolves it to
+    (the last set), the card mutate_cards changed. Shadowed rows may be
+    entirely different cards.
+    """
+
+    def __init__(self, sources: Optional[List[Path]] = None, weights: Optional[np.ndarray] = None):
+        catalog = CardCatalog(sources=sources)
+        self.sources = catalog.sources
+        self.ids: List[str] = []
+        self.names: List[str] = []
+        self.sets: List[str] = []
+        rows = []
+        energy = []
+        for source in catalog.sources:
+            for card in catalog.set_cards(source):
+                self.ids.append(card.get('id'))
+                self.names.append(str(card.get('name')))
+                self.sets.append(source.stem)
+                rows.append(feature_row(card))
+                energy.append(card_energy(card))
+        self.features = np.array(rows).reshape(len(rows), len(FEATURES))
+        self.energy = np.array(energy, dtype=np.int64)
+        self.weights = DEFAULT_WEIGHTS if weights is None else weights
+        self.power = self.features @ self.weights
+
+        # Later rows overwrite earlier ones, as in CardCatalog.by_id
+        self.rows: Dict[str, int] = {card_id: row for row, card_id in enumerate(self.ids)}
+
+    def score(self, z_limit: float = OUTLIER_Z) -> Dict[str, np.ndarray]:
+        scores = fit_scores(self.power, self.energy, z_limit)
+        scores['power'] = self.power
+        return scores
+
+    def variant_arrays(self, overlays: List[Dict[str, Any]]) -> Tuple[np.ndarray, np.ndarray]:
+        """(variants x cards) power and energy arrays for a batch of overlays.
+
+        Every variant starts as a view of the base scores; only the rows of
+        cards in its overlay are recomputed.
+        """
+        power = np.broadcast_to(self.power, (len(overlays), len(self.ids))).copy()
+        energy = np.broadcast_to(self.energy, (len(overlays), len(self.ids))).copy()
+        for variant, overlay in enumerate(overlays):
+            for card_id, card in overlay.items():
+                row = self.rows.get(card_id)
+                if row is not None:
+                    power[variant, row] = feature_row(card) @ self.weights
+                    energy[variant, row] = card_energy(card)
+        return power, energy
+
+    def rescore(self, overlays: List[Dict[str, Any]], z_limit: float = OUTLIER_Z) -> Dict[str, np.ndarray]:
+        power, energy = self.variant_arrays(overlays)
+        scores = fit_scores(power, energy, z_limit)
+        scores['power'] = power
+        scores['energy'] = energy
+        return scores
+
+
+def check_shadowed_rows(index: PowerIndex) -> bool:
+    """Mutate every id that several sets define and confirm only its
+    resolved row changes, never the rows it shadows."""
+    from mutate_cards import CardIndex, apply_change
+
+    cards = CardIndex(index.sources)
+    shared = [card_id for card_id in cards.cards if index.ids.count(card_id) > 1]
+    overlays = [{card_id: apply_change(cards[card_id], {'field': 'energy', 'operation': 'add', 'value': 1})}
+                for card_id in shared]
+    if not overlays:
+        return True
+    power, energy = index.variant_arrays(overlays)
+    for variant, card_id in enumerate(shared):
+        changed = (power[variant] != index.power) | (energy[variant] != index.energy)
+        if any(changed[row] for row, row_id in enumerate(index.ids) if row_id == card_id and row != index.rows[card_id]):
+            return False
+        if not changed[index.rows[card_id]]:
+            return False
+    return True
+
+
+def load_weights(path: Path) -> np.ndarray:
+    """Feature weights from a {"feature": weight} JSON file; unlisted features keep their default."""
+    with open(path, 'r', encoding='utf-8') as f:
+        overrides = json.load(f)
+    unknown = set(overrides) - set(FEATURE_NAMES)
+    if unknown:
+        raise ValueError(f"unknown features in {path}: {', '.join(sorted(unknown))}")
+    return np.array([float(overrides.get(name, weight)) for name, _, weight in FEATURES])
+
+
+def print_report(index: PowerIndex, scores: Dict[str, np.ndarray], top: int = 5) -> None:
+    print(f"\n📈 Fit: power = {float(scores['intercept']):.2f} + {float(scores['slope']):.2f} x energy")
+    ppe = scores['power_per_energy']
+    order = np.argsort(-ppe, kind='stable')
+    for label, rows in (('Highest', order[:top]), ('Lowest', order[::-1][:top])):
+        print(f"\n  {label} power per energy:")
+        for row in rows:
+            print(f"    {index.ids[row]:<12} {index.names[row]:<24} {index.energy[row]}E "
+                  f"power {scores['power'][row]:5.2f}  ({ppe[row]:.2f}/E)")
+
+    flagged = np.flatnonzero(scores['flags'])
+    print(f"\n⚠️  {len(flagged)} outliers (|z| > {OUTLIER_Z:g})" if len(flagged) else "\n✅ No outliers")
+    for row in flagged[np.argsort(-np.abs(scores['z'][flagged]), kind='stable')]:
+        label = 'over' if scores['flags'][row] > 0 else 'under'
+        print(f"    {index.ids[row]:<12} {index.names[row]:<24} {index.sets[row]:<12} "
+              f"{index.energy[row]}E power {scores['power'][row]:5.2f} vs {scores['expected'][row]:5.2f} "
+              f"expected, {label} budget (z {scores['z'][row]:+.1f})")
+
+
+def write_csv(index: PowerIndex, scores: Dict[str, np.ndarray], path: Path) -> None:
+    """One row per card with its features and scores."""
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(['id', 'name', 'set', 'energy'] + list(FEATURE_NAMES) +
+                        ['power', 'power_per_energy', 'expected', 'z', 'flag'])
+        for row, card_id in enumerate(index.ids):
+            writer.writerow([card_id, index.names[row], index.sets[row], int(index.energy[row])] +
+                            [round(float(v), 3) for v in index.features[row]] +
+                            [round(float(scores[key][row]), 3) for key in ('power', 'power_per_energy', 'expected', 'z')] +
+                            [int(scores['flags'][row])])
+    print(f"📄 Wrote {len(index.ids)} card rows to {path}")
+
+
+def rescore_variants(index: PowerIndex, variants: Iterable[Dict[str, Any]], batch_size: int = 1000) -> None:
+    """Score mutation variants in batches and summarize how outliers move."""
+    from mutate_cards import CardIndex, iter_mutated_variants
+
+    base_flags = index.score()['flags'] != 0
+    cards = CardIndex(index.sources)
+    start = time.perf_counter()
+    count = 0
+    fixed = np.zeros(len(index.ids), dtype=np.int64)
+    created = np.zeros(len(index.ids), dtype=np.int64)
+    best: Tuple[int, str] = (int(base_flags.sum()), 'base')
+    names: List[str] = []
+    overlays: List[Dict[str, Any]] = []
+
+    def flush():
+        nonlocal count, best
+        if not overlays:
+            return
+        flags = index.rescore(overlays)['flags'] != 0
+        fixed[:] += (base_flags & ~flags).sum(axis=0)
+        created[:] += (~base_flags & flags).sum(axis=0)
+        totals = flags.sum(axis=1)
+        i = int(np.argmin(totals))
+        if totals[i] < best[0]:
+            best = (int(totals[i]), names[i])
+        count += len(overlays)
+        names.clear()
+        overlays.clear()
+
+    for name, overlay, _ in iter_mutated_variants(cards, variants):
+        names.append(name)
+        overlays.append(overlay)
+        if len(overlays) >= batch_size:
+            flush()
+    flush()
+
+    elapsed = time.perf_counter() - start
+    rate = count / elapsed if elapsed > 0 else float('inf')
+    print(f"\n🔁 Rescored {count:,} variants in {elapsed:.2f}s ({rate:,.0f} variants/sec)")
+    print(f"  Base outliers: {int(base_flags.sum())}; fewest in a variant: {best[0]} ({best[1]})")
+    for label, counts in (('Most often fixed', fixed), ('Most often created', created)):
+        rows = [row for row in np.argsort(-counts, kind='stable')[:3] if counts[row]]
+        if rows:
+            print(f"  {label}: " + ', '.join(f"{index.ids[row]} [{index.sets[row]}] ({counts[row]:,})" for row in rows))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Score BrickQuest card power against energy cost')
+    parser.add_argument('sources', nargs='*', type=Path, help='Card set files (default: the whole catalog)')
+    parser.add_argument('--weights', type=Path, help='JSON {"feature": weight} overrides')
+    parser.add_argument('--top', type=int, default=5, help='Cards to list at each end of power per energy')
+    parser.add_argument('--csv', type=Path, help='Write per-card features and scores to a CSV file')
+    parser.add_argument('--mutations', nargs='+', type=Path, help='Rescore mutation variant files (see mutate_cards.py)')
+    parser.add_argument('--random', type=int, metavar='N', help='Rescore N random mutation variants')
+    parser.add_argument('--seed', type=int, help='Seed for --random')
+
+    args = parser.parse_args()
+
+    weights = load_weights(args.weights) if args.weights else None
+    start = time.perf_counter()
+    index = PowerIndex(args.sources or catalog_sources(), weights)
+    scores = index.score()
+    print(f"📚 Scored {len(index.ids)} cards from {len(set(index.sets))} sets in {time.perf_counter() - start:.2f}s")
+    print_report(index, scores, args.top)
+    shadowed = check_shadowed_rows(index)
+    print(f"\n  Overlays leave shadowed set rows unchanged: {'ok' if shadowed else 'FAILED'}")
+    if args.csv:
+        write_csv(index, scores, args.csv)
+
+    if args.mutations or args.random:
+        from mutate_cards import CardIndex, load_variants, random_variants
+
+        variants: List[Iterable[Dict[str, Any]]] = [load_variants(path) for path in args.mutations or []]
+        if args.random:
+            variants.append(random_variants(CardIndex(index.sources), args.random, seed=args.seed))
+        rescore_variants(index, (v for source in variants for v in source))
+
+    if not shadowed:
+        raise SystemExit(1)
+
+
+if __name__ == '__main__':
+    main()
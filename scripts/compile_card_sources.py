@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+BrickQuest Card Source Compiler
+Compiles the master CSV card sheets in cards/sources/ into the JSON card set
+layouts, one source file per worker process. Rows are streamed from the CSV
+straight into the output files, so memory stays flat however large the
+sheet is.
+"""
+
+import csv
+import json
+import os
+import shutil
+import tempfile
+import time
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Any, Optional, TextIO, Tuple
+
+from card_catalog import CARDS_DIR
+from card_db import CSV_SOURCES, iter_csv_cards
+
+OUTPUT_DIR = CARDS_DIR / 'compiled'
+LAYOUTS = ('factions', 'base_set')
+SET_VERSION = '1.0.0'
+
+# Parsed rules objects are shared between rows with identical rules strings.
+# The cache is dropped once it holds this many distinct strings.
+RULES_CACHE_SIZE = 50000
+
+
+class CardSetWriter:
+    """Streams cards into a {"cards": [...], "metadata": {...}} file.
+
+    Each card is written on one line; indenting every card would push
+    encoding onto json's pure-Python path, which costs more than parsing.
+    """
+
+    def __init__(self, path: Path, metadata: Dict[str, Any]):
+        self.path = path
+        self.metadata = metadata
+        self.count = 0
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._tmp_path = path.with_suffix('.tmp')
+        self._file: TextIO = open(self._tmp_path, 'w', encoding='utf-8')
+        self._file.write('{\n  "cards": [')
+
+    def write(self, card: Dict[str, Any]) -> None:
+        self._file.write(('\n    ' if self.count == 0 else ',\n    ') + json.dumps(card, ensure_ascii=False))
+        self.count += 1
+
+    def close(self) -> None:
+        self.metadata['totalCards'] = self.count
+        metadata = json.dumps(self.metadata, indent=2, ensure_ascii=False).replace('\n', '\n  ')
+        self._file.write(('\n  ' if self.count else '') + f'],\n  "metadata": {metadata}\n}}\n')
+        self._file.close()
+        os.replace(self._tmp_path, self.path)
+
+
+def compile_source(task: Tuple[str, str, str]) -> Dict[str, Any]:
+    """Compile one CSV source into a card set layout (runs in a worker process)."""
+    source, output_dir, layout = task
+    source_path = Path(source)
+    output = Path(output_dir)
+    start = time.perf_counter()
+
+    rules_cache: Dict[str, Any] = {}
+    writers: Dict[str, CardSetWriter] = {}
+    generated = datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%S.000Z')
+    rows = 0
+    for card in iter_csv_cards(source_path, rules_cache):
+        if layout == 'factions':
+            faction = card.get('faction') or 'Neutral'
+            key = faction.upper()
+            if key not in writers:
+                writers[key] = CardSetWriter(
+                    output / source_path.stem / 'factions' / f"{key}.json",
+                    {'faction': faction, 'totalCards': 0, 'version': SET_VERSION})
+        else:
+            key = 'base_set'
+            if key not in writers:
+                writers[key] = CardSetWriter(
+                    output / source_path.stem / 'base_set.json',
+                    {'generated': generated, 'totalCards': 0, 'validationErrors': 0})
+        writers[key].write(card)
+        rows += 1
+        if len(rules_cache) >= RULES_CACHE_SIZE:
+            rules_cache.clear()
+
+    for writer in writers.values():
+        writer.close()
+    return {
+        'source': source,
+        'rows': rows,
+        'files': [str(writer.path) for writer in writers.values()],
+        'elapsed': time.perf_counter() - start,
+    }
+
+
+def compile_sources(sources: List[Path], output_dir: Path = OUTPUT_DIR, layout: str = 'factions',
+                    workers: Optional[int] = None) -> List[Dict[str, Any]]:
+    """Compile every source in parallel, one file per task, and report throughput."""
+    start = time.perf_counter()
+    tasks = [(str(source), str(output_dir), layout) for source in sources]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        results = list(pool.map(compile_source, tasks))
+    elapsed = time.perf_counter() - start
+
+    total = 0
+    for result in results:
+        rate = result['rows'] / result['elapsed'] if result['elapsed'] > 0 else float('inf')
+        print(f"  {Path(result['source']).name}: {result['rows']:,} rows -> "
+              f"{len(result['files'])} files ({rate:,.0f} rows/sec)")
+        total += result['rows']
+    rate = total / elapsed if elapsed > 0 else float('inf')
+    print(f"✅ Compiled {total:,} rows from {len(sources)} sources in {elapsed:.2f}s ({rate:,.0f} rows/sec)")
+    return results
+
+
+def write_synthetic_source(path: Path, rows: int, template: Path) -> None:
+    """Write a large CSV by repeating the rows of a real source with fresh ids."""
+    with open(template, 'r', encoding='utf-8', newline='') as f:
+        reader = csv.reader(f, escapechar='\\')
+        header = next(reader)
+        samples = [row for row in reader if row and row[0].strip()]
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.writer(f, escapechar='\\')
+        writer.writerow(header)
+        for i in range(rows):
+            row = list(samples[i % len(samples)])
+            row[0] = f"BQ-SYN-{i:07d}"
+            writer.writerow(row)
+
+
+def benchmark(rows: int, layout: str, workers: Optional[int]) -> None:
+    """Compile a synthetic CSV of the given size and report rows/sec."""
+    template = sorted(CARDS_DIR.glob(CSV_SOURCES))[0]
+    tmp_dir = Path(tempfile.mkdtemp(prefix='bq_compile_'))
+    try:
+        source = tmp_dir / 'synthetic.csv'
+        write_synthetic_source(source, rows, template)
+        print(f"📊 Synthetic source: {rows:,} rows from {template.name}")
+        compile_sources([source], tmp_dir / 'out', layout, workers)
+    finally:
+        shutil.rmtree(tmp_dir)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compile BrickQuest CSV card sources to JSON')
+    parser.add_argument('sources', nargs='*', type=Path, help='CSV files (default: cards/sources/*.csv)')
+    parser.add_argument('--output-dir', type=Path, default=OUTPUT_DIR, help='Output directory')
+    parser.add_argument('--layout', choices=LAYOUTS, default='factions',
+                        help='factions: one file per faction; base_set: one file per source')
+    parser.add_argument('--workers', type=int, default=None, help='Worker processes (default: CPU count)')
+    parser.add_argument('--benchmark', type=int, metavar='ROWS', help='Compile a synthetic CSV with ROWS rows')
+
+    args = parser.parse_args()
+
+    if args.benchmark:
+        benchmark(args.benchmark, args.layout, args.workers)
+        return
+
+    sources = args.sources or sorted(CARDS_DIR.glob(CSV_SOURCES))
+    if not sources:
+        print("No CSV sources found")
+        return
+    print(f"📚 Compiling {len(sources)} sources to {args.output_dir} ({args.layout} layout)")
+    compile_sources(sources, args.output_dir, args.layout, args.workers)
+
+
+if __name__ == '__main__':
+    main()
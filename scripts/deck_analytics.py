@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+"""
+BrickQuest Deck Analytics
+Resolves decklists against the card catalog and computes energy curves,
+type/rarity/faction composition and icon frequencies for many decks at
+once. Decks are held as a (decks x cards) count matrix, so every statistic
+is one matrix product over the whole batch.
+"""
+
+import csv
+import json
+import argparse
+from pathlib import Path
+from typing import Dict, List, Any, Iterator, Optional, Tuple
+
+import numpy as np
+
+from card_catalog import CardCatalog, get_catalog
+from validate_cards import DECKLIST_DIR
+
+# Energy curve buckets are 0..CURVE_MAX, with the last one meaning "or more"
+CURVE_MAX = 6
+
+
+def card_energy(card: Dict[str, Any]) -> int:
+    """Energy cost of a card in either the v2 or the legacy generator format."""
+    cost = card.get('cost', 0)
+    if isinstance(cost, dict):
+        cost = cost.get('energy', 0)
+    return int(cost) if isinstance(cost, (int, float)) else 0
+
+
+def load_decklists(path: Path) -> Iterator[Dict[str, Any]]:
+    """Read decks from a file.
+
+    Accepts the decklists/*.json layout ({"decklist": {...}}), a bare
+    {"cards": [...]} deck, a plain id array, a list of decks, or JSON Lines
+    with one deck per line.
+    """
+    def as_deck(data, name):
+        if isinstance(data, dict) and 'decklist' in data:
+            data = data['decklist']
+        if isinstance(data, list):
+            data = {'cards': data}
+        deck = dict(data)
+        deck.setdefault('name', name)
+        return deck
+
+    with open(path, 'r', encoding='utf-8') as f:
+        if path.suffix == '.jsonl':
+            for line_no, line in enumerate(f, 1):
+                if line.strip():
+                    yield as_deck(json.loads(line), f"{path.stem}:{line_no}")
+            return
+        data = json.load(f)
+    if isinstance(data, list) and data and not isinstance(data[0], str):
+        for index, deck in enumerate(data, 1):
+            yield as_deck(deck, f"{path.stem}:{index}")
+    else:
+        yield as_deck(data, path.stem)
+
+
+def iter_deck_files(paths: List[Path]) -> Iterator[Path]:
+    for path in paths:
+        if path.is_dir():
+            yield from sorted(p for p in path.iterdir() if p.suffix in ('.json', '.jsonl'))
+        else:
+            yield path
+
+
+class DeckIndex:
+    """Per-card attribute arrays for the whole catalog.
+
+    Card i of the catalog is row i of every matrix: one-hot columns for
+    energy bucket, type, rarity and faction, and a multi-hot icon matrix.
+    """
+
+    def __init__(self, catalog: Optional[CardCatalog] = None):
+        catalog = catalog if catalog is not None else get_catalog()
+        cards = list(catalog)
+        self.ids = [card.get('id') for card in cards]
+        self.row = {card_id: row for row, card_id in enumerate(self.ids)}
+
+        self.types = sorted({str(card.get('type')) for card in cards})
+        self.rarities = sorted({str(card.get('rarity')) for card in cards})
+        self.factions = sorted({str(card.get('faction')) for card in cards})
+        self.icons = sorted({icon for card in cards for icon in card.get('icons') or []})
+
+        self.energy = np.array([card_energy(card) for card in cards], dtype=np.int64)
+        self.curve = self._one_hot(np.minimum(self.energy, CURVE_MAX), CURVE_MAX + 1)
+        self.type = self._one_hot(self._codes(cards, 'type', self.types), len(self.types))
+        self.rarity = self._one_hot(self._codes(cards, 'rarity', self.rarities), len(self.rarities))
+        self.faction = self._one_hot(self._codes(cards, 'faction', self.factions), len(self.factions))
+
+        icon_col = {icon: col for col, icon in enumerate(self.icons)}
+        self.icon = np.zeros((len(cards), len(self.icons)), dtype=np.int64)
+        for row, card in enumerate(cards):
+            for icon in set(card.get('icons') or []):
+                self.icon[row, icon_col[icon]] = 1
+
+    @staticmethod
+    def _codes(cards: List[Dict[str, Any]], field: str, labels: List[str]) -> np.ndarray:
+        lookup = {label: code for code, label in enumerate(labels)}
+        return np.array([lookup[str(card.get(field))] for card in cards], dtype=np.intp)
+
+    @staticmethod
+    def _one_hot(codes: np.ndarray, width: int) -> np.ndarray:
+        matrix = np.zeros((len(codes), width), dtype=np.int64)
+        matrix[np.arange(len(codes)), codes] = 1
+        return matrix
+
+    def count_matrix(self, decks: List[Dict[str, Any]]) -> Tuple[np.ndarray, np.ndarray, List[List[str]]]:
+        """Resolve decks to a (decks x cards) count matrix.
+
+        Also returns the per-deck number of unresolved entries and the
+        distinct unresolved ids of each deck.
+        """
+        counts = np.zeros((len(decks), len(self.ids)), dtype=np.int64)
+        unresolved = np.zeros(len(decks), dtype=np.int64)
+        missing: List[List[str]] = []
+        deck_rows, card_rows = [], []
+        for index, deck in enumerate(decks):
+            unknown = set()
+            for card_id in deck.get('cards', []):
+                row = self.row.get(card_id)
+                if row is None:
+                    unknown.add(card_id)
+                    unresolved[index] += 1
+                else:
+                    deck_rows.append(index)
+                    card_rows.append(row)
+            missing.append(sorted(unknown))
+        np.add.at(counts, (np.array(deck_rows, dtype=np.intp), np.array(card_rows, dtype=np.intp)), 1)
+        return counts, unresolved, missing
+
+    def analyze(self, decks: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Statistics for a batch of decks, one row per deck in every array."""
+        counts, unresolved, missing = self.count_matrix(decks)
+        size = counts.sum(axis=1)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            avg_energy = np.where(size > 0, (counts @ self.energy) / size, 0.0)
+        return {
+            'names': [str(deck.get('name')) for deck in decks],
+            'size': size,
+            'unresolved': unresolved,
+            'missing': missing,
+            'avg_energy': avg_energy,
+            'curve': counts @ self.curve,
+            'types': counts @ self.type,
+            'rarities': counts @ self.rarity,
+            'factions': counts @ self.faction,
+            'icons': counts @ self.icon,
+        }
+
+
+def curve_labels() -> List[str]:
+    return [str(i) for i in range(CURVE_MAX)] + [f"{CURVE_MAX}+"]
+
+
+def breakdown(labels: List[str], row: np.ndarray, top: Optional[int] = None) -> str:
+    order = np.argsort(-row, kind='stable')
+    parts = [f"{labels[i]} {row[i]}" for i in order if row[i] > 0]
+    return ', '.join(parts[:top] if top else parts)
+
+
+def print_report(index: DeckIndex, stats: Dict[str, Any], top_icons: int = 5, per_deck: bool = True) -> None:
+    """Print per-deck lines followed by batch-wide averages."""
+    decks = len(stats['names'])
+    labels = curve_labels()
+    if per_deck:
+        for i, name in enumerate(stats['names']):
+            print(f"\n🃏 {name}: {stats['size'][i]} cards, avg energy {stats['avg_energy'][i]:.2f}")
+            if stats['unresolved'][i]:
+                print(f"  ⚠️  {stats['unresolved'][i]} unresolved: {', '.join(stats['missing'][i])}")
+            print(f"  Curve:    {' '.join(f'{l}:{n}' for l, n in zip(labels, stats['curve'][i]))}")
+            print(f"  Types:    {breakdown(index.types, stats['types'][i])}")
+            print(f"  Rarity:   {breakdown(index.rarities, stats['rarities'][i])}")
+            print(f"  Factions: {breakdown(index.factions, stats['factions'][i])}")
+            print(f"  Icons:    {breakdown(index.icons, stats['icons'][i], top_icons)}")
+
+    if not decks:
+        return
+    print(f"\n📊 {decks} decks")
+    print(f"  Size:        mean {stats['size'].mean():.1f}, min {stats['size'].min()}, max {stats['size'].max()}")
+    print(f"  Avg energy:  mean {stats['avg_energy'].mean():.2f}, std {stats['avg_energy'].std():.2f}")
+    print(f"  Unresolved:  {int(stats['unresolved'].sum())} entries in {int((stats['unresolved'] > 0).sum())} decks")
+    mean_curve = stats['curve'].mean(axis=0)
+    print(f"  Mean curve:  {' '.join(f'{l}:{n:.1f}' for l, n in zip(labels, mean_curve))}")
+    share = stats['types'].sum(axis=0) / max(int(stats['types'].sum()), 1)
+    print(f"  Type share:  {', '.join(f'{index.types[i]} {share[i]:.0%}' for i in np.argsort(-share, kind='stable') if share[i] > 0)}")
+    icon_decks = (stats['icons'] > 0).sum(axis=0)
+    print(f"  Icons in most decks: {breakdown(index.icons, icon_decks, top_icons)}")
+
+
+def write_csv(index: DeckIndex, stats: Dict[str, Any], path: Path) -> None:
+    """One row per deck with every statistic as a column, for bulk comparison."""
+    columns = [('curve', curve_labels(), 'curve_'), ('types', index.types, 'type_'),
+               ('rarities', index.rarities, 'rarity_'), ('factions', index.factions, 'faction_'),
+               ('icons', index.icons, 'icon_')]
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.writer(f)
+        header = ['deck', 'size', 'unresolved', 'avg_energy']
+        for _, labels, prefix in columns:
+            header.extend(prefix + label for label in labels)
+        writer.writerow(header)
+        for i, name in enumerate(stats['names']):
+            row = [name, int(stats['size'][i]), int(stats['unresolved'][i]), round(float(stats['avg_energy'][i]), 3)]
+            for key, _, _ in columns:
+                row.extend(stats[key][i].tolist())
+            writer.writerow(row)
+    print(f"📄 Wrote {len(stats['names'])} deck rows to {path}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Analyze BrickQuest decklists')
+    parser.add_argument('paths', nargs='*', type=Path,
+                        help='Decklist files or directories (default: cards/expansions/decklists)')
+    parser.add_argument('--csv', type=Path, help='Write per-deck statistics to a CSV file')
+    parser.add_argument('--summary', action='store_true', help='Only print the batch summary')
+    parser.add_argument('--top-icons', type=int, default=5, help='Icons to list per deck')
+
+    args = parser.parse_args()
+
+    decks = [deck for path in iter_deck_files(args.paths or [DECKLIST_DIR]) for deck in load_decklists(path)]
+    index = DeckIndex()
+    stats = index.analyze(decks)
+    print_report(index, stats, args.top_icons, per_deck=not args.summary)
+    if args.csv:
+        write_csv(index, stats, args.csv)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,342 @@
+#!/usr/bin/env python3
+"""
+BrickQuest Deck Builder
+Searches for legal decks that meet energy curve, card type and faction
+targets, and checks existing decklists against the same rules. Legal decks
+use only cards of their faction or Neutral and respect each card's
+limits.perDeck (DEFAULT_COPIES when a card has none).
+
+A batch of decks is built at once as a (decks x cards) count array. At each
+slot, every candidate card is checked against the upper bounds and against
+the cards still needed to reach the lower bounds, so a deck only dead-ends
+when no legal card fits.
+"""
+
+import json
+import math
+import time
+import argparse
+from pathlib import Path
+from typing import Dict, List, Any, Optional, Tuple
+
+import numpy as np
+
+from card_catalog import CardCatalog, get_catalog
+from deck_analytics import CURVE_MAX, DECKLIST_DIR, DeckIndex, iter_deck_files, load_decklists
+
+DECK_SIZE = 25
+DEFAULT_COPIES = 3
+NEUTRAL = 'Neutral'
+
+# Target shares of the deck as [min, max], after the deck building
+# guidelines in docs/CARD_REFERENCE.md. The 5+ curve bucket has no minimum
+# because the Cyber and Steampunk pools have no 5-energy cards.
+DEFAULT_TARGETS = {
+    'size': DECK_SIZE,
+    'curve': {'0-2': [0.35, 0.60], '3-4': [0.30, 0.55], '5+': [0.0, 0.20]},
+    'types': {'Action': [0.40, 0.50], 'Structure': [0.20, 0.30], 'Program': [0.15, 0.25], 'Event': [0.05, 0.10]},
+    'faction_share': [0.40, 1.0],
+}
+
+# Decks built together per vectorized batch; batches own their random streams
+BUILD_BATCH = 1000
+
+# How strongly picks lean towards groups still short of their minimum
+URGENCY_BIAS = 4.0
+
+
+def parse_energy_range(key: str) -> Tuple[int, int]:
+    """'0-2' -> (0, 2), '5+' -> (5, inf), '3' -> (3, 3)."""
+    key = key.strip()
+    if key.endswith('+'):
+        return int(key[:-1]), 10 ** 9
+    low, sep, high = key.partition('-')
+    return (int(low), int(high)) if sep else (int(low), int(low))
+
+
+def load_targets(path: Optional[Path]) -> Dict[str, Any]:
+    """Targets from a JSON file; missing sections keep their defaults."""
+    targets = dict(DEFAULT_TARGETS)
+    if path:
+        with open(path, 'r', encoding='utf-8') as f:
+            targets.update(json.load(f))
+    return targets
+
+
+class DeckRules:
+    """Legality and target constraints for one faction as arrays over the catalog.
+
+    Every target is a count constraint lo <= A @ counts <= hi, where each
+    row of A marks the cards in one group (a curve bucket, a type, the deck
+    faction). Groups of one dimension are disjoint, which bounds how many
+    of the remaining slots their minimums still need.
+    """
+
+    def __init__(self, index: DeckIndex, catalog: CardCatalog, faction: Optional[str] = None,
+                 targets: Optional[Dict[str, Any]] = None, copies: int = DEFAULT_COPIES):
+        targets = targets or DEFAULT_TARGETS
+        self.index = index
+        self.faction = faction
+        self.size = int(targets.get('size', DECK_SIZE))
+
+        factions = np.array([index.factions[i] for i in index.faction.argmax(axis=1)])
+        if faction is not None and faction not in index.factions:
+            raise ValueError(f"unknown faction {faction!r} (catalog has {', '.join(index.factions)})")
+        self.legal = np.ones(len(index.ids), dtype=bool) if faction is None else np.isin(factions, [faction, NEUTRAL])
+        per_deck = [((catalog.get(card_id) or {}).get('limits') or {}).get('perDeck', copies) for card_id in index.ids]
+        self.limit = np.where(self.legal, np.array(per_deck, dtype=np.int64), 0)
+
+        self.names: List[str] = []
+        rows, bounds, dims = [], [], []
+        for dim, (key, ranges) in enumerate((('curve', targets.get('curve') or {}),
+                                              ('types', targets.get('types') or {}))):
+            for label, share in ranges.items():
+                if key == 'curve':
+                    low, high = parse_energy_range(label)
+                    member = (index.energy >= low) & (index.energy <= high)
+                else:
+                    if label not in index.types:
+                        raise ValueError(f"unknown card type {label!r}")
+                    member = index.type[:, index.types.index(label)] == 1
+                self.names.append(f"{key} {label}")
+                rows.append(member)
+                bounds.append(share)
+                dims.append(dim)
+        self.faction_row: Optional[int] = None
+        if faction is not None and faction != NEUTRAL and targets.get('faction_share'):
+            self.faction_row = len(rows)
+            self.names.append(f"faction {faction}")
+            rows.append(factions == faction)
+            bounds.append(targets['faction_share'])
+            dims.append(2)
+
+        self.groups = np.array(rows, dtype=np.int64).reshape(len(rows), len(index.ids))
+        self.lo = np.array([math.ceil(low * self.size - 1e-9) for low, _ in bounds], dtype=np.int64)
+        self.hi = np.array([math.floor(high * self.size + 1e-9) for _, high in bounds], dtype=np.int64)
+        dims = np.array(dims, dtype=np.int64)
+        self.dims = np.array([dims == d for d in np.unique(dims)], dtype=np.int64).reshape(-1, len(rows))
+        # Pairs of groups from different dimensions that share no legal card
+        # (e.g. Event and the faction): their minimums need separate slots
+        shared = (self.groups * self.legal) @ self.groups.T
+        first, second = np.nonzero(np.triu((shared == 0) & (dims[:, None] != dims[None, :])))
+        self.disjoint = (first, second)
+
+    def impossible(self) -> List[str]:
+        """Targets that no legal deck can meet, from copy limits and bounds alone."""
+        problems = []
+        if self.limit.sum() < self.size:
+            problems.append(f"only {self.limit.sum()} legal copies for a {self.size}-card deck")
+        capacity = self.groups @ self.limit
+        for i, name in enumerate(self.names):
+            if capacity[i] < self.lo[i]:
+                problems.append(f"{name} needs {self.lo[i]} cards but the pool allows {capacity[i]}")
+            if self.lo[i] > self.hi[i]:
+                problems.append(f"{name} range is empty at {self.size} cards")
+        deficit = self.dims @ self.lo
+        first, second = self.disjoint
+        if (deficit > self.size).any() or (self.lo[first] + self.lo[second] > self.size).any():
+            problems.append("minimums add up to more than the deck size")
+        return problems
+
+    def violations(self, counts: np.ndarray, unresolved: int = 0) -> List[str]:
+        """Rule and target violations of one resolved deck."""
+        problems = []
+        size = int(counts.sum()) + unresolved
+        if size != self.size:
+            problems.append(f"{size} cards, expected {self.size}")
+        if unresolved:
+            problems.append(f"{unresolved} unresolved card ids")
+        for row in np.flatnonzero(counts > self.limit):
+            card_id = self.index.ids[row]
+            if not self.legal[row]:
+                problems.append(f"{card_id} is not {self.faction} or {NEUTRAL}")
+            else:
+                problems.append(f"{card_id} x{counts[row]} exceeds the limit of {self.limit[row]}")
+        totals = self.groups @ counts
+        for i in np.flatnonzero((totals < self.lo) | (totals > self.hi)):
+            problems.append(f"{self.names[i]}: {totals[i]} cards, target {self.lo[i]}-{self.hi[i]}")
+        return problems
+
+    def faction_weights(self, share: float) -> Optional[np.ndarray]:
+        """Card weights under which uniform picks land about 'share' of a
+        deck on faction cards, or None without a faction target."""
+        if self.faction_row is None:
+            return None
+        member = (self.groups[self.faction_row] == 1) & self.legal
+        faction, other = int(member.sum()), int((~member & self.legal).sum())
+        if not faction or not other or share >= 1.0:
+            return None
+        weights = np.ones(len(self.index.ids))
+        weights[member] = share * other / ((1.0 - share) * faction)
+        return weights
+
+    def build(self, decks: int, seed: int, batch: int = 0,
+              weights: Optional[np.ndarray] = None) -> Tuple[np.ndarray, int]:
+        """Build a batch of random legal decks at once.
+
+        Returns the (built x cards) counts of the decks that completed and the
+        number that dead-ended. Each slot picks uniformly (or by weight) among
+        the cards that keep the deck within every bound. The urgency bias only
+        pushes groups below their minimum, so with uniform weights a group
+        with few cards (such as a faction) stays near its minimum; see
+        faction_weights() for spreading it over its range.
+        """
+        rng = np.random.default_rng(np.random.SeedSequence([seed, batch]))
+        cards = len(self.index.ids)
+        counts = np.zeros((decks, cards), dtype=np.int64)
+        totals = np.zeros((decks, len(self.names)), dtype=np.int64)
+        alive = np.ones(decks, dtype=bool)
+        weights = np.ones(cards) if weights is None else weights
+        rows = np.arange(decks)
+
+        for slot in range(self.size):
+            remaining = self.size - slot - 1
+            # Group totals if each card were added: (decks x groups x cards)
+            new = totals[:, :, None] + self.groups[None, :, :]
+            ok = (counts < self.limit) & (new <= self.hi[None, :, None]).all(axis=1)
+            deficit = np.maximum(self.lo[None, :, None] - new, 0)
+            ok &= (np.einsum('dg,bgc->bdc', self.dims, deficit) <= remaining).all(axis=1)
+            first, second = self.disjoint
+            ok &= (deficit[:, first, :] + deficit[:, second, :] <= remaining).all(axis=1)
+            # Each group must still have enough copies left to reach its minimum
+            spare = (self.limit - counts) @ self.groups.T
+            ok &= (deficit <= (spare[:, :, None] - self.groups[None, :, :])).all(axis=1)
+
+            # Favour cards in groups that are furthest behind their minimum
+            urgency = (np.maximum(self.lo - totals, 0) / (remaining + 1)) @ self.groups
+            bias = weights * (1.0 + URGENCY_BIAS * urgency)
+            keys = np.where(ok, rng.random((decks, cards)) ** (1.0 / bias), -1.0)
+            choice = keys.argmax(axis=1)
+            alive &= ok.any(axis=1)
+            picked = rows[alive]
+            counts[picked, choice[alive]] += 1
+            totals[picked] += self.groups[:, choice[alive]].T
+        return counts[alive], int((~alive).sum())
+
+
+def deck_record(rules: DeckRules, counts: np.ndarray, name: str) -> Dict[str, Any]:
+    """A deck in the decklists/*.json layout."""
+    index = rules.index
+    rows = np.flatnonzero(counts)
+    cards = [index.ids[row] for row in rows for _ in range(counts[row])]
+    curve = counts @ index.curve
+    types = counts @ index.type
+    return {'decklist': {
+        'name': name,
+        'faction': rules.faction or NEUTRAL,
+        'cards': cards,
+        'totalCards': len(cards),
+        'energyCurve': {(str(e) if e < CURVE_MAX else f"{CURVE_MAX}+"): int(n) for e, n in enumerate(curve)},
+        'cardTypes': {index.types[i]: int(n) for i, n in enumerate(types) if n},
+    }}
+
+
+def build_decks(rules: DeckRules, count: int, seed: int, output: Optional[Path] = None,
+                max_batches: int = 1000) -> np.ndarray:
+    """Build 'count' distinct decks, batch by batch, and report throughput."""
+    start = time.perf_counter()
+    found: Dict[bytes, np.ndarray] = {}
+    built = dead_ends = 0
+    batch = 0
+    if rules.faction_row is not None:
+        low, high = rules.lo[rules.faction_row], rules.hi[rules.faction_row]
+    while len(found) < count and batch < max_batches:
+        # Aim each batch at a different faction share within its target range
+        weights = None
+        if rules.faction_row is not None:
+            share = np.random.default_rng([seed, batch, 1]).uniform(low, high) / rules.size
+            weights = rules.faction_weights(share)
+        decks, failed = rules.build(BUILD_BATCH, seed, batch, weights)
+        built += len(decks)
+        dead_ends += failed
+        for deck in decks:
+            found.setdefault(deck.tobytes(), deck)
+            if len(found) >= count:
+                break
+        batch += 1
+    elapsed = time.perf_counter() - start
+
+    decks = np.array(list(found.values()), dtype=np.int64).reshape(-1, len(rules.index.ids))
+    attempts = built + dead_ends
+    rate = len(decks) / elapsed if elapsed > 0 else float('inf')
+    print(f"🃏 {len(decks):,} distinct {rules.faction or 'open'} decks in {elapsed:.2f}s ({rate:,.0f} decks/sec)")
+    print(f"  {attempts:,} attempts: {built:,} legal, {dead_ends:,} dead ends, "
+          f"{built - len(decks):,} repeats or surplus")
+    for i, name in enumerate(rules.names):
+        totals = decks @ rules.groups[i] if len(decks) else np.zeros(1)
+        print(f"  {name:<22} target {rules.lo[i]:>2}-{rules.hi[i]:<2}  built {totals.min():.0f}-{totals.max():.0f} "
+              f"(mean {totals.mean():.1f})")
+
+    if output:
+        prefix = rules.faction or 'Open'
+        with open(output, 'w', encoding='utf-8') as f:
+            for number, deck in enumerate(decks, 1):
+                f.write(json.dumps(deck_record(rules, deck, f"{prefix} #{number}")) + '\n')
+        print(f"📄 Wrote {len(decks):,} decks to {output}")
+    return decks
+
+
+def check_decklists(index: DeckIndex, catalog: CardCatalog, paths: List[Path], targets: Dict[str, Any],
+                    copies: int = DEFAULT_COPIES) -> int:
+    """Check decklists against legality and targets; returns the number with problems."""
+    failing = 0
+    for path in iter_deck_files(paths):
+        for deck in load_decklists(path):
+            faction = deck.get('faction')
+            known = faction is None or faction in index.factions
+            rules = DeckRules(index, catalog, faction if known else None,
+                              dict(targets, size=deck.get('totalCards', targets.get('size', DECK_SIZE))), copies)
+            counts, unresolved, missing = index.count_matrix([deck])
+            problems = rules.violations(counts[0], int(unresolved[0]))
+            if not known:
+                # Without a catalog faction the faction legality check can't run
+                problems.insert(0, f"unknown faction {faction!r} (catalog has {', '.join(index.factions)})")
+            if problems:
+                failing += 1
+                print(f"❌ {deck.get('name')}:")
+                for problem in problems:
+                    print(f"  - {problem}")
+            else:
+                print(f"✅ {deck.get('name')}")
+    return failing
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Build legal BrickQuest decks to curve, type and faction targets')
+    parser.add_argument('--faction', help='Deck faction (cards of that faction and Neutral are legal)')
+    parser.add_argument('--decks', type=int, default=1000, help='Distinct decks to build')
+    parser.add_argument('--targets', type=Path, help='JSON targets (see deck_targets.example.json)')
+    parser.add_argument('--copies', type=int, default=DEFAULT_COPIES, help='Copy limit for cards without limits.perDeck')
+    parser.add_argument('--seed', type=int, default=0, help='Seed')
+    parser.add_argument('--output', type=Path, help='Write decks as JSON Lines (readable by deck_analytics.py)')
+    parser.add_argument('--check', nargs='*', type=Path, metavar='PATH',
+                        help='Check decklists instead of building (default: cards/expansions/decklists)')
+
+    args = parser.parse_args()
+
+    catalog = get_catalog()
+    index = DeckIndex(catalog)
+    targets = load_targets(args.targets)
+
+    if args.check is not None:
+        failing = check_decklists(index, catalog, args.check or [DECKLIST_DIR], targets, args.copies)
+        print(f"\n{failing} decklists with problems" if failing else "\nAll decklists pass")
+        if failing:
+            raise SystemExit(1)
+        return
+
+    try:
+        rules = DeckRules(index, catalog, args.faction, targets, args.copies)
+    except ValueError as e:
+        parser.error(str(e))
+    problems = rules.impossible()
+    if problems:
+        print("❌ No legal deck can meet these targets:")
+        for problem in problems:
+            print(f"  - {problem}")
+        raise SystemExit(1)
+    build_decks(rules, args.decks, args.seed, args.output)
+
+
+if __name__ == '__main__':
+    main()
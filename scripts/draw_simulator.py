@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+BrickQuest Draw Simulator
+Monte Carlo odds of being able to cast a card on each turn for every decklist.
+Trials run in batches of vectorized partial shuffles, spread over a process
+pool; each batch has its own seed so results depend only on --seed, not on
+the number of workers.
+
+Turn model (docs/GAME_RULES.md): the opening hand is 5 cards, one card is
+drawn each later turn, and each turn grants +2 energy up to the maximum
+(5). Each turn the cheapest card in hand that the energy covers is played:
+it leaves the hand and its cost is spent.
+"""
+
+import time
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, Any, Optional, Tuple
+
+import numpy as np
+
+from card_catalog import get_catalog
+from deck_analytics import CURVE_MAX, DECKLIST_DIR, card_energy, iter_deck_files, load_decklists
+
+HAND_SIZE = 5
+ENERGY_PER_TURN = 2
+MAX_ENERGY = 5
+DEFAULT_TURNS = 6
+
+# Trials per task; also the unit that owns a random stream
+BATCH_TRIALS = 250_000
+
+# Cost given to unresolved card ids: they take up draws but are never castable
+UNRESOLVED_COST = 127
+
+
+def deck_costs(deck: Dict[str, Any], by_id: Dict[str, Dict[str, Any]]) -> Tuple[np.ndarray, int]:
+    """Energy cost of every card in a deck, and how many ids did not resolve."""
+    costs = []
+    unresolved = 0
+    for card_id in deck.get('cards', []):
+        card = by_id.get(card_id)
+        if card is None:
+            unresolved += 1
+            costs.append(UNRESOLVED_COST)
+        else:
+            costs.append(min(card_energy(card), UNRESOLVED_COST - 1))
+    return np.array(costs, dtype=np.int8), unresolved
+
+
+def cards_seen(turns: int, draws_per_turn: int = 1) -> np.ndarray:
+    """Number of cards drawn so far at each turn (opening hand included)."""
+    return HAND_SIZE + draws_per_turn * np.arange(turns)
+
+
+def energy_schedule(turns: int, max_energy: int = MAX_ENERGY) -> np.ndarray:
+    """Energy available on each turn if none has been spent (the most there can be)."""
+    return np.minimum(ENERGY_PER_TURN * np.arange(1, turns + 1), max_energy)
+
+
+def simulate_batch(task) -> Tuple[np.ndarray, np.ndarray]:
+    """Run one batch of trials for one deck.
+
+    Only the top of each shuffled deck is ever looked at, so each trial
+    does a partial Fisher-Yates shuffle of just the cards that can be
+    drawn. Returns, per turn, the number of trials that could cast a card
+    (and played it), the total energy available at the start of the turn,
+    and the number that had seen at least one card of each cost bucket.
+    """
+    costs, trials, turns, draws_per_turn, max_energy, seed_words = task
+    rng = np.random.default_rng(np.random.SeedSequence(seed_words))
+    size = len(costs)
+    seen = np.minimum(cards_seen(turns, draws_per_turn), size)
+    depth = int(seen[-1])
+
+    decks = np.broadcast_to(costs, (trials, size)).copy()
+    rows = np.arange(trials)
+    for i in range(depth):
+        j = rng.integers(i, size, trials)
+        top = decks[rows, i].copy()
+        decks[rows, i] = decks[rows, j]
+        decks[rows, j] = top
+    drawn = decks[:, :depth]
+
+    # Play the cheapest affordable card in hand each turn, spending its cost
+    position = np.arange(depth)
+    played = np.zeros((trials, depth), dtype=bool)
+    pool = np.zeros(trials, dtype=np.int64)
+    castable = np.zeros(turns, dtype=np.int64)
+    energy = np.zeros(turns, dtype=np.int64)
+    for turn in range(turns):
+        pool = np.minimum(pool + ENERGY_PER_TURN, max_energy)
+        energy[turn] = pool.sum()
+        in_hand = (position < seen[turn]) & ~played
+        hand = np.where(in_hand, drawn, UNRESOLVED_COST)
+        pick = hand.argmin(axis=1)
+        cost = hand[rows, pick].astype(np.int64)
+        cast = cost <= pool
+        castable[turn] = cast.sum()
+        played[rows[cast], pick[cast]] = True
+        pool[cast] -= cost[cast]
+
+    # Position of the first card of each cost bucket (depth if never drawn)
+    buckets = np.minimum(drawn, CURVE_MAX)
+    buckets[drawn == UNRESOLVED_COST] = CURVE_MAX + 1
+    first = np.full((trials, CURVE_MAX + 1), depth, dtype=np.int64)
+    for cost in range(CURVE_MAX + 1):
+        hit = buckets == cost
+        first[:, cost] = np.where(hit.any(axis=1), hit.argmax(axis=1), depth)
+    by_cost = (first[:, None, :] < seen[None, :, None]).sum(axis=0)
+    return castable, energy, by_cost
+
+
+def simulate_deck(costs: np.ndarray, trials: int, turns: int = DEFAULT_TURNS, seed: int = 0,
+                  deck_index: int = 0, draws_per_turn: int = 1, max_energy: int = MAX_ENERGY,
+                  pool: Optional[ProcessPoolExecutor] = None) -> Dict[str, np.ndarray]:
+    """Probabilities per turn for one deck, aggregated over all batches."""
+    tasks = []
+    for batch, start in enumerate(range(0, trials, BATCH_TRIALS)):
+        size = min(BATCH_TRIALS, trials - start)
+        tasks.append((costs, size, turns, draws_per_turn, max_energy, [seed, deck_index, batch]))
+
+    results = pool.map(simulate_batch, tasks) if pool else map(simulate_batch, tasks)
+    castable = np.zeros(turns, dtype=np.int64)
+    energy = np.zeros(turns, dtype=np.int64)
+    by_cost = np.zeros((turns, CURVE_MAX + 1), dtype=np.int64)
+    for batch_castable, batch_energy, batch_by_cost in results:
+        castable += batch_castable
+        energy += batch_energy
+        by_cost += batch_by_cost
+    return {
+        'seen': np.minimum(cards_seen(turns, draws_per_turn), len(costs)),
+        'energy': energy / trials,
+        'max_energy': energy_schedule(turns, max_energy),
+        'castable': castable / trials,
+        'by_cost': by_cost / trials,
+    }
+
+
+def print_deck_report(name: str, size: int, unresolved: int, result: Dict[str, np.ndarray],
+                      trials: int, elapsed: float) -> None:
+    cost_labels = [str(i) for i in range(CURVE_MAX)] + [f"{CURVE_MAX}+"]
+    print(f"\n🃏 {name}: {size} cards, {trials:,} trials in {elapsed:.2f}s")
+    if unresolved:
+        print(f"  ⚠️  {unresolved} unresolved ids are drawn but never castable")
+    print(f"  {'Turn':>4} {'Energy':>9} {'Seen':>4} {'Castable':>9}   " +
+          ' '.join(f"{'E' + label:>6}" for label in cost_labels))
+    for turn in range(len(result['castable'])):
+        energy = f"{result['energy'][turn]:.1f}/{result['max_energy'][turn]}"
+        print(f"  {turn + 1:>4} {energy:>9} {result['seen'][turn]:>4} "
+              f"{result['castable'][turn]:>8.1%}   " +
+              ' '.join(f"{p:>6.1%}" for p in result['by_cost'][turn]))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Simulate opening-hand and turn-N draw odds for decklists')
+    parser.add_argument('paths', nargs='*', type=Path,
+                        help='Decklist files or directories (default: cards/expansions/decklists)')
+    parser.add_argument('--trials', type=int, default=1_000_000, help='Trials per deck')
+    parser.add_argument('--turns', type=int, default=DEFAULT_TURNS, help='Turns to report')
+    parser.add_argument('--draws-per-turn', type=int, default=1, help='Cards drawn on each turn after the first')
+    parser.add_argument('--max-energy', type=int, default=MAX_ENERGY, help='Energy cap')
+    parser.add_argument('--seed', type=int, default=0, help='Seed; results are identical for any --workers')
+    parser.add_argument('--workers', type=int, default=None, help='Worker processes (default: CPU count)')
+
+    args = parser.parse_args()
+    if args.turns < 1:
+        parser.error("--turns must be at least 1")
+
+    catalog = get_catalog()
+    by_id = {card.get('id'): card for card in catalog}
+    decks = [deck for path in iter_deck_files(args.paths or [DECKLIST_DIR]) for deck in load_decklists(path)]
+
+    print("Energy: mean available at the start of the turn / most possible; Castable: chance a card in hand "
+          "is affordable and played")
+    print("Columns E0..: chance of having drawn a card of that energy cost by each turn")
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        for deck_index, deck in enumerate(decks):
+            costs, unresolved = deck_costs(deck, by_id)
+            if not len(costs):
+                print(f"\n🃏 {deck.get('name')}: empty deck, skipped")
+                continue
+            start = time.perf_counter()
+            result = simulate_deck(costs, args.trials, args.turns, args.seed, deck_index,
+                                   args.draws_per_turn, args.max_energy, pool)
+            print_deck_report(str(deck.get('name')), len(costs), unresolved, result,
+                              args.trials, time.perf_counter() - start)
+
+
+if __name__ == '__main__':
+    main()
@@ -5,106 +5,375 @@ BrickQuest BrickLink Wanted List Generator
 Generates a BrickLink-compatible XML file for the starter character parts list.
 This can be imported directly to bricklink.com under Wanted Lists.
 
+Parts come from designs/bricklink_parts.json: each starter bot lists its own
+parts plus the common parts every bot uses, and packs (such as the upgrade
+pack) list theirs. An order is a count of each bot and pack; its parts are
+merged by (ITEMID, COLOR) and streamed to the XML file one ITEM at a time.
+
+Batches of orders (one per play group) are totalled together as a matrix
+product, written as one wanted list per order plus a consolidated list, and
+priced from a local price sheet.
+
 Usage:
     python scripts/generate_bricklink_xml.py
+    python scripts/generate_bricklink_xml.py --build warrior_bot=12 --build upgrade_pack=3
+    python scripts/generate_bricklink_xml.py --orders orders.json --output-dir bricklink_orders
 
 Output:
     brickquest_starter_bricklink_wantedlist.xml
 """
 
-import xml.etree.ElementTree as ET
 import os
+import re
+import csv
+import json
+import argparse
 from datetime import datetime
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, List, Any, Iterable, Iterator, Optional, Tuple
+from xml.sax.saxutils import escape
+
+# numpy is only needed for --orders batches; single wanted lists are stdlib only
+if TYPE_CHECKING:
+    import numpy as np
+
+PARTS_PATH = Path(__file__).parent.parent / 'designs' / 'bricklink_parts.json'
+PRICES_PATH = Path(__file__).parent.parent / 'designs' / 'bricklink_prices.csv'
+OUTPUT_FILE = "brickquest_starter_bricklink_wantedlist.xml"
+ORDERS_DIR = "bricklink_orders"
+CONSOLIDATED_FILE = "consolidated_wantedlist.xml"
+
+# (ITEMID, COLOR) -> quantity for one build
+PartKey = Tuple[str, int]
+
+
+def load_parts_catalog(path: Path = PARTS_PATH) -> Dict[str, Any]:
+    """Load the parts definitions and index each build's parts by (ITEMID, COLOR).
+
+    Every bot gets the shared 'common' parts added to its own; packs do
+    not. Repeated keys within a build are merged when the index is built,
+    so expanding an order never has to look at duplicates again.
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+
+    descriptions: Dict[PartKey, List[str]] = {}
+    builds: Dict[str, Dict[PartKey, int]] = {}
+    groups = [(build_id, build, True) for build_id, build in data.get('bots', {}).items()]
+    groups += [(build_id, build, False) for build_id, build in data.get('packs', {}).items()]
+
+    for build_id, build, is_bot in groups:
+        if build_id in builds:
+            raise ValueError(f"{path}: build '{build_id}' is defined twice")
+        parts = list(build.get('parts', []))
+        if is_bot:
+            parts += data.get('common', [])
+        index: Dict[PartKey, int] = {}
+        for part in parts:
+            key = (str(part['part']), int(part['color']))
+            index[key] = index.get(key, 0) + int(part['qty'])
+            seen = descriptions.setdefault(key, [])
+            if part.get('description') and part['description'] not in seen:
+                seen.append(part['description'])
+        builds[build_id] = index
+
+    return {
+        'itemtype': data.get('itemtype', 'P'),
+        'condition': data.get('condition', 'N'),
+        'builds': builds,
+        'names': {build_id: build.get('name', build_id) for build_id, build, _ in groups},
+        'descriptions': descriptions,
+        'starter_order': data.get('starter_order', {}),
+    }
+
+
+def aggregate_parts(catalog: Dict[str, Any], order: Iterable[Tuple[str, int]]) -> Dict[PartKey, int]:
+    """Total the parts for an order given as (build id, count) pairs.
+
+    The result holds one entry per distinct (ITEMID, COLOR), in the order
+    parts are first seen, so memory is bounded by the parts catalog rather
+    than by the number of builds.
+    """
+    totals: Dict[PartKey, int] = {}
+    builds = catalog['builds']
+    for build_id, count in order:
+        if build_id not in builds:
+            raise KeyError(f"Unknown build '{build_id}'")
+        for key, qty in builds[build_id].items():
+            totals[key] = totals.get(key, 0) + qty * count
+    return totals
+
+
+class WantedListWriter:
+    """Incremental writer for BrickLink wanted list XML.
+
+    Items are written as they arrive, in the same layout ElementTree
+    produced for the original hardcoded list.
+    """
+
+    def __init__(self, path: str, comment: Optional[str] = None,
+                 itemtype: str = 'P', condition: str = 'N'):
+        self.path = path
+        self.itemtype = itemtype
+        self.condition = condition
+        self.items = 0
+        self.quantity = 0
+        self._tmp_path = f"{path}.tmp"
+        self._file = open(self._tmp_path, 'w', encoding='utf-8')
+        self._file.write("<?xml version='1.0' encoding='utf-8'?>\n<INVENTORY>\n")
+        if comment:
+            self._file.write(f"  <!--{self._comment_text(comment)}-->\n")
+
+    @staticmethod
+    def _comment_text(text: str) -> str:
+        # '--' may not appear inside an XML comment
+        return text.replace('--', '- -')
+
+    def write_item(self, item_id: str, color: int, qty: int, description: Optional[str] = None) -> None:
+        self._file.write(
+            "  <ITEM>\n"
+            f"    <ITEMTYPE>{escape(self.itemtype)}</ITEMTYPE>\n"
+            f"    <ITEMID>{escape(item_id)}</ITEMID>\n"
+            f"    <COLOR>{color}</COLOR>\n"
+            f"    <MINQTY>{qty}</MINQTY>\n"
+            f"    <CONDITION>{escape(self.condition)}</CONDITION>\n"
+        )
+        if description:
+            self._file.write(f"    <!-- {self._comment_text(description)} -->\n")
+        self._file.write("  </ITEM>\n")
+        self.items += 1
+        self.quantity += qty
+
+    def close(self) -> None:
+        self._file.write("</INVENTORY>\n")
+        self._file.close()
+        os.replace(self._tmp_path, self.path)
+
+    def __enter__(self) -> 'WantedListWriter':
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self._file.close()
+            os.remove(self._tmp_path)
+
+
+def iter_wanted_items(catalog: Dict[str, Any], totals: Dict[PartKey, int]) -> Iterator[Tuple[str, int, int, str]]:
+    """(ITEMID, COLOR, MINQTY, description) for every part with a non-zero total."""
+    for (item_id, color), qty in totals.items():
+        if qty > 0:
+            yield item_id, color, qty, '; '.join(catalog['descriptions'].get((item_id, color), []))
+
+
+def write_wanted_list(catalog: Dict[str, Any], totals: Dict[PartKey, int], output_file: str,
+                      title: str = "BrickQuest Starter Parts List") -> WantedListWriter:
+    """Stream an aggregated order to a wanted list file."""
+    comment = f"{title} - Generated on {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
+    with WantedListWriter(output_file, comment, catalog['itemtype'], catalog['condition']) as writer:
+        for item_id, color, qty, description in iter_wanted_items(catalog, totals):
+            writer.write_item(item_id, color, qty, description)
+    return writer
+
+
+def parts_matrix(catalog: Dict[str, Any]) -> Tuple[List[str], List[PartKey], 'np.ndarray']:
+    """Quantity of every part in one of each build, as a (builds x parts) matrix."""
+    import numpy as np
+
+    build_ids = list(catalog['builds'])
+    part_keys: List[PartKey] = []
+    columns: Dict[PartKey, int] = {}
+    for index in catalog['builds'].values():
+        for key in index:
+            if key not in columns:
+                columns[key] = len(part_keys)
+                part_keys.append(key)
+
+    matrix = np.zeros((len(build_ids), len(part_keys)), dtype=np.int64)
+    for row, build_id in enumerate(build_ids):
+        for key, qty in catalog['builds'][build_id].items():
+            matrix[row, columns[key]] = qty
+    return build_ids, part_keys, matrix
+
+
+def load_orders(path: Path) -> List[Dict[str, Any]]:
+    """Read a batch of orders: a list of {"name", "builds": {build id: count}}."""
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    orders = data.get('orders', []) if isinstance(data, dict) else data
+    for index, order in enumerate(orders):
+        if not isinstance(order.get('builds'), dict):
+            raise ValueError(f"{path}: order {index + 1} has no 'builds' counts")
+        order.setdefault('name', f"order_{index + 1}")
+    return orders
 
-def generate_bricklink_xml():
+
+def batch_totals(catalog: Dict[str, Any], orders: List[Dict[str, Any]]) -> Tuple[List[PartKey], 'np.ndarray']:
+    """Part totals for every order at once.
+
+    Orders become an (orders x builds) count matrix; multiplying it by the
+    parts matrix gives an (orders x parts) totals matrix in one step.
+    """
+    import numpy as np
+
+    build_ids, part_keys, matrix = parts_matrix(catalog)
+    rows = {build_id: row for row, build_id in enumerate(build_ids)}
+    counts = np.zeros((len(orders), len(build_ids)), dtype=np.int64)
+    for index, order in enumerate(orders):
+        for build_id, count in order['builds'].items():
+            if build_id not in rows:
+                raise KeyError(f"Unknown build '{build_id}' in order '{order['name']}'")
+            counts[index, rows[build_id]] += int(count)
+    return part_keys, counts @ matrix
+
+
+_price_sheets: Dict[Path, Tuple[int, Dict[PartKey, float]]] = {}
+
+
+def load_price_sheet(path: Path = PRICES_PATH) -> Dict[PartKey, float]:
+    """Per-piece prices keyed by (ITEMID, COLOR) from a CSV price sheet.
+
+    The sheet is parsed once per process and kept in memory until the file
+    changes on disk.
+    """
+    path = Path(path).resolve()
+    mtime = path.stat().st_mtime_ns
+    cached = _price_sheets.get(path)
+    if cached and cached[0] == mtime:
+        return cached[1]
+
+    prices: Dict[PartKey, float] = {}
+    with open(path, 'r', encoding='utf-8', newline='') as f:
+        for row in csv.DictReader(f):
+            if row.get('ITEMID') and row.get('PRICE'):
+                prices[(row['ITEMID'].strip(), int(row['COLOR']))] = float(row['PRICE'])
+    _price_sheets[path] = (mtime, prices)
+    return prices
+
+
+def price_vector(prices: Dict[PartKey, float], part_keys: List[PartKey]) -> Tuple['np.ndarray', List[PartKey]]:
+    """Prices aligned with the part columns; unpriced parts count as zero."""
+    import numpy as np
+
+    vector = np.array([prices.get(key, 0.0) for key in part_keys], dtype=np.float64)
+    missing = [key for key in part_keys if key not in prices]
+    return vector, missing
+
+
+def order_filename(name: str) -> str:
+    slug = re.sub(r'[^a-z0-9]+', '_', name.lower()).strip('_') or 'order'
+    return f"{slug}_wantedlist.xml"
+
+
+def generate_batch(orders_path: Path, output_dir: str = ORDERS_DIR, parts_path: Path = PARTS_PATH,
+                   prices_path: Optional[Path] = None) -> List[str]:
+    """Write one wanted list per order plus a consolidated list, with cost estimates.
+
+    Without prices_path, the local sheet at PRICES_PATH is used if there is
+    one (copy bricklink_prices.example.csv to start it); a sheet that was
+    asked for but does not exist is reported.
+    """
+    try:
+        import numpy  # noqa: F401
+    except ImportError:
+        raise SystemExit("❌ --orders needs numpy: pip install numpy")
+
+    catalog = load_parts_catalog(parts_path)
+    orders = load_orders(orders_path)
+    part_keys, totals = batch_totals(catalog, orders)
+    combined = totals.sum(axis=0)
+
+    costs = None
+    if prices_path is None and PRICES_PATH.is_file():
+        prices_path = PRICES_PATH
+    if prices_path and Path(prices_path).is_file():
+        vector, missing = price_vector(load_price_sheet(prices_path), part_keys)
+        costs = totals @ vector
+        if missing:
+            print(f"⚠️  No price for {len(missing)} parts: "
+                  f"{', '.join(f'{item}/{color}' for item, color in missing)}")
+    elif prices_path:
+        print(f"⚠️  Price sheet not found: {prices_path}; costs are not estimated")
+
+    os.makedirs(output_dir, exist_ok=True)
+    files = []
+    used = set()
+    print(f"📦 {len(orders)} orders")
+    for index, order in enumerate(orders):
+        filename = order_filename(order['name'])
+        if filename in used:
+            filename = filename.replace('_wantedlist', f"_{index + 1}_wantedlist")
+        used.add(filename)
+        output_file = os.path.join(output_dir, filename)
+        writer = write_wanted_list(catalog, dict(zip(part_keys, totals[index].tolist())), output_file,
+                                   f"BrickQuest Parts List - {order['name']}")
+        files.append(output_file)
+        cost = f"  ~{costs[index]:.2f}" if costs is not None else ''
+        print(f"  {order['name']}: {writer.items} parts, {writer.quantity} pieces{cost} -> {output_file}")
+
+    output_file = os.path.join(output_dir, CONSOLIDATED_FILE)
+    writer = write_wanted_list(catalog, dict(zip(part_keys, combined.tolist())), output_file,
+                               f"BrickQuest Consolidated Parts List ({len(orders)} orders)")
+    files.append(output_file)
+    cost = f"  ~{costs.sum():.2f}" if costs is not None else ''
+    print(f"✅ Consolidated: {writer.items} parts, {writer.quantity} pieces{cost} -> {output_file}")
+    return files
+
+
+def parse_build(value: str) -> Tuple[str, int]:
+    """Parse a --build argument of the form ID or ID=COUNT."""
+    build_id, _, count = value.partition('=')
+    try:
+        return build_id, int(count) if count else 1
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid build count: {value}")
+
+
+def generate_bricklink_xml(order: Optional[List[Tuple[str, int]]] = None,
+                           output_file: str = OUTPUT_FILE, parts_path: Path = PARTS_PATH) -> str:
     """Generate BrickLink wanted list XML for BrickQuest starter parts."""
-    
-    # Core LEGO System Parts
-    # Format: (part_no, quantity, color_id, description)
-    parts = [
-        # Core torso parts (enough for 4 characters + spares)
-        ("3002", 8, 86, "Brick 2×3 - Light Bluish Gray (Engineer torso + spares)"),
-        ("3003", 8, 85, "Brick 2×2 - Dark Bluish Gray (Warrior torso)"),
-        ("3004", 8, 1, "Brick 1×2 - White (MageCore torso)"),
-        ("3003", 8, 106, "Brick 2×2 - Bright Orange (Trickster torso)"),
-        
-        # Base plates and feet
-        ("3022", 16, 0, "Plate 2×2 - Black (Base feet)"),
-        ("3023", 16, 0, "Plate 1×2 - Black (Jetpack mounts, connection plates)"),
-        ("3024", 20, 0, "Plate 1×1 - Black (Small connections)"),
-        
-        # Slope pieces
-        ("3040", 8, 106, "Slope 30° 1×2 - Bright Orange (Trickster front panel)"),
-        ("3040", 4, 4, "Slope 30° 1×2 - Red (Warrior helmet crest)"),
-        ("3747", 4, 86, "Inverted Slope 1×2 - Light Bluish Gray (Optional armor shaping)"),
-        
-        # Connection and arm parts
-        ("4085b", 16, 0, "Clip Plate 1×1 - Black (Arm sockets)"),
-        ("48729", 16, 0, "Bar 1L with Clip - Black (Arms, weapons)"),
-        ("4589", 12, 0, "Cone 1×1 - Black (Emitters, jetpack nozzles)"),
-        
-        # Sensor and detail parts
-        ("4073", 12, 41, "Round Plate 1×1 - Translucent Blue (Sensors, cores)"),
-        ("3068b", 4, 85, "Tile 2×2 - Dark Bluish Gray (Shield faces)"),
-        ("30367", 4, 1, "Dome 2×2 - White (MageCore sensor dome)"),
-        ("3957", 8, 0, "Antenna 4H - Black (Sensor arrays)"),
-        
-        # Head parts (standard minifigure heads)
-        ("3626b", 4, 4, "Minifigure Head - Yellow (Standard heads)"),
-        ("4073", 8, 86, "Round Plate 1×1 - Light Bluish Gray (Engineer head assembly)"),
-        
-        # Accent parts
-        ("3024", 4, 24, "Plate 1×1 - Yellow (Engineer belt accent)"),
-        ("3003", 4, 4, "Brick 2×2 - Red (Warrior accent chest armor)"),
-        ("3040", 4, 106, "Slope 30° 1×2 - Orange (Trickster accent slope front)"),
-        
-        # Specialized parts
-        ("3024", 4, 41, "Plate 1×1 - Translucent Blue (MageCore energy core)"),
-        ("3024", 4, 6, "Plate 1×1 - Teal (Trickster grappling hook)"),
-        
-        # Additional parts for upgrades and customization
-        ("3001", 8, 86, "Brick 2×4 - Light Bluish Gray (Base plates)"),
-        ("3001", 8, 85, "Brick 2×4 - Dark Bluish Gray (Base plates)"),
-        ("3001", 8, 1, "Brick 2×4 - White (Base plates)"),
-        ("3001", 8, 106, "Brick 2×4 - Bright Orange (Base plates)"),
-    ]
-    
-    # Create XML structure
-    root = ET.Element("INVENTORY")
-    
-    # Add comment with generation info
-    comment = ET.Comment(f"BrickQuest Starter Parts List - Generated on {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-    root.insert(0, comment)
-    
-    # Add each part to the inventory
-    for part_no, qty, color_id, description in parts:
-        item = ET.SubElement(root, "ITEM")
-        ET.SubElement(item, "ITEMTYPE").text = "P"  # P = Part
-        ET.SubElement(item, "ITEMID").text = part_no
-        ET.SubElement(item, "COLOR").text = str(color_id)
-        ET.SubElement(item, "MINQTY").text = str(qty)
-        ET.SubElement(item, "CONDITION").text = "N"  # N = New condition
-        
-        # Add description as comment
-        item_comment = ET.Comment(f" {description} ")
-        item.append(item_comment)
-    
-    # Create XML tree and write to file
-    tree = ET.ElementTree(root)
-    
-    # Format the XML nicely
-    ET.indent(tree, space="  ", level=0)
-    
-    # Write to file
-    output_file = "brickquest_starter_bricklink_wantedlist.xml"
-    tree.write(output_file, encoding="utf-8", xml_declaration=True)
-    
+    catalog = load_parts_catalog(parts_path)
+    if order is None:
+        order = list(catalog['starter_order'].items())
+
+    totals = aggregate_parts(catalog, order)
+    writer = write_wanted_list(catalog, totals, output_file)
+
     print(f"✅ Generated {output_file}")
-    print(f"📦 Total parts: {len(parts)}")
-    print(f"🧱 Total quantity: {sum(qty for _, qty, _, _ in parts)}")
+    builds = ', '.join(f"{count}× {catalog['names'].get(build_id, build_id)}" for build_id, count in order)
+    print(f"🤖 Builds: {builds}")
+    print(f"📦 Total parts: {writer.items}")
+    print(f"🧱 Total quantity: {writer.quantity}")
     print(f"📋 Import this file to BrickLink under Wanted Lists")
-    
+
     return output_file
 
+
+def main():
+    parser = argparse.ArgumentParser(description='Generate a BrickLink wanted list for BrickQuest bots')
+    parser.add_argument('--build', action='append', type=parse_build, metavar='ID[=COUNT]',
+                        help='Bot or pack to include (repeatable); defaults to the starter order')
+    parser.add_argument('--output', default=OUTPUT_FILE, help='Output XML file')
+    parser.add_argument('--parts', type=Path, default=PARTS_PATH, help='Parts definitions file')
+    parser.add_argument('--orders', type=Path, help='Batch of orders (JSON); writes one wanted list per order')
+    parser.add_argument('--output-dir', default=ORDERS_DIR, help='Output directory for --orders')
+    parser.add_argument('--prices', type=Path,
+                        help='Price sheet CSV (ITEMID,COLOR,PRICE) for cost estimates '
+                             '(default: designs/bricklink_prices.csv, if present)')
+
+    args = parser.parse_args()
+
+    try:
+        if args.orders:
+            generate_batch(args.orders, args.output_dir, args.parts, args.prices)
+        else:
+            generate_bricklink_xml(args.build, args.output, args.parts)
+    except ValueError as e:
+        raise SystemExit(f"❌ {e}")
+    except KeyError as e:
+        raise SystemExit(f"❌ {e.args[0]}")
+
+
 if __name__ == "__main__":
-    generate_bricklink_xml()
+    main()
@@ -6,51 +6,87 @@ Generates card templates and helps create new cards for the game.
 
 import json
 import random
+import hashlib
 import argparse
-from typing import Dict, List, Any
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Any, Iterable, Iterator, Optional
 from pathlib import Path
 
+from card_catalog import CardCatalog, get_catalog
+from card_model import Card, json_default
+
+# Cards per shard in seeded/parallel generation. Shards, not workers, own the
+# random streams, so output for a given seed is independent of --workers.
+SHARD_SIZE = 10000
+
+RARITY_MULTIPLIERS = {
+    'common': 1.0,
+    'uncommon': 1.2,
+    'rare': 1.5,
+    'legendary': 2.0
+}
+
+# Effect types whose value scales with rarity
+SCALED_EFFECT_TYPES = frozenset(['damage', 'heal', 'energy'])
+
+# The same stats on v2 cards, where they are numbers in 'rules'
+SCALED_RULES = frozenset(['damage', 'heal', 'range', 'energyRegen', 'maxEnergy'])
+
 class CardGenerator:
-    def __init__(self):
+    def __init__(self, catalog: Optional[CardCatalog] = None, seed: Optional[int] = None):
+        self.catalog = catalog if catalog is not None else get_catalog()
+        self.rng = random.Random(seed)
         self.card_templates = self.load_card_templates()
         self.card_types = ['action', 'structure', 'program', 'event', 'upgrade']
         self.rarities = ['common', 'uncommon', 'rare', 'legendary']
+        self._template_cards: Dict[str, tuple] = {}
+        self._basic_cards: Dict[str, Card] = {}
         
     def load_card_templates(self) -> Dict[str, List[Dict]]:
-        """Load card templates from JSON file."""
+        """Load card templates from the shared catalog."""
         template_file = Path(__file__).parent.parent / 'cards' / 'base_set.json'
         if template_file.exists():
-            with open(template_file, 'r') as f:
-                data = json.load(f)
-                return data.get('cards', [])
+            return self.catalog.set_cards(template_file)
         return []
     
-    def generate_random_card(self, card_type: str = None, rarity: str = None) -> Dict[str, Any]:
+    def template_cards(self, card_type: str) -> tuple:
+        """base_set templates for a type as Card objects, converted once.
+        
+        Types match case-insensitively: the generator uses 'action' where
+        the card sets say 'Action'.
+        """
+        card_type = card_type.lower()
+        if card_type not in self._template_cards:
+            self._template_cards[card_type] = tuple(
+                Card.from_dict(template) for template in self.card_templates
+                if str(template['type']).lower() == card_type)
+        return self._template_cards[card_type]
+    
+    def generate_random_card(self, card_type: str = None, rarity: str = None) -> Card:
         """Generate a random card based on templates."""
         if not card_type:
-            card_type = random.choice(self.card_types)
+            card_type = self.rng.choice(self.card_types)
         if not rarity:
-            rarity = random.choice(self.rarities)
+            rarity = self.rng.choice(self.rarities)
             
         # Get templates for the specified type
-        templates = [card for card in self.card_templates if card['type'] == card_type]
+        templates = self.template_cards(card_type)
         
         if not templates:
             # Create a basic template if none exist
-            return self.create_basic_template(card_type, rarity)
+            if card_type not in self._basic_cards:
+                self._basic_cards[card_type] = Card.from_dict(self.create_basic_template(card_type, rarity))
+            return self._basic_cards[card_type].replace(rarity=rarity)
         
         # Choose a random template
-        template = random.choice(templates)
+        template = self.rng.choice(templates)
         
-        # Generate variations
-        card = template.copy()
-        card['id'] = self.generate_card_id(card['name'])
-        card['rarity'] = rarity
+        # Generate variations; the template itself is never modified
+        card = template.replace(id=self.generate_card_id(template['name']), rarity=rarity)
         
         # Modify effects based on rarity
-        self.modify_effects_by_rarity(card, rarity)
-        
-        return card
+        return card.replace(**self.rarity_changes(card, rarity))
     
     def create_basic_template(self, card_type: str, rarity: str) -> Dict[str, Any]:
         """Create a basic card template."""
@@ -98,8 +134,8 @@ class CardGenerator:
             }
         }
         
-        template = templates[card_type].copy()
-        template['type'] = card_type
+        template = templates[card_type.lower()].copy()
+        template['type'] = card_type.lower()
         template['rarity'] = rarity
         template['id'] = self.generate_card_id(template['name'])
         
@@ -109,39 +145,61 @@ class CardGenerator:
         """Generate a unique card ID from the name."""
         return name.lower().replace(' ', '_').replace('-', '_')
     
-    def modify_effects_by_rarity(self, card: Dict[str, Any], rarity: str) -> None:
-        """Modify card effects based on rarity."""
-        rarity_multipliers = {
-            'common': 1.0,
-            'uncommon': 1.2,
-            'rare': 1.5,
-            'legendary': 2.0
-        }
+    def rarity_changes(self, card, rarity: str) -> Dict[str, Any]:
+        """Field values a card takes on at the given rarity.
         
-        multiplier = rarity_multipliers[rarity]
+        Works on card dicts and Card objects alike, in the generator's own
+        format (int cost, 'effects') or the v2 format (cost.energy, 'rules'),
+        and never modifies the card or its nested data.
+        """
+        multiplier = RARITY_MULTIPLIERS[rarity.lower()]
+        changes = {}
         
         # Modify cost
-        if card['cost'] > 0:
-            card['cost'] = max(1, int(card['cost'] * (2 - multiplier)))
+        cost = card['cost']
+        if isinstance(cost, dict):
+            if cost.get('energy', 0) > 0:
+                changes['cost'] = {**cost, 'energy': max(1, int(cost['energy'] * (2 - multiplier)))}
+        elif cost > 0:
+            changes['cost'] = max(1, int(cost * (2 - multiplier)))
         
         # Modify effects
-        for effect in card['effects']:
-            if effect['type'] in ['damage', 'heal', 'energy']:
-                effect['value'] = max(1, int(effect['value'] * multiplier))
+        effects = card.get('effects') or ()
+        if any(effect['type'] in SCALED_EFFECT_TYPES for effect in effects):
+            changes['effects'] = [
+                {**effect, 'value': max(1, int(effect['value'] * multiplier))}
+                if effect['type'] in SCALED_EFFECT_TYPES else effect
+                for effect in effects
+            ]
+        
+        # Modify numeric rules stats; flags and symbolic values are left alone
+        rules = card.get('rules') or {}
+        scaled = {
+            key: max(1, int(value * multiplier)) for key, value in rules.items()
+            if key in SCALED_RULES and isinstance(value, (int, float)) and not isinstance(value, bool) and value > 0
+        }
+        if scaled:
+            changes['rules'] = {**rules, **scaled}
         
         # Modify range and damage
         if 'range' in card and card['range'] > 0:
-            card['range'] = int(card['range'] * multiplier)
+            changes['range'] = int(card['range'] * multiplier)
         if 'damage' in card and card['damage'] > 0:
-            card['damage'] = int(card['damage'] * multiplier)
+            changes['damage'] = int(card['damage'] * multiplier)
+        return changes
     
-    def generate_card_set(self, count: int, card_type: str = None, rarity: str = None) -> List[Dict[str, Any]]:
-        """Generate a set of random cards."""
-        cards = []
+    def modify_effects_by_rarity(self, card: Dict[str, Any], rarity: str) -> None:
+        """Modify card effects based on rarity."""
+        card.update(self.rarity_changes(card, rarity))
+    
+    def iter_cards(self, count: int, card_type: str = None, rarity: str = None) -> Iterator[Card]:
+        """Yield random cards one at a time."""
         for _ in range(count):
-            card = self.generate_random_card(card_type, rarity)
-            cards.append(card)
-        return cards
+            yield self.generate_random_card(card_type, rarity)
+    
+    def generate_card_set(self, count: int, card_type: str = None, rarity: str = None) -> List[Card]:
+        """Generate a set of random cards."""
+        return list(self.iter_cards(count, card_type, rarity))
     
     def save_cards(self, cards: List[Dict[str, Any]], filename: str) -> None:
         """Save cards to a JSON file."""
@@ -149,29 +207,64 @@ class CardGenerator:
         output_file.parent.mkdir(exist_ok=True)
         
         with open(output_file, 'w') as f:
-            json.dump({'cards': cards}, f, indent=2)
+            json.dump({'cards': cards}, f, indent=2, default=json_default)
         
         print(f"Saved {len(cards)} cards to {output_file}")
     
+    def stream_cards(self, cards: Iterable[Dict[str, Any]], filename: str, fmt: str = 'jsonl') -> int:
+        """Write cards to disk as they are produced.
+        
+        'jsonl' writes one card per line; 'json' writes the same
+        {"cards": [...]} document as save_cards, one element at a time.
+        Only the card being written is held in memory.
+        """
+        output_file = Path(__file__).parent.parent / 'cards' / filename
+        output_file.parent.mkdir(exist_ok=True)
+        
+        count = 0
+        with open(output_file, 'w') as f:
+            if fmt == 'json':
+                f.write('{"cards": [')
+            for card in cards:
+                if fmt == 'json':
+                    f.write(',\n' if count else '\n')
+                    f.write(json.dumps(card, default=json_default))
+                else:
+                    f.write(json.dumps(card, default=json_default))
+                    f.write('\n')
+                count += 1
+            if fmt == 'json':
+                f.write('\n]}\n')
+        
+        print(f"Streamed {count} cards to {output_file}")
+        return count
+    
     def validate_card(self, card: Dict[str, Any]) -> List[str]:
         """Validate a card and return any errors."""
         errors = []
         
-        required_fields = ['id', 'name', 'type', 'cost', 'description', 'effects', 'rarity']
+        # Cards built from set templates use the v2 fields: 'text' for
+        # 'description', 'rules' for 'effects' and cost.energy for cost
+        v2 = 'rules' in card
+        required_fields = ['id', 'name', 'type', 'cost', 'text' if v2 else 'description',
+                           'rules' if v2 else 'effects', 'rarity']
         for field in required_fields:
             if field not in card:
                 errors.append(f"Missing required field: {field}")
         
-        if card['type'] not in self.card_types:
+        if 'type' in card and str(card['type']).lower() not in self.card_types:
             errors.append(f"Invalid card type: {card['type']}")
         
-        if card['rarity'] not in self.rarities:
+        if 'rarity' in card and str(card['rarity']).lower() not in self.rarities:
             errors.append(f"Invalid rarity: {card['rarity']}")
         
-        if not isinstance(card['cost'], int) or card['cost'] < 0:
+        cost = card.get('cost')
+        if isinstance(cost, dict):
+            cost = cost.get('energy')
+        if 'cost' in card and (not isinstance(cost, int) or cost < 0):
             errors.append("Cost must be a non-negative integer")
         
-        if not card['effects']:
+        if 'effects' in card and not card['effects']:
             errors.append("Card must have at least one effect")
         
         return errors
@@ -181,9 +274,10 @@ class CardGenerator:
         print(f"\n{'='*50}")
         print(f"Card: {card['name']}")
         print(f"Type: {card['type'].title()}")
-        print(f"Cost: {card['cost']} energy")
+        cost = card['cost']
+        print(f"Cost: {cost.get('energy', 0) if isinstance(cost, dict) else cost} energy")
         print(f"Rarity: {card['rarity'].title()}")
-        print(f"Description: {card['description']}")
+        print(f"Description: {card.get('description') or card.get('text')}")
         
         if 'range' in card and card['range'] > 0:
             print(f"Range: {card['range']}")
@@ -192,26 +286,128 @@ class CardGenerator:
         if 'duration' in card and card['duration'] > 0:
             print(f"Duration: {card['duration']} turns")
         
-        print("Effects:")
-        for effect in card['effects']:
-            print(f"  - {effect['description']}")
+        if card.get('effects'):
+            print("Effects:")
+            for effect in card['effects']:
+                print(f"  - {effect['description']}")
+        if card.get('rules'):
+            print("Rules:")
+            for key, value in card['rules'].items():
+                print(f"  - {key}: {value}")
         print(f"{'='*50}")
 
+def shard_seed(seed: int, shard: int) -> int:
+    """Derive a stable per-shard seed from the run seed."""
+    digest = hashlib.sha256(f"{seed}:{shard}".encode()).digest()
+    return int.from_bytes(digest[:8], 'big')
+
+_shard_generator: Optional[CardGenerator] = None
+
+def _init_shard_worker() -> None:
+    global _shard_generator
+    _shard_generator = CardGenerator()
+
+def generate_shard(task) -> List[Card]:
+    """Generate one shard of cards with its own derived seed."""
+    shard, size, seed, card_type, rarity = task
+    if _shard_generator is None:
+        _init_shard_worker()
+    _shard_generator.rng.seed(shard_seed(seed, shard))
+    return _shard_generator.generate_card_set(size, card_type, rarity)
+
+def iter_sharded_cards(count: int, card_type: str = None, rarity: str = None,
+                       seed: Optional[int] = None, workers: int = 1) -> Iterator[Card]:
+    """Yield cards shard by shard, in shard order, from a pool of workers.
+    
+    At most two shards per worker are in flight, so memory stays bounded
+    when the consumer streams cards to disk.
+    """
+    if seed is None:
+        seed = random.SystemRandom().getrandbits(64)
+    tasks = [(shard, min(SHARD_SIZE, count - start), seed, card_type, rarity)
+             for shard, start in enumerate(range(0, count, SHARD_SIZE))]
+    
+    if workers <= 1:
+        for task in tasks:
+            yield from generate_shard(task)
+        return
+    
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_shard_worker) as pool:
+        pending = deque()
+        for task in tasks:
+            pending.append(pool.submit(generate_shard, task))
+            if len(pending) >= workers * 2:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+
+def process_cards(generator: CardGenerator, cards: Iterable[Dict[str, Any]], args) -> Iterator[Dict[str, Any]]:
+    """Validate and print cards as they pass through the streaming pipeline."""
+    for i, card in enumerate(cards):
+        if args.validate:
+            errors = generator.validate_card(card)
+            if errors:
+                print(f"Card {i+1} ({card['name']}) has errors:")
+                for error in errors:
+                    print(f"  - {error}")
+        if args.print:
+            generator.print_card(card)
+        yield card
+
 def main():
     parser = argparse.ArgumentParser(description='Generate BrickQuest cards')
     parser.add_argument('--count', type=int, default=5, help='Number of cards to generate')
     parser.add_argument('--type', choices=['action', 'structure', 'program', 'event', 'upgrade'], help='Card type')
     parser.add_argument('--rarity', choices=['common', 'uncommon', 'rare', 'legendary'], help='Card rarity')
-    parser.add_argument('--output', default='generated_cards.json', help='Output filename')
+    parser.add_argument('--output', help='Output filename (default: generated_cards.json, '
+                                         'or generated_cards.jsonl for --stream --format jsonl)')
     parser.add_argument('--validate', action='store_true', help='Validate generated cards')
     parser.add_argument('--print', action='store_true', help='Print generated cards')
+    parser.add_argument('--stream', action='store_true',
+                        help='Write cards incrementally instead of building the set in memory')
+    parser.add_argument('--format', choices=['jsonl', 'json'], default='jsonl',
+                        help='Output format for --stream (JSON Lines or a streamed JSON array)')
+    parser.add_argument('--seed', type=int, help='Seed for reproducible output')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='Generate in N processes (output is identical for any N with the same --seed)')
+    parser.add_argument('--packs', type=int, help='Open N booster packs of catalog cards and report collation statistics')
+    parser.add_argument('--pack-size', type=int, help='Cards per pack (default: 10)')
+    parser.add_argument('--pack-weights', help='Pack share per rarity, e.g. common=60,uncommon=25,rare=12,mythic=3')
+    parser.add_argument('--collectors', type=int, default=1000,
+                        help='Collectors simulated for time to a full set (0 to skip)')
+    parser.add_argument('--pack-output', help='Write opened packs as JSON Lines of card ids')
     
     args = parser.parse_args()
     
+    if args.packs:
+        from card_packs import run_pack_mode
+        try:
+            run_pack_mode(args)
+        except ValueError as e:
+            parser.error(str(e))
+        return
+    
+    if args.output is None:
+        jsonl = args.stream and args.format == 'jsonl'
+        args.output = 'generated_cards.jsonl' if jsonl else 'generated_cards.json'
+    
     generator = CardGenerator()
+    sharded = args.seed is not None or args.workers > 1
+    
+    if args.stream:
+        if sharded:
+            cards = iter_sharded_cards(args.count, args.type, args.rarity, args.seed, args.workers)
+        else:
+            cards = generator.iter_cards(args.count, args.type, args.rarity)
+        count = generator.stream_cards(process_cards(generator, cards, args), args.output, args.format)
+        print(f"\nGenerated {count} cards successfully!")
+        return
     
     # Generate cards
-    cards = generator.generate_card_set(args.count, args.type, args.rarity)
+    if sharded:
+        cards = list(iter_sharded_cards(args.count, args.type, args.rarity, args.seed, args.workers))
+    else:
+        cards = generator.generate_card_set(args.count, args.type, args.rarity)
     
     # Validate cards if requested
     if args.validate:
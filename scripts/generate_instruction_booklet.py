@@ -2,10 +2,18 @@
 """
 BrickQuest Starter Bot Instruction Booklet Generator
 Creates a professional PDF instruction booklet from Stud.io renders
+
+Requires reportlab and pillow; pypdf (pip install pypdf) enables the cached,
+parallel section build, without it the booklet is built in one pass
 """
 
 import os
 import glob
+import time
+import hashlib
+import json
+import argparse
+from concurrent.futures import ProcessPoolExecutor
 from reportlab.lib.pagesizes import A4, letter
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.units import inch
@@ -14,9 +22,124 @@ from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Image, Page
 from reportlab.lib.enums import TA_CENTER, TA_LEFT
 from PIL import Image as PILImage
 
+# Step renders are downsampled to this resolution for their placed size
+TARGET_DPI = 200
+RENDER_CACHE_DIR = "designs/renders/.cache"
+# Bump to invalidate cached renders when preprocessing changes
+PREPROCESS_VERSION = 1
+
+# Bot definitions: step text, render paths and upgrades for the booklet
+BOTS_PATH = "designs/bots.json"
+BOT_FIELDS = ('id', 'name', 'color', 'description', 'steps')
+
+# Each booklet section is built as its own PDF and cached here by input hash
+SECTION_CACHE_DIR = "docs/.cache/booklet"
+
+def file_digest(path):
+    """sha1 of a file's contents"""
+    digest = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def render_key(image_path, max_width=6*inch, max_height=8*inch, dpi=TARGET_DPI):
+    """Render cache key: a hash of the source bytes and the placement settings"""
+    with open(image_path, 'rb') as f:
+        digest = hashlib.sha1(f.read())
+    digest.update(f"{PREPROCESS_VERSION}:{max_width}:{max_height}:{dpi}".encode())
+    return digest.hexdigest()
+
+def preprocess_image(image_path, max_width=6*inch, max_height=8*inch,
+                     dpi=TARGET_DPI, cache_dir=RENDER_CACHE_DIR):
+    """Downsample and recompress a render for its placed size on the page.
+    
+    Results are stored under cache_dir by a hash of the source bytes and the
+    placement settings, so unchanged renders are reused on rebuild. Returns
+    (cached_path, width, height) with the placed size in points, or None if
+    the render is missing.
+    """
+    if not os.path.exists(image_path):
+        return None
+    
+    key = render_key(image_path, max_width, max_height, dpi)
+    
+    with PILImage.open(image_path) as img:
+        img_width, img_height = img.size
+        scale = min(max_width / img_width, max_height / img_height)
+        width, height = img_width * scale, img_height * scale
+        
+        for ext in ('.png', '.jpg'):
+            cached_path = os.path.join(cache_dir, key + ext)
+            if os.path.exists(cached_path):
+                return cached_path, width, height
+
+        # Never upsample; small renders are embedded at their own resolution
+        target = (round(width / 72 * dpi), round(height / 72 * dpi))
+        if target[0] < img_width:
+            img = img.resize(target, PILImage.LANCZOS)
+
+        os.makedirs(cache_dir, exist_ok=True)
+        has_alpha = img.mode in ('RGBA', 'LA') or (img.mode == 'P' and 'transparency' in img.info)
+        if has_alpha:
+            cached_path = os.path.join(cache_dir, key + '.png')
+            tmp_path = cached_path + '.tmp'
+            img.save(tmp_path, format='PNG', optimize=True)
+        else:
+            cached_path = os.path.join(cache_dir, key + '.jpg')
+            tmp_path = cached_path + '.tmp'
+            img.convert('RGB').save(tmp_path, format='JPEG', quality=88, optimize=True)
+        os.replace(tmp_path, cached_path)
+
+    return cached_path, width, height
+
+def load_bot_definitions(path=BOTS_PATH):
+    """Load and validate a bot definitions file.
+    
+    Structural problems raise ValueError. Step renders that do not exist yet
+    are collected in 'missing_images' so callers can decide whether to fail.
+    Bots are also indexed by id under 'bots_by_id'.
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        definitions = json.load(f)
+    
+    errors = []
+    bots = definitions.get('bots')
+    if not isinstance(bots, list) or not bots:
+        raise ValueError(f"{path}: 'bots' must be a non-empty list")
+    
+    bots_by_id = {}
+    missing_images = []
+    for index, bot in enumerate(bots):
+        label = bot.get('id', f"bots[{index}]")
+        for field in BOT_FIELDS:
+            if not bot.get(field):
+                errors.append(f"{label}: missing '{field}'")
+        if bot.get('id') in bots_by_id:
+            errors.append(f"{label}: duplicate bot id")
+        bots_by_id[bot.get('id')] = bot
+        for step_num, step in enumerate(bot.get('steps') or [], 1):
+            if not isinstance(step, dict) or not step.get('text'):
+                errors.append(f"{label}: step {step_num} has no text")
+            elif step.get('image') and not os.path.exists(step['image']):
+                missing_images.append(step['image'])
+    
+    for index, upgrade in enumerate(definitions.get('upgrades', [])):
+        if not upgrade.get('name') or not upgrade.get('description'):
+            errors.append(f"upgrades[{index}]: needs 'name' and 'description'")
+    
+    if errors:
+        raise ValueError(f"{path}: invalid bot definitions:\n  " + "\n  ".join(errors))
+    
+    definitions['bots_by_id'] = bots_by_id
+    definitions['missing_images'] = missing_images
+    return definitions
+
 class BrickQuestInstructionGenerator:
-    def __init__(self, output_path="docs/BrickQuest_Starter_Bot_Instructions.pdf"):
+    def __init__(self, output_path="docs/BrickQuest_Starter_Bot_Instructions.pdf", workers=None, definitions=None):
         self.output_path = output_path
+        self.workers = workers
+        self.definitions = definitions
         self.styles = getSampleStyleSheet()
         self.setup_custom_styles()
         
@@ -61,8 +184,8 @@ class BrickQuestInstructionGenerator:
             alignment=TA_LEFT
         ))
 
-    def create_title_page(self, story):
-        """Create the title page with all four bots"""
+    def create_title_page(self, story, bots_info):
+        """Create the title page listing every bot in the booklet"""
         # Main title
         story.append(Paragraph("🧱 BrickQuest", self.styles['CustomTitle']))
         story.append(Paragraph("Starter Bot Instructions", self.styles['CustomTitle']))
@@ -73,13 +196,6 @@ class BrickQuestInstructionGenerator:
         story.append(Spacer(1, 30))
         
         # Bot overview
-        bots_info = [
-            ("🟡 Engineer Bot", "Construction, repair, defensive structures"),
-            ("🔴 Warrior Bot", "Combat, shields, offensive capabilities"),
-            ("🔵 Mage Core Bot", "Energy manipulation, sensors, magic"),
-            ("🟢 Trickster Bot", "Mobility, stealth, tactical positioning")
-        ]
-        
         for bot_name, description in bots_info:
             story.append(Paragraph(f"<b>{bot_name}</b>", self.styles['StepTitle']))
             story.append(Paragraph(description, self.styles['BodyText']))
@@ -95,47 +211,38 @@ class BrickQuestInstructionGenerator:
 
     def process_image(self, image_path, max_width=6*inch, max_height=8*inch):
         """Process and resize image for PDF"""
-        if not os.path.exists(image_path):
-            print(f"Warning: Image not found: {image_path}")
+        processed = preprocess_image(image_path, max_width, max_height)
+        if processed is None:
             return None
-            
-        # Open image to get dimensions
-        with PILImage.open(image_path) as img:
-            img_width, img_height = img.size
-            
-        # Calculate scaling to fit within max dimensions
-        scale_x = max_width / img_width
-        scale_y = max_height / img_height
-        scale = min(scale_x, scale_y)
         
-        new_width = img_width * scale
-        new_height = img_height * scale
-        
-        return Image(image_path, width=new_width, height=new_height)
+        cached_path, new_width, new_height = processed
+        return Image(cached_path, width=new_width, height=new_height)
 
-    def create_bot_instructions(self, story, bot_name, bot_color, bot_description, step_count):
+    def create_bot_instructions(self, story, bot):
         """Create instruction pages for a specific bot"""
+        bot_name = bot['name']
+        steps = bot['steps']
+        
         # Bot title page
-        story.append(Paragraph(f"{bot_color} {bot_name}", self.styles['BotTitle']))
-        story.append(Paragraph(bot_description, self.styles['CustomBodyText']))
+        story.append(Paragraph(f"{bot['color']} {bot_name}", self.styles['BotTitle']))
+        story.append(Paragraph(bot['description'], self.styles['CustomBodyText']))
         story.append(Spacer(1, 20))
         
         # Bot overview
         story.append(Paragraph("Build Steps:", self.styles['StepTitle']))
-        for i in range(1, step_count + 1):
+        for i in range(1, len(steps) + 1):
             story.append(Paragraph(f"Step {i}: [See following pages]", self.styles['CustomBodyText']))
         
         story.append(PageBreak())
         
         # Step pages
-        for step_num in range(1, step_count + 1):
+        for step_num, step in enumerate(steps, 1):
             # Step title
             story.append(Paragraph(f"Step {step_num}", self.styles['StepTitle']))
             story.append(Spacer(1, 10))
             
             # Step image
-            image_path = f"designs/renders/{bot_name.lower().replace(' ', '_')}_step_{step_num:02d}.png"
-            step_image = self.process_image(image_path)
+            step_image = self.process_image(step['image']) if step.get('image') else None
             
             if step_image:
                 story.append(step_image)
@@ -145,68 +252,16 @@ class BrickQuestInstructionGenerator:
             story.append(Spacer(1, 20))
             
             # Step description
-            step_descriptions = {
-                "Engineer Bot": [
-                    "Place the 2×2 base plate flat on the build surface.",
-                    "Add the yellow torso brick on top of the base.",
-                    "Stack the transparent blue energy core brick.",
-                    "Complete the torso with the second yellow brick.",
-                    "Place the yellow head tile on top.",
-                    "Attach the left and right arms with clips.",
-                    "Add tools and sensors to complete the build.",
-                    "Add final details and accessories."
-                ],
-                "Warrior Bot": [
-                    "Place the 4×4 base plate flat on the build surface.",
-                    "Add the main dark gray torso brick.",
-                    "Place the red chest armor on the front.",
-                    "Add the red head with orange sensor.",
-                    "Attach the left and right shoulder armor.",
-                    "Build and attach both arms.",
-                    "Equip the shield and weapon.",
-                    "Add final details and accessories."
-                ],
-                "Mage Core Bot": [
-                    "Place the round white base plate.",
-                    "Build the transparent blue hover column.",
-                    "Add the violet energy core base.",
-                    "Place the yellow energy core brick.",
-                    "Complete the core with violet top.",
-                    "Add the transparent dome head with sensors.",
-                    "Attach arms and floating energy elements.",
-                    "Add final magical effects and details."
-                ],
-                "Trickster Bot": [
-                    "Place the offset jumper plate base.",
-                    "Build the asymmetrical torso assembly.",
-                    "Add the head with dual sensors.",
-                    "Attach arms with clip systems.",
-                    "Add stealth and camouflage features.",
-                    "Install mobility enhancements.",
-                    "Add side details and sensors.",
-                    "Complete with final details."
-                ]
-            }
-            
-            if step_num <= len(step_descriptions[bot_name]):
-                story.append(Paragraph(step_descriptions[bot_name][step_num - 1], self.styles['CustomBodyText']))
+            story.append(Paragraph(step['text'], self.styles['CustomBodyText']))
             
             story.append(PageBreak())
 
-    def create_upgrade_section(self, story):
+    def create_upgrade_section(self, story, upgrades):
         """Create upgrade pack section"""
         story.append(Paragraph("🔧 Upgrade Packs", self.styles['BotTitle']))
         story.append(Paragraph("Enhance your bots with these upgrade modules:", self.styles['CustomBodyText']))
         story.append(Spacer(1, 20))
         
-        upgrades = [
-            ("Turret Module", "Add ranged attack capabilities"),
-            ("Sensor Array", "Enhanced detection and awareness"),
-            ("Shield Generator", "Improved defensive capabilities"),
-            ("Mobility Boost", "Increased movement and agility"),
-            ("Energy Core", "Enhanced power and abilities")
-        ]
-        
         for upgrade_name, description in upgrades:
             story.append(Paragraph(f"<b>{upgrade_name}</b>", self.styles['StepTitle']))
             story.append(Paragraph(description, self.styles['CustomBodyText']))
@@ -214,44 +269,195 @@ class BrickQuestInstructionGenerator:
         
         story.append(PageBreak())
 
-    def generate_pdf(self):
-        """Generate the complete PDF instruction booklet"""
+    def build_document(self, output_path, story):
+        """Lay out a story onto A4 pages"""
         doc = SimpleDocTemplate(
-            self.output_path,
+            output_path,
             pagesize=A4,
             rightMargin=72,
             leftMargin=72,
             topMargin=72,
             bottomMargin=72
         )
+        doc.build(story)
+
+    def sections(self):
+        """Booklet sections in page order as (name, builder, args, image paths)"""
+        if self.definitions is None:
+            self.definitions = load_bot_definitions()
+        bots = self.definitions['bots']
+        upgrades = [(u['name'], u['description']) for u in self.definitions.get('upgrades', [])]
         
-        story = []
+        bots_info = [(f"{bot['color']} {bot['name']}", bot['description']) for bot in bots]
+        sections = [("title", "create_title_page", (bots_info,), [])]
+        for bot in bots:
+            section_bot = {key: bot[key] for key in BOT_FIELDS}
+            images = [step['image'] for step in bot['steps'] if step.get('image')]
+            sections.append((bot['id'], "create_bot_instructions", (section_bot,), images))
+        if upgrades:
+            sections.append(("upgrades", "create_upgrade_section", (upgrades,), []))
+        return sections
+
+    def section_key(self, builder, args, image_paths):
+        """Hash of everything that goes into a section PDF"""
+        digest = hashlib.sha1(f"{PREPROCESS_VERSION}:{TARGET_DPI}:{builder}:{args!r}".encode())
+        # Any change to the layout code invalidates every section
+        digest.update(file_digest(__file__).encode())
+        for image_path in image_paths:
+            digest.update(image_path.encode())
+            digest.update(file_digest(image_path).encode() if os.path.exists(image_path) else b'missing')
+        return digest.hexdigest()
+
+    def generate_pdf(self, rebuild=False):
+        """Generate the complete PDF instruction booklet
         
-        # Title page
-        self.create_title_page(story)
+        Sections whose inputs are unchanged are taken from the section cache;
+        the rest are built in parallel and the results merged in page order.
+        Returns the section paths used, so the caller can prune the cache,
+        or None if pypdf is missing and the booklet was built in one pass.
+        """
+        try:
+            from pypdf import PdfWriter
+        except ImportError:
+            print("⚠️  pypdf not installed (pip install pypdf); building in one pass without the section cache")
+            self.generate_single_pass()
+            return None
         
-        # Bot instructions
-        bots = [
-            ("Engineer Bot", "🟡", "Construction, repair, defensive structures", 8),
-            ("Warrior Bot", "🔴", "Combat, shields, offensive capabilities", 8),
-            ("Mage Core Bot", "🔵", "Energy manipulation, sensors, magic", 8),
-            ("Trickster Bot", "🟢", "Mobility, stealth, tactical positioning", 8)
-        ]
+        start = time.perf_counter()
+        os.makedirs(SECTION_CACHE_DIR, exist_ok=True)
         
-        for bot_name, bot_color, bot_description, step_count in bots:
-            self.create_bot_instructions(story, bot_name, bot_color, bot_description, step_count)
+        section_paths = []
+        tasks = []
+        stale_images = []
+        for name, builder, args, image_paths in self.sections():
+            key = self.section_key(builder, args, image_paths)
+            section_path = os.path.join(SECTION_CACHE_DIR, f"{name}_{key}.pdf")
+            section_paths.append(section_path)
+            if rebuild or not os.path.exists(section_path):
+                tasks.append((builder, args, section_path))
+                stale_images.extend(image_paths)
         
-        # Upgrade section
-        self.create_upgrade_section(story)
+        if tasks:
+            with ProcessPoolExecutor(max_workers=self.workers) as pool:
+                # Downsample all renders across the pool first; section workers
+                # then find them in the render cache instead of resizing serially
+                list(pool.map(preprocess_image, dict.fromkeys(stale_images)))
+                for section_path in pool.map(build_section, tasks):
+                    print(f"  Built section {os.path.basename(section_path)}")
         
-        # Build PDF
-        doc.build(story)
+        writer = PdfWriter()
+        for section_path in section_paths:
+            writer.append(section_path)
+        tmp_path = self.output_path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            writer.write(f)
+        os.replace(tmp_path, self.output_path)
+        
+        elapsed = time.perf_counter() - start
+        reused = len(section_paths) - len(tasks)
         print(f"PDF instruction booklet generated: {self.output_path}")
+        print(f"  {len(tasks)} sections built, {reused} reused from cache ({elapsed:.2f}s)")
+        return section_paths
+
+    def generate_single_pass(self):
+        """Lay out every section into one story and build it in one go"""
+        start = time.perf_counter()
+        sections = self.sections()
+        with ProcessPoolExecutor(max_workers=self.workers) as pool:
+            list(pool.map(preprocess_image, dict.fromkeys(
+                image_path for _, _, _, image_paths in sections for image_path in image_paths)))
+        story = []
+        for _, builder, args, _ in sections:
+            getattr(self, builder)(story, *args)
+        tmp_path = self.output_path + '.tmp'
+        self.build_document(tmp_path, story)
+        os.replace(tmp_path, self.output_path)
+        print(f"PDF instruction booklet generated: {self.output_path} ({time.perf_counter() - start:.2f}s)")
+
+def prune_section_cache(section_paths):
+    """Drop cached section PDFs that are not in section_paths"""
+    current = {os.path.basename(path) for path in section_paths}
+    removed = 0
+    for cached in glob.glob(os.path.join(SECTION_CACHE_DIR, "*.pdf")):
+        if os.path.basename(cached) not in current:
+            os.remove(cached)
+            removed += 1
+    return removed
+
+def prune_render_cache(image_paths, cache_dir=RENDER_CACHE_DIR):
+    """Drop preprocessed renders whose source is not in image_paths
+    (at the default placement size, the only one the booklet uses)"""
+    current = {render_key(path) for path in image_paths if os.path.exists(path)}
+    removed = 0
+    for cached in glob.glob(os.path.join(cache_dir, "*")):
+        if os.path.basename(cached).split('.')[0] not in current:
+            os.remove(cached)
+            removed += 1
+    return removed
+
+def build_section(task):
+    """Build one booklet section as its own PDF (runs in a worker process)"""
+    builder, args, section_path = task
+    generator = BrickQuestInstructionGenerator()
+    story = []
+    getattr(generator, builder)(story, *args)
+    tmp_path = section_path + '.tmp'
+    generator.build_document(tmp_path, story)
+    os.replace(tmp_path, section_path)
+    return section_path
 
 def main():
     """Main function to generate the instruction booklet"""
-    generator = BrickQuestInstructionGenerator()
-    generator.generate_pdf()
+    parser = argparse.ArgumentParser(description='Generate the BrickQuest starter bot instruction booklet')
+    parser.add_argument('--bots', nargs='+', default=[BOTS_PATH],
+                        help='Bot definition files; each one produces a booklet')
+    parser.add_argument('--output', help='Output PDF path (single definitions file only)')
+    parser.add_argument('--workers', type=int, default=None, help='Section build processes (default: CPU count)')
+    parser.add_argument('--rebuild', action='store_true', help='Ignore cached sections and rebuild everything')
+    parser.add_argument('--strict', action='store_true', help='Fail if any step render is missing')
+    parser.add_argument('--no-prune', action='store_true',
+                        help='Keep cached sections and renders not used by these booklets (e.g. other bot files)')
+    
+    args = parser.parse_args()
+    if args.output and len(args.bots) > 1:
+        parser.error("--output can only be used with a single --bots file")
+    
+    # Load and check every definitions file before any PDF work starts
+    booklets = []
+    for bots_path in args.bots:
+        try:
+            definitions = load_bot_definitions(bots_path)
+        except (OSError, ValueError) as e:
+            raise SystemExit(f"❌ {e}")
+        missing = definitions['missing_images']
+        if missing:
+            print(f"⚠️  {bots_path}: {len(missing)} step renders not found:")
+            for image_path in missing:
+                print(f"    {image_path}")
+            if args.strict:
+                raise SystemExit(1)
+        output_path = args.output or definitions.get('output') or \
+            f"docs/{os.path.splitext(os.path.basename(bots_path))[0]}_Instructions.pdf"
+        booklets.append((output_path, definitions))
+    
+    used_sections = set()
+    used_images = set()
+    cached = True
+    for output_path, definitions in booklets:
+        generator = BrickQuestInstructionGenerator(output_path, workers=args.workers, definitions=definitions)
+        section_paths = generator.generate_pdf(rebuild=args.rebuild)
+        cached = cached and section_paths is not None
+        used_sections.update(section_paths or ())
+        used_images.update(path for section in generator.sections() for path in section[3])
+    
+    # Prune once, against the sections and renders of every booklet in this run
+    if not args.no_prune:
+        removed = prune_section_cache(used_sections) if cached else 0
+        if removed:
+            print(f"  Removed {removed} stale cached sections")
+        removed = prune_render_cache(used_images)
+        if removed:
+            print(f"  Removed {removed} stale preprocessed renders")
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+"""
+BrickQuest Balance Mutation Engine
+Applies balance mutation sets (the mutations.example.json format) to card
+sets without touching the source files. Each variant is an overlay of the
+mutated cards only; unchanged cards and nested data are shared with the
+base set, so thousands of variants can be generated and written as JSON
+Lines cheaply.
+
+Field semantics follow src/sim/mutate.ts: damage, ar and hp live in
+'rules', energy and exhaust in 'cost'.
+"""
+
+import json
+import random
+import time
+import argparse
+from pathlib import Path
+from typing import Dict, List, Any, Iterable, Iterator, Optional, Tuple
+
+from card_catalog import CARDS_DIR, CardCatalog, catalog_sources
+from card_model import Card, json_default
+
+DEFAULT_SOURCE = CARDS_DIR / 'expansions' / 'core_plus.json'
+
+RULES_FIELDS = frozenset(['damage', 'ar', 'hp'])
+COST_FIELDS = frozenset(['energy', 'exhaust'])
+OPERATIONS = {
+    'add': lambda current, value: current + value,
+    'set': lambda current, value: value,
+    'multiply': lambda current, value: current * value,
+}
+
+# Ranges enforced after mutation, as in mutate.ts validateCard()
+LIMITS = {
+    'energy': (0, 10),
+    'damage': (0, 20),
+    'hp': (1, 50),
+    'ar': (0, 5),
+}
+
+Overlay = Dict[str, Card]
+
+
+class CardIndex:
+    """Base cards by id, converted to immutable Cards once."""
+
+    def __init__(self, sources: Optional[List[Path]] = None):
+        catalog = CardCatalog(sources=sources)
+        self.cards: Dict[str, Card] = {}
+        for card in catalog:
+            self.cards[card.get('id')] = Card.from_dict(card)
+
+    def __contains__(self, card_id: str) -> bool:
+        return card_id in self.cards
+
+    def __getitem__(self, card_id: str) -> Card:
+        return self.cards[card_id]
+
+    def __len__(self) -> int:
+        return len(self.cards)
+
+
+def is_number(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def apply_change(card: Card, change: Dict[str, Any]) -> Card:
+    """Return a copy of the card with one field-level change applied."""
+    field = change.get('field')
+    operation = OPERATIONS.get(change.get('operation'))
+    if operation is None:
+        raise ValueError(f"unknown operation {change.get('operation')!r}")
+    value = change.get('value', 0)
+
+    if field in RULES_FIELDS:
+        rules = dict(card.get('rules') or {})
+        current = rules.get(field, 0)
+        if not is_number(current):
+            raise ValueError(f"{field} is symbolic ({current!r}), not a number")
+        rules[field] = operation(current, value)
+        return card.replace(rules=rules)
+    if field in COST_FIELDS:
+        cost = dict(card.get('cost') or {})
+        if field == 'energy':
+            cost['energy'] = max(0, operation(cost.get('energy', 0), value))
+        else:
+            cost['exhaust'] = value == 1
+        return card.replace(cost=cost)
+    raise ValueError(f"unknown field {field!r}")
+
+
+def check_limits(card: Card) -> Optional[str]:
+    """First range violation in a mutated card, if any."""
+    values = {'energy': (card.get('cost') or {}).get('energy', 0)}
+    values.update((field, (card.get('rules') or {}).get(field)) for field in RULES_FIELDS)
+    for field, value in values.items():
+        low, high = LIMITS[field]
+        if is_number(value) and not low <= value <= high:
+            return f"{field} {value} out of range ({low}-{high})"
+    return None
+
+
+def apply_mutation_set(index: CardIndex, mutations: Iterable[Dict[str, Any]]) -> Tuple[Overlay, List[str]]:
+    """Apply a mutation set as an overlay on the base cards.
+
+    A mutation whose result fails validation is skipped as a whole, leaving
+    that card as it was, and reported in the error list.
+    """
+    overlay: Overlay = {}
+    errors = []
+    for mutation in mutations:
+        card_id = mutation.get('cardId')
+        if card_id not in index:
+            errors.append(f"{card_id}: card not found")
+            continue
+        card = overlay.get(card_id) or index[card_id]
+        try:
+            for change in mutation.get('changes', []):
+                card = apply_change(card, change)
+        except ValueError as e:
+            errors.append(f"{card_id}: {e}")
+            continue
+        problem = check_limits(card)
+        if problem:
+            errors.append(f"{card_id}: validation failed: {problem}")
+            continue
+        overlay[card_id] = card
+    return overlay, errors
+
+
+def load_variants(path: Path) -> Iterator[Dict[str, Any]]:
+    """Read variants as {"name", "mutations"} records.
+
+    Accepts a single mutation set (a list of mutations, as in
+    mutations.example.json), {"variants": [...]}, or JSON Lines with one
+    variant per line.
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        if path.suffix == '.jsonl':
+            for line_no, line in enumerate(f, 1):
+                if line.strip():
+                    variant = json.loads(line)
+                    variant.setdefault('name', f"{path.stem}:{line_no}")
+                    yield variant
+            return
+        data = json.load(f)
+    if isinstance(data, list):
+        yield {'name': path.stem, 'mutations': data}
+        return
+    for number, variant in enumerate(data.get('variants', []), 1):
+        variant.setdefault('name', f"{path.stem}:{number}")
+        yield variant
+
+
+def random_variants(index: CardIndex, count: int, mutations_per_variant: int = 3,
+                    seed: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+    """Random +/-1 tweaks to existing stats, for sweeping the balance space."""
+    rng = random.Random(seed)
+    targets = []
+    for card_id, card in index.cards.items():
+        rules = card.get('rules') or {}
+        targets.append((card_id, 'energy'))
+        targets.extend((card_id, field) for field in sorted(RULES_FIELDS) if is_number(rules.get(field)))
+    for number in range(1, count + 1):
+        mutations = []
+        for card_id, field in rng.sample(targets, min(mutations_per_variant, len(targets))):
+            mutations.append({
+                'cardId': card_id,
+                'changes': [{'field': field, 'operation': 'add', 'value': rng.choice((-1, 1))}],
+                'reason': 'random sweep',
+            })
+        yield {'name': f"random_{number:05d}", 'mutations': mutations}
+
+
+def iter_mutated_variants(index: CardIndex, variants: Iterable[Dict[str, Any]]) -> Iterator[Tuple[str, Overlay, List[str]]]:
+    """(name, overlay, errors) for each variant, one at a time."""
+    for variant in variants:
+        overlay, errors = apply_mutation_set(index, variant.get('mutations', []))
+        yield variant['name'], overlay, errors
+
+
+def variant_cards(index: CardIndex, overlay: Overlay) -> List[Card]:
+    """The full card set of a variant: base cards with the overlay applied."""
+    return [overlay.get(card_id, card) for card_id, card in index.cards.items()]
+
+
+def write_variants(index: CardIndex, variants: Iterable[Dict[str, Any]], output_file: Path,
+                   full: bool = False) -> Dict[str, int]:
+    """Stream variants to JSON Lines, one variant per line."""
+    stats = {'variants': 0, 'cards': 0, 'errors': 0}
+    with open(output_file, 'w', encoding='utf-8') as f:
+        for name, overlay, errors in iter_mutated_variants(index, variants):
+            record = {
+                'variant': name,
+                'mutated': sorted(overlay),
+                'errors': errors,
+                'cards': variant_cards(index, overlay) if full else list(overlay.values()),
+            }
+            f.write(json.dumps(record, ensure_ascii=False, default=json_default))
+            f.write('\n')
+            stats['variants'] += 1
+            stats['cards'] += len(overlay)
+            stats['errors'] += len(errors)
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Apply balance mutation sets to BrickQuest cards')
+    parser.add_argument('mutations', nargs='*', type=Path,
+                        help='Mutation set files (.json list, {"variants": [...]}, or .jsonl)')
+    parser.add_argument('--source', nargs='+', type=Path, default=[DEFAULT_SOURCE],
+                        help='Card set files to mutate (default: expansions/core_plus.json)')
+    parser.add_argument('--all-sets', action='store_true', help='Mutate the whole catalog')
+    parser.add_argument('--random', type=int, metavar='N', help='Also generate N random variants')
+    parser.add_argument('--per-variant', type=int, default=3, help='Mutations per random variant')
+    parser.add_argument('--seed', type=int, help='Seed for --random')
+    parser.add_argument('--full', action='store_true', help='Write the full card set per variant, not just changed cards')
+    parser.add_argument('--output', type=Path, default=Path('mutated_variants.jsonl'), help='JSON Lines output file')
+
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    index = CardIndex(catalog_sources() if args.all_sets else args.source)
+    variants: List[Iterable[Dict[str, Any]]] = [load_variants(path) for path in args.mutations]
+    if args.random:
+        variants.append(random_variants(index, args.random, args.per_variant, args.seed))
+    if not variants:
+        parser.error("give mutation files and/or --random N")
+
+    stats = write_variants(index, (v for source in variants for v in source), args.output, args.full)
+    elapsed = time.perf_counter() - start
+    rate = stats['variants'] / elapsed if elapsed > 0 else float('inf')
+    print(f"✅ {stats['variants']:,} variants over {len(index)} cards -> {args.output}")
+    print(f"  {stats['cards']:,} mutated cards, {stats['errors']:,} rejected mutations")
+    print(f"  {elapsed:.2f}s ({rate:,.0f} variants/sec)")
+
+
+if __name__ == '__main__':
+    main()
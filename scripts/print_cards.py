@@ -4,103 +4,60 @@ BrickQuest Card Printer
 Converts generated cards into printable HTML/PDF format for physical card printing.
 """
 
+import io
 import json
+import time
+import sqlite3
+import hashlib
 import argparse
+import functools
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Iterator, Optional, TextIO, Tuple
 import webbrowser
 import tempfile
 import os
 
-class CardPrinter:
-    def __init__(self):
-        self.card_size = {
-            'width': '2.5in',  # Standard playing card size
-            'height': '3.5in'
-        }
-        self.margin = '0.125in'
-        
-    def load_cards(self, cards_file: str) -> List[Dict[str, Any]]:
-        """Load cards from JSON file."""
-        with open(cards_file, 'r') as f:
-            data = json.load(f)
-            return data.get('cards', [])
-    
-    def get_rarity_color(self, rarity: str) -> str:
-        """Get color for card rarity."""
-        colors = {
-            'common': '#9ca3af',      # Gray
-            'uncommon': '#10b981',    # Green
-            'rare': '#3b82f6',        # Blue
-            'legendary': '#f59e0b'    # Gold
-        }
-        return colors.get(rarity, '#9ca3af')
-    
-    def get_type_icon(self, card_type: str) -> str:
-        """Get icon for card type."""
-        icons = {
-            'action': '⚡',
-            'structure': '🏗️',
-            'program': '💻',
-            'event': '🎲',
-            'upgrade': '⬆️'
-        }
-        return icons.get(card_type, '🃏')
-    
-    def generate_card_html(self, card: Dict[str, Any]) -> str:
-        """Generate HTML for a single card."""
-        rarity_color = self.get_rarity_color(card.get('rarity', 'common'))
-        type_icon = self.get_type_icon(card.get('type', 'action'))
-        
-        # Format effects
-        effects_html = ""
-        if 'effects' in card and card['effects']:
-            effects_html = "<div class='effects'>"
-            for effect in card['effects']:
-                effects_html += f"<div class='effect'>{effect.get('description', '')}</div>"
-            effects_html += "</div>"
-        
-        # Format stats
-        stats_html = ""
-        if card.get('damage', 0) > 0:
-            stats_html += f"<div class='stat'>⚔️ {card['damage']}</div>"
-        if card.get('range', 0) > 0:
-            stats_html += f"<div class='stat'>🎯 {card['range']}</div>"
-        if card.get('duration', 0) > 0:
-            stats_html += f"<div class='stat'>⏱️ {card['duration']}</div>"
-        
-        return f"""
+from card_catalog import get_catalog
+
+# Card and page templates are compiled once (bound str.format) and cards are
+# written straight to the output file, so print time stays linear in the
+# number of cards.
+CARD_TEMPLATE = """
         <div class="card" style="border-color: {rarity_color}">
             <div class="card-header" style="background: {rarity_color}20">
                 <div class="card-title">
                     <span class="type-icon">{type_icon}</span>
-                    <span class="card-name">{card.get('name', 'Unknown')}</span>
+                    <span class="card-name">{name}</span>
                 </div>
-                <div class="card-cost">{card.get('cost', {}).get('energy', 0)}</div>
+                <div class="card-cost">{energy}</div>
             </div>
             
             <div class="card-body">
-                <div class="card-description">{card.get('text', '')}</div>
+                <div class="card-description">{text}</div>
                 {effects_html}
                 {stats_html}
             </div>
             
             <div class="card-footer">
-                <div class="card-type">{card.get('type', 'action').title()}</div>
+                <div class="card-type">{type_name}</div>
                 <div class="card-rarity" style="color: {rarity_color}">
-                    {card.get('rarity', 'common').title()}
+                    {rarity_name}
                 </div>
             </div>
         </div>
         """
-    
-    def generate_printable_html(self, cards: List[Dict[str, Any]], output_file: str) -> str:
-        """Generate complete HTML file for printing."""
-        cards_html = ""
-        for card in cards:
-            cards_html += self.generate_card_html(card)
-        
-        html_content = f"""
+
+EFFECT_TEMPLATE = "<div class='effect'>{}</div>"
+
+STAT_TEMPLATES = [
+    ('damage', "<div class='stat'>⚔️ {}</div>"),
+    ('range', "<div class='stat'>🎯 {}</div>"),
+    ('duration', "<div class='stat'>⏱️ {}</div>"),
+]
+
+PAGE_HEAD = """
 <!DOCTYPE html>
 <html lang="en">
 <head>
@@ -128,8 +85,8 @@ class CardPrinter:
         }}
         
         .card {{
-            width: {self.card_size['width']};
-            height: {self.card_size['height']};
+            width: {card_width};
+            height: {card_height};
             border: 2px solid #333;
             border-radius: 8px;
             background: white;
@@ -275,7 +232,9 @@ class CardPrinter:
     </style>
 </head>
 <body>
-    <div class="print-instructions">
+"""
+
+INSTRUCTIONS = """    <div class="print-instructions">
         <h2>🖨️ BrickQuest Card Printing Instructions</h2>
         <ul>
             <li><strong>Paper:</strong> Use 300gsm cardstock or photo paper for best results</li>
@@ -285,18 +244,295 @@ class CardPrinter:
             <li><strong>Cutting:</strong> Use a paper cutter or scissors to cut along the card borders</li>
             <li><strong>Finishing:</strong> Consider laminating for durability</li>
         </ul>
-        <p><strong>Total Cards:</strong> {len(cards)} cards</p>
-        <p><strong>Estimated Pages:</strong> {(len(cards) + 8) // 9} pages</p>
+        <p><strong>Total Cards:</strong> {total_cards} cards</p>
+        <p><strong>Estimated Pages:</strong> {total_pages} pages</p>
     </div>
     
-    <div class="print-container">
-        {cards_html}
+"""
+
+CONTAINER_OPEN = """    <div class="print-container">
+        """
+
+DOCUMENT_HEAD = PAGE_HEAD + INSTRUCTIONS + CONTAINER_OPEN
+
+DOCUMENT_TAIL = """
     </div>
 </body>
 </html>
         """
+
+# Paginated output: one A4 sheet per .print-container, matching its 3x3 grid
+CARDS_PER_PAGE = 9
+
+PAGE_CONTAINER_OPEN = """
+    <div class="print-container" style="break-after: page">
+        """
+
+PAGE_CONTAINER_CLOSE = """
+    </div>
+"""
+
+PAGE_TAIL = """</body>
+</html>
+"""
+
+INDEX_ENTRY = """        <li><a href="{href}">Page {number}</a> ({count} cards)</li>
+"""
+
+# Rendered cards written per write() call
+WRITE_CHUNK = 256
+
+# Distinct rendered cards kept in memory for repeated ids
+FRAGMENT_MEMO_SIZE = 1024
+
+# Bump whenever CARD_TEMPLATE or render_card output changes, so fragments
+# cached on disk by earlier versions are no longer used.
+TEMPLATE_VERSION = 1
+
+FRAGMENT_CACHE_PATH = Path(__file__).parent.parent / 'cards' / '.cache' / 'fragments.sqlite'
+FRAGMENT_CACHE_MAX_BYTES = 64 * 1024 * 1024
+
+class FragmentCache:
+    """Persistent cache of rendered card HTML with LRU size eviction.
+    
+    Fragments are keyed by a hash of the card JSON plus TEMPLATE_VERSION
+    and stored in a small SQLite table alongside their size and last use.
+    """
+    
+    def __init__(self, path: Path = FRAGMENT_CACHE_PATH, max_bytes: int = FRAGMENT_CACHE_MAX_BYTES):
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._used: Dict[str, float] = {}
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(str(self.path), timeout=30)
+        try:
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS fragments "
+                "(key TEXT PRIMARY KEY, html TEXT NOT NULL, size INTEGER NOT NULL, used REAL NOT NULL)"
+            )
+        except sqlite3.Error:
+            self._db.close()
+            raise
+    
+    @staticmethod
+    def key_for(card_json: str) -> str:
+        return hashlib.sha1(f"{TEMPLATE_VERSION}:{card_json}".encode('utf-8')).hexdigest()
+    
+    def get(self, key: str) -> Optional[str]:
+        row = self._db.execute("SELECT html FROM fragments WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._used[key] = time.time()
+        return row[0]
+    
+    def put(self, key: str, html: str) -> None:
+        size = len(html.encode('utf-8'))
+        self._db.execute(
+            "INSERT OR REPLACE INTO fragments (key, html, size, used) VALUES (?, ?, ?, ?)",
+            (key, html, size, time.time()),
+        )
+    
+    def flush(self) -> None:
+        """Record last-use times for hits and commit pending fragments."""
+        if self._used:
+            self._db.executemany("UPDATE fragments SET used = ? WHERE key = ?",
+                                 [(used, key) for key, used in self._used.items()])
+            self._used.clear()
+        self._db.commit()
+    
+    def evict(self) -> int:
+        """Drop least recently used fragments until the cache fits max_bytes."""
+        self.flush()
+        total = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM fragments").fetchone()[0]
+        evicted = 0
+        if total > self.max_bytes:
+            for key, size in self._db.execute("SELECT key, size FROM fragments ORDER BY used").fetchall():
+                if total <= self.max_bytes:
+                    break
+                self._db.execute("DELETE FROM fragments WHERE key = ?", (key,))
+                total -= size
+                evicted += 1
+            self._db.commit()
+        return evicted
+    
+    def close(self) -> None:
+        self.flush()
+        self._db.close()
+    
+    def report(self) -> str:
+        lookups = self.hits + self.misses
+        rate = 100.0 * self.hits / lookups if lookups else 0.0
+        return f"{self.hits} hits, {self.misses} misses ({rate:.1f}% hit rate)"
+
+def open_fragment_cache(path: Path = FRAGMENT_CACHE_PATH,
+                        max_bytes: int = FRAGMENT_CACHE_MAX_BYTES) -> Optional[FragmentCache]:
+    """Open the fragment cache, or None if it can't be used (read-only tree, locked or corrupt DB)."""
+    try:
+        return FragmentCache(path, max_bytes)
+    except (OSError, sqlite3.Error) as e:
+        print(f"⚠️  Card cache unavailable ({path}: {e}); rendering without it")
+        return None
+
+class CardPrinter:
+    def __init__(self, fragment_cache: Optional[FragmentCache] = None):
+        self.card_size = {
+            'width': '2.5in',  # Standard playing card size
+            'height': '3.5in'
+        }
+        self.margin = '0.125in'
+        self._card_template = CARD_TEMPLATE.format
+        self._document_head = functools.partial(
+            DOCUMENT_HEAD.format,
+            card_width=self.card_size['width'],
+            card_height=self.card_size['height'],
+        )
+        self._fragments: 'OrderedDict[str, str]' = OrderedDict()
+        self.fragment_cache = fragment_cache
         
-        return html_content
+    def load_cards(self, cards_file: str) -> List[Dict[str, Any]]:
+        """Load cards from JSON file."""
+        return get_catalog().set_cards(cards_file)
+    
+    def get_rarity_color(self, rarity: str) -> str:
+        """Get color for card rarity."""
+        colors = {
+            'common': '#9ca3af',      # Gray
+            'uncommon': '#10b981',    # Green
+            'rare': '#3b82f6',        # Blue
+            'legendary': '#f59e0b'    # Gold
+        }
+        return colors.get(rarity, '#9ca3af')
+    
+    def get_type_icon(self, card_type: str) -> str:
+        """Get icon for card type."""
+        icons = {
+            'action': '⚡',
+            'structure': '🏗️',
+            'program': '💻',
+            'event': '🎲',
+            'upgrade': '⬆️'
+        }
+        return icons.get(card_type, '🃏')
+    
+    def generate_card_html(self, card: Dict[str, Any]) -> str:
+        """Generate HTML for a single card."""
+        key = json.dumps(card, sort_keys=True)
+        fragment = self._fragments.get(key)
+        if fragment is not None:
+            self._fragments.move_to_end(key)
+            return fragment
+        
+        if self.fragment_cache is not None:
+            cache_key = FragmentCache.key_for(key)
+            fragment = self.fragment_cache.get(cache_key)
+            if fragment is None:
+                fragment = self.render_card(card)
+                self.fragment_cache.put(cache_key, fragment)
+        else:
+            fragment = self.render_card(card)
+        self._fragments[key] = fragment
+        if len(self._fragments) > FRAGMENT_MEMO_SIZE:
+            self._fragments.popitem(last=False)
+        return fragment
+    
+    def render_card(self, card: Dict[str, Any]) -> str:
+        """Render a card through the compiled template."""
+        rarity_color = self.get_rarity_color(card.get('rarity', 'common'))
+        
+        # Format effects
+        effects_html = ""
+        if 'effects' in card and card['effects']:
+            effects_html = "<div class='effects'>" + "".join(
+                EFFECT_TEMPLATE.format(effect.get('description', '')) for effect in card['effects']
+            ) + "</div>"
+        
+        # Format stats
+        stats_html = "".join(
+            template.format(card[field]) for field, template in STAT_TEMPLATES if card.get(field, 0) > 0
+        )
+        
+        return self._card_template(
+            rarity_color=rarity_color,
+            type_icon=self.get_type_icon(card.get('type', 'action')),
+            name=card.get('name', 'Unknown'),
+            energy=card.get('cost', {}).get('energy', 0),
+            text=card.get('text', ''),
+            effects_html=effects_html,
+            stats_html=stats_html,
+            type_name=card.get('type', 'action').title(),
+            rarity_name=card.get('rarity', 'common').title(),
+        )
+    
+    def write_printable_html(self, cards: List[Dict[str, Any]], f: TextIO) -> None:
+        """Stream the printable HTML document to an open file."""
+        f.write(self._document_head(total_cards=len(cards), total_pages=(len(cards) + 8) // 9))
+        chunk = []
+        for card in cards:
+            chunk.append(self.generate_card_html(card))
+            if len(chunk) >= WRITE_CHUNK:
+                f.writelines(chunk)
+                chunk = []
+        f.writelines(chunk)
+        f.write(DOCUMENT_TAIL)
+    
+    def generate_printable_html(self, cards: List[Dict[str, Any]], output_file: str) -> str:
+        """Generate complete HTML file for printing."""
+        buffer = io.StringIO()
+        self.write_printable_html(cards, buffer)
+        return buffer.getvalue()
+    
+    def render_page(self, page_cards: List[Dict[str, Any]]) -> str:
+        """Render one A4 sheet of cards as its own print container."""
+        return PAGE_CONTAINER_OPEN + "".join(
+            self.generate_card_html(card) for card in page_cards
+        ) + PAGE_CONTAINER_CLOSE
+    
+    def write_paginated_html(self, cards: List[Dict[str, Any]], output: str,
+                             split: bool = True, workers: int = 1) -> str:
+        """Render cards page by page, in parallel, and write them out.
+        
+        With split=True each sheet goes to its own page_NNNN.html inside the
+        output directory, next to an index.html; otherwise the sheets are
+        concatenated into one document. Returns the file to open.
+        """
+        pages = [cards[start:start + CARDS_PER_PAGE] for start in range(0, len(cards), CARDS_PER_PAGE)]
+        page_head = PAGE_HEAD.format(card_width=self.card_size['width'],
+                                     card_height=self.card_size['height'])
+        instructions = INSTRUCTIONS.format(total_cards=len(cards), total_pages=len(pages))
+        
+        if split:
+            out_dir = Path(output)
+            out_dir.mkdir(parents=True, exist_ok=True)
+            index_entries = []
+            for number, html in enumerate(iter_rendered_pages(self, pages, workers), 1):
+                name = f"page_{number:04d}.html"
+                with open(out_dir / name, 'w', encoding='utf-8') as f:
+                    f.write(page_head)
+                    f.write(html)
+                    f.write(PAGE_TAIL)
+                index_entries.append(INDEX_ENTRY.format(href=name, number=number,
+                                                        count=len(pages[number - 1])))
+            index_file = out_dir / 'index.html'
+            with open(index_file, 'w', encoding='utf-8') as f:
+                f.write(page_head)
+                f.write(instructions)
+                f.write('    <ul class="page-index">\n')
+                f.writelines(index_entries)
+                f.write('    </ul>\n')
+                f.write(PAGE_TAIL)
+            return str(index_file)
+        
+        with open(output, 'w', encoding='utf-8') as f:
+            f.write(page_head)
+            f.write(instructions)
+            for html in iter_rendered_pages(self, pages, workers):
+                f.write(html)
+            f.write(PAGE_TAIL)
+        return output
     
     def save_html(self, html_content: str, output_file: str):
         """Save HTML content to file."""
@@ -310,7 +546,9 @@ class CardPrinter:
         webbrowser.open(f"file://{file_path}")
         print(f"🌐 Opening {html_file} in browser for printing...")
     
-    def print_cards(self, cards_file: str, output_file: str = None, open_browser: bool = True):
+    def print_cards(self, cards_file: str, output_file: str = None, open_browser: bool = True,
+                    pages: str = None, workers: int = 1, fmt: str = 'html',
+                    pages_per_file: Optional[int] = None):
         """Main function to print cards."""
         if not output_file:
             output_file = "brickquest_printable_cards.html"
@@ -319,11 +557,32 @@ class CardPrinter:
         cards = self.load_cards(cards_file)
         print(f"📊 Found {len(cards)} cards")
         
-        print("🎨 Generating printable HTML...")
-        html_content = self.generate_printable_html(cards, output_file)
+        if fmt == 'pdf':
+            from card_pdf import render_pdf
+            
+            output_file = str(Path(output_file).with_suffix('.pdf'))
+            print("🎨 Drawing PDF card sheets...")
+            files = render_pdf(cards, output_file, pages_per_file)
+            for path in files:
+                print(f"✅ Card sheets saved to: {path}")
+            print("🎉 Card printing setup complete!")
+            return
+        
+        if pages:
+            print(f"🎨 Rendering {(len(cards) + CARDS_PER_PAGE - 1) // CARDS_PER_PAGE} pages...")
+            if pages == 'split':
+                output_file = str(Path(output_file).with_suffix(''))
+            output_file = self.write_paginated_html(cards, output_file, pages == 'split', workers)
+        else:
+            print("🎨 Writing printable HTML...")
+            with open(output_file, 'w', encoding='utf-8') as f:
+                self.write_printable_html(cards, f)
+        print(f"✅ Printable cards saved to: {output_file}")
         
-        print("💾 Saving HTML file...")
-        self.save_html(html_content, output_file)
+        if self.fragment_cache is not None:
+            evicted = self.fragment_cache.evict()
+            print(f"🗃️  Fragment cache: {self.fragment_cache.report()}"
+                  + (f", evicted {evicted}" if evicted else ""))
         
         if open_browser:
             self.open_in_browser(output_file)
@@ -332,6 +591,54 @@ class CardPrinter:
         print(f"📄 Open {output_file} in your browser and use Ctrl+P to print")
         print("📋 Make sure to select 'More settings' > 'Options' > 'Background graphics' for best results")
 
+_page_printer: Optional[CardPrinter] = None
+
+def _init_page_worker(cache_path: Optional[str]) -> None:
+    global _page_printer
+    cache = open_fragment_cache(Path(cache_path)) if cache_path else None
+    _page_printer = CardPrinter(cache)
+
+def _render_page_task(page_cards: List[Dict[str, Any]]) -> Tuple[str, int, int]:
+    """Render a page in a worker; returns the HTML and its cache hits/misses."""
+    cache = _page_printer.fragment_cache
+    before = (cache.hits, cache.misses) if cache else (0, 0)
+    html = _page_printer.render_page(page_cards)
+    if cache is None:
+        return html, 0, 0
+    cache.flush()
+    return html, cache.hits - before[0], cache.misses - before[1]
+
+def iter_rendered_pages(printer: CardPrinter, pages: List[List[Dict[str, Any]]],
+                        workers: int = 1) -> Iterator[str]:
+    """Yield rendered pages in order, rendering them in a worker pool."""
+    if workers <= 1:
+        for page_cards in pages:
+            yield printer.render_page(page_cards)
+        return
+    
+    # Bounded window of in-flight pages keeps memory flat for large runs
+    cache = printer.fragment_cache
+    if cache is not None:
+        # Commit what this process has written so workers can see it
+        cache.flush()
+    
+    def collect(future) -> str:
+        html, hits, misses = future.result()
+        if cache is not None:
+            cache.hits += hits
+            cache.misses += misses
+        return html
+    
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_page_worker,
+                             initargs=(str(cache.path) if cache else None,)) as pool:
+        pending = deque()
+        for page_cards in pages:
+            pending.append(pool.submit(_render_page_task, page_cards))
+            if len(pending) >= workers * 4:
+                yield collect(pending.popleft())
+        while pending:
+            yield collect(pending.popleft())
+
 def main():
     parser = argparse.ArgumentParser(description='Generate printable BrickQuest cards')
     parser.add_argument('--cards', default='cards/generated_cards.json', 
@@ -340,6 +647,19 @@ def main():
                        help='Output HTML file name')
     parser.add_argument('--no-browser', action='store_true',
                        help='Don\'t open browser automatically')
+    parser.add_argument('--pages', choices=['split', 'single'],
+                       help='Paginate into 9-card A4 sheets: one file per page plus an index, or one concatenated file')
+    parser.add_argument('--workers', type=int, default=1,
+                       help='Render pages in N processes (with --pages)')
+    parser.add_argument('--format', choices=['html', 'pdf'], default='html',
+                       help='Output HTML for the browser, or draw PDF sheets directly')
+    parser.add_argument('--pages-per-file', type=int,
+                       help='Split PDF output into volumes of N pages to bound memory (with --format pdf; '
+                            'default 500, 0 for one file held in memory until saved)')
+    parser.add_argument('--no-cache', action='store_true',
+                       help='Don\'t use the on-disk rendered card cache')
+    parser.add_argument('--cache-size', type=int, default=FRAGMENT_CACHE_MAX_BYTES // (1024 * 1024),
+                       help='Maximum rendered card cache size in MB')
     
     args = parser.parse_args()
     
@@ -349,8 +669,15 @@ def main():
         print("💡 Generate cards first with: python scripts/generate_cards.py")
         return
     
-    printer = CardPrinter()
-    printer.print_cards(args.cards, args.output, not args.no_browser)
+    # Only HTML output reuses rendered fragments; PDF sheets are drawn directly
+    cache = None
+    if args.format == 'html' and not args.no_cache:
+        cache = open_fragment_cache(max_bytes=args.cache_size * 1024 * 1024)
+    printer = CardPrinter(cache)
+    printer.print_cards(args.cards, args.output, not args.no_browser, args.pages, args.workers,
+                        args.format, args.pages_per_file)
+    if cache is not None:
+        cache.close()
 
 if __name__ == "__main__":
     main()
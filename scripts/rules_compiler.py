@@ -0,0 +1,394 @@
+#!/usr/bin/env python3
+"""
+BrickQuest Rules Compiler
+Compiles each card's 'rules' dict once into a resolution function over a
+compact, slotted game state, for headless balance runs that resolve
+millions of card plays. Amounts, symbolic values ("attack-1") and target
+selectors are bound when the card is compiled, so a play runs no dict
+lookups or string dispatch.
+
+The state has no board: range, area and adjacency are not modelled, and
+multi-target selectors hit every matching unit. Ongoing effects
+(duration, triggers) resolve once, when the card is played.
+"""
+
+import time
+import argparse
+from typing import Dict, List, Any, Callable, Optional, Tuple
+
+from card_catalog import get_catalog
+from deck_analytics import card_energy
+
+
+class Unit:
+    """One robot or structure on the field."""
+
+    __slots__ = ('team', 'hp', 'max_hp', 'attack', 'defense', 'ar', 'energy', 'max_energy', 'movement', 'shield')
+
+    def __init__(self, team: int, hp: int = 15, attack: int = 2, defense: int = 0, ar: int = 0,
+                 energy: int = 5, max_energy: int = 5, movement: int = 3):
+        self.team = team
+        self.hp = self.max_hp = hp
+        self.attack = attack
+        self.defense = defense
+        self.ar = ar
+        self.energy = energy
+        self.max_energy = max_energy
+        self.movement = movement
+        self.shield = 0
+
+    def snapshot(self) -> Tuple[int, ...]:
+        return tuple(getattr(self, key) for key in self.__slots__)
+
+
+class GameState:
+    """Units plus running totals for a headless game.
+
+    'caster' and 'target' are unit indexes chosen by the caller before each
+    play.
+    """
+
+    __slots__ = ('units', 'caster', 'target', 'plays', 'drawn', 'damage', 'healed', 'moved', 'pushed',
+                 'structures', 'structure_hp')
+
+    def __init__(self, units: List[Unit]):
+        self.units = units
+        self.caster = 0
+        self.target = 1
+        self.plays = self.drawn = self.damage = self.healed = self.moved = self.pushed = 0
+        self.structures = self.structure_hp = 0
+
+    def snapshot(self) -> Tuple[Any, ...]:
+        totals = tuple(getattr(self, key) for key in self.__slots__[3:])
+        return tuple(unit.snapshot() for unit in self.units) + totals
+
+
+Resolver = Callable[[GameState], None]
+Selector = Callable[[GameState], List[Unit]]
+Amount = Callable[[GameState], int]
+
+
+def deal_damage(state: GameState, unit: Unit, amount: int) -> None:
+    """Damage after defense and armor, taken from the shield first; hp never goes below 0."""
+    amount -= unit.defense + unit.ar
+    if amount <= 0 or unit.hp <= 0:
+        return
+    absorbed = min(unit.shield, amount)
+    unit.shield -= absorbed
+    dealt = min(unit.hp, amount - absorbed)
+    unit.hp -= dealt
+    state.damage += dealt
+
+
+def heal(state: GameState, unit: Unit, amount: int) -> None:
+    """Restore hp, never above the maximum."""
+    restored = min(amount, unit.max_hp - unit.hp)
+    if restored > 0 and unit.hp > 0:
+        unit.hp += restored
+        state.healed += restored
+
+
+def spend_energy(unit: Unit, cost: int) -> None:
+    unit.energy = max(0, unit.energy - cost)
+
+
+# Target selectors. Single-target ones use state.target.
+
+def _single(state: GameState) -> List[Unit]:
+    return [state.units[state.target]]
+
+
+def _self(state: GameState) -> List[Unit]:
+    return [state.units[state.caster]]
+
+
+def _enemies(state: GameState) -> List[Unit]:
+    team = state.units[state.caster].team
+    return [unit for unit in state.units if unit.team != team and unit.hp > 0]
+
+
+def _allies(state: GameState) -> List[Unit]:
+    team = state.units[state.caster].team
+    return [unit for unit in state.units if unit.team == team and unit.hp > 0]
+
+
+def _everyone(state: GameState) -> List[Unit]:
+    return [unit for unit in state.units if unit.hp > 0]
+
+
+SELECTORS: Dict[Optional[str], Selector] = {
+    None: _single,
+    'attacker': _single,
+    'electronic': _single,
+    'self': _self,
+    'enemies': _enemies,
+    'allEnemies': _enemies,
+    'adjacentEnemies': _enemies,
+    'allies': _allies,
+    'all': _everyone,
+}
+
+
+def parse_amount(value: Any) -> Optional[Amount]:
+    """Getter for a rules value: a number, or a caster stat like "attack-1".
+
+    Returns None for values that are not amounts.
+    """
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        amount = int(value)
+        return lambda state: amount
+    if isinstance(value, str):
+        for sign in ('+', '-'):
+            stat, _, offset = value.partition(sign)
+            if offset.strip().isdigit():
+                delta = int(offset) if sign == '+' else -int(offset)
+                break
+        else:
+            stat, delta = value, 0
+        stat = stat.strip()
+        if stat in ('attack', 'defense', 'movement', 'energy'):
+            return lambda state: getattr(state.units[state.caster], stat) + delta
+    return None
+
+
+def _number(value: Any) -> Optional[int]:
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        return None
+    return int(value)
+
+
+def compile_rules(card: Any) -> Resolver:
+    """Build the resolution function for one card (a dict or a Card)."""
+    rules = card.get('rules') or {}
+    cost = card_energy(card)
+    select = SELECTORS.get(rules.get('target'), _single)
+    steps: List[Resolver] = []
+
+    damage = parse_amount(rules.get('damage'))
+    if damage is not None:
+        if select is _single and _number(rules['damage']) is not None:
+            # The common case: a fixed amount at one target
+            amount = _number(rules['damage'])
+
+            def step(state, amount=amount):
+                deal_damage(state, state.units[state.target], amount)
+        else:
+            def step(state, damage=damage, select=select):
+                amount = damage(state)
+                for unit in select(state):
+                    deal_damage(state, unit, amount)
+        steps.append(step)
+
+    self_damage = _number(rules.get('selfDamage'))
+    if self_damage:
+        steps.append(lambda state: deal_damage(state, state.units[state.caster], self_damage))
+
+    restore = _number(rules.get('heal'))
+    if restore:
+        heal_select = select if rules.get('target') in ('allies', 'all') else _self
+
+        def step(state, restore=restore, select=heal_select):
+            for unit in select(state):
+                heal(state, unit, restore)
+        steps.append(step)
+
+    shield = _number(rules.get('tempHP'))
+    if shield:
+        def step(state):
+            state.units[state.caster].shield += shield
+        steps.append(step)
+
+    draw = _number(rules.get('draw'))
+    if draw:
+        def step(state):
+            state.drawn += draw
+        steps.append(step)
+
+    gain = (_number(rules.get('energy')) or 0) + (_number(rules.get('energyRegen')) or 0)
+    max_gain = _number(rules.get('maxEnergy')) or 0
+    if gain or max_gain:
+        def step(state):
+            unit = state.units[state.caster]
+            unit.max_energy += max_gain
+            unit.energy = min(unit.max_energy, unit.energy + gain)
+        steps.append(step)
+
+    movement = rules.get('movement')
+    moves = (_number(movement) or 0) + (_number(rules.get('movementBonus')) or 0) + (_number(rules.get('moveValue')) or 0)
+    if movement is True:
+        def step(state):
+            state.moved += state.units[state.caster].movement
+        steps.append(step)
+    if moves:
+        def step(state):
+            state.moved += moves
+        steps.append(step)
+
+    push = _number(rules.get('push'))
+    if push:
+        def step(state, select=select):
+            state.pushed += push * len(select(state))
+        steps.append(step)
+
+    attack = (_number(rules.get('attackBonus')) or 0) + (_number(rules.get('damageBonus')) or 0)
+    defense = (_number(rules.get('defenseBonus')) or 0) + (_number(rules.get('cover')) or 0)
+    if attack or defense:
+        def step(state):
+            unit = state.units[state.caster]
+            unit.attack += attack
+            unit.defense += defense
+        steps.append(step)
+
+    structure_hp = _number(rules.get('hp'))
+    if card.get('type') == 'Structure':
+        def step(state):
+            state.structures += 1
+            state.structure_hp += structure_hp or 0
+        steps.append(step)
+
+    steps = tuple(steps)
+
+    def resolve(state: GameState) -> None:
+        spend_energy(state.units[state.caster], cost)
+        state.plays += 1
+        for step in steps:
+            step(state)
+
+    return resolve
+
+
+def interpret(card: Dict[str, Any], state: GameState) -> None:
+    """Resolve a play straight from the rules dict (the uncompiled path).
+
+    Same semantics as compile_rules(); kept as the benchmark baseline and
+    as a cross-check of the compiled functions.
+    """
+    rules = card.get('rules') or {}
+    caster = state.units[state.caster]
+    spend_energy(caster, card_energy(card))
+    state.plays += 1
+    select = SELECTORS.get(rules.get('target'), _single)
+
+    if 'damage' in rules:
+        damage = parse_amount(rules['damage'])
+        if damage is not None:
+            amount = damage(state)
+            for unit in select(state):
+                deal_damage(state, unit, amount)
+    if _number(rules.get('selfDamage')):
+        deal_damage(state, caster, _number(rules['selfDamage']))
+    if _number(rules.get('heal')):
+        for unit in (select if rules.get('target') in ('allies', 'all') else _self)(state):
+            heal(state, unit, _number(rules['heal']))
+    if _number(rules.get('tempHP')):
+        caster.shield += _number(rules['tempHP'])
+    if _number(rules.get('draw')):
+        state.drawn += _number(rules['draw'])
+    gain = (_number(rules.get('energy')) or 0) + (_number(rules.get('energyRegen')) or 0)
+    max_gain = _number(rules.get('maxEnergy')) or 0
+    if gain or max_gain:
+        caster.max_energy += max_gain
+        caster.energy = min(caster.max_energy, caster.energy + gain)
+    if rules.get('movement') is True:
+        state.moved += caster.movement
+    state.moved += sum(_number(rules.get(key)) or 0 for key in ('movement', 'movementBonus', 'moveValue'))
+    if _number(rules.get('push')):
+        state.pushed += _number(rules['push']) * len(select(state))
+    caster.attack += (_number(rules.get('attackBonus')) or 0) + (_number(rules.get('damageBonus')) or 0)
+    caster.defense += (_number(rules.get('defenseBonus')) or 0) + (_number(rules.get('cover')) or 0)
+    if card.get('type') == 'Structure':
+        state.structures += 1
+        state.structure_hp += _number(rules.get('hp')) or 0
+
+
+class RulesCompiler:
+    """Compiled resolvers, cached per card id.
+
+    Each entry keeps the rules and cost it was compiled from, so a card that
+    reuses an id with different rules (a mutated variant, say) is recompiled
+    instead of getting the stale resolver.
+    """
+
+    def __init__(self):
+        self._cache: Dict[str, Tuple[Any, Any, Resolver]] = {}
+
+    def resolver(self, card: Any) -> Resolver:
+        card_id = card.get('id')
+        rules, cost = card.get('rules'), card.get('cost')
+        cached = self._cache.get(card_id)
+        # Identity settles the common case without comparing the rules
+        if cached is None or not ((cached[0] is rules or cached[0] == rules)
+                                  and (cached[1] is cost or cached[1] == cost)):
+            cached = self._cache[card_id] = (rules, cost, compile_rules(card))
+        return cached[2]
+
+    def invalidate(self, card_id: Optional[str] = None) -> None:
+        """Drop one card's resolver (after a rules change), or all of them."""
+        if card_id is None:
+            self._cache.clear()
+        else:
+            self._cache.pop(card_id, None)
+
+    def __len__(self) -> int:
+        return len(self._cache)
+
+
+def new_state(players: int = 4) -> GameState:
+    """Even teams of default robots (HP 15), alternating seats."""
+    return GameState([Unit(team=seat % 2) for seat in range(players)])
+
+
+def run_plays(play: Callable[[int, GameState], None], count: int, players: int, reset_every: int) -> GameState:
+    """Drive 'count' plays, rotating caster and target and resetting the state periodically."""
+    state = new_state(players)
+    for i in range(count):
+        if i % reset_every == 0:
+            state.units = new_state(players).units
+        state.caster = i % players
+        state.target = (i + 1) % players
+        play(i, state)
+    return state
+
+
+def benchmark(cards: List[Dict[str, Any]], plays: int, players: int = 4) -> None:
+    """Time compiled against interpreted resolution over the same play sequence."""
+    start = time.perf_counter()
+    compiler = RulesCompiler()
+    resolvers = [compiler.resolver(card) for card in cards]
+    compile_time = time.perf_counter() - start
+    print(f"⚙️  Compiled {len(compiler)} cards in {compile_time * 1000:.1f}ms")
+
+    n = len(cards)
+    reset_every = n * players
+    results = {}
+    for label, play in (
+        ('compiled', lambda i, state: resolvers[i % n](state)),
+        ('interpreted', lambda i, state: interpret(cards[i % n], state)),
+    ):
+        start = time.perf_counter()
+        state = run_plays(play, plays, players, reset_every)
+        elapsed = time.perf_counter() - start
+        results[label] = (state.snapshot(), elapsed)
+        print(f"  {label:<12} {plays:,} plays in {elapsed:.2f}s ({plays / elapsed:,.0f} plays/sec)")
+
+    same = results['compiled'][0] == results['interpreted'][0]
+    speedup = results['interpreted'][1] / results['compiled'][1]
+    print(f"{'✅' if same else '❌'} Final states {'match' if same else 'DIFFER'}; compiled is {speedup:.1f}x faster")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compile BrickQuest card rules and benchmark play resolution')
+    parser.add_argument('--plays', type=int, default=1_000_000, help='Card plays to resolve')
+    parser.add_argument('--players', type=int, default=4, help='Robots in the benchmark game (two teams)')
+
+    args = parser.parse_args()
+
+    cards = list(get_catalog())
+    print(f"📚 {len(cards)} catalog cards")
+    benchmark(cards, args.plays, args.players)
+
+
+if __name__ == '__main__':
+    main()
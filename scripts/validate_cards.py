@@ -0,0 +1,405 @@
+#!/usr/bin/env python3
+"""
+BrickQuest Card Validator
+Compiles cards/schema/card.schema.json once into per-field check functions
+and validates whole card files or directories in batch.
+"""
+
+import hashlib
+import json
+import re
+import time
+import argparse
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Callable, Dict, List, Any, Iterator, Optional, Tuple
+
+from card_catalog import CARDS_DIR, catalog_sources, read_card_file
+from card_db import file_digest, source_key, source_stamp
+
+SCHEMA_PATH = CARDS_DIR / 'schema' / 'card.schema.json'
+CACHE_PATH = CARDS_DIR / '.cache' / 'validation.json'
+DECKLIST_DIR = CARDS_DIR / 'expansions' / 'decklists'
+
+# Cards per task sent to a worker process
+BATCH_SIZE = 5000
+
+Check = Callable[[Any, str, List[str]], None]
+
+TYPE_CHECKS: Dict[str, Callable[[Any], bool]] = {
+    'string': lambda v: isinstance(v, str),
+    'object': lambda v: isinstance(v, dict),
+    'array': lambda v: isinstance(v, list),
+    'boolean': lambda v: isinstance(v, bool),
+    'integer': lambda v: isinstance(v, int) and not isinstance(v, bool),
+    'number': lambda v: isinstance(v, (int, float)) and not isinstance(v, bool),
+    'null': lambda v: v is None,
+}
+
+
+def compile_schema(schema: Dict[str, Any]) -> Check:
+    """Compile a JSON Schema (the draft-07 subset used by card.schema.json)
+    into a single check function.
+
+    The returned function appends "<path>: <message>" strings to the error
+    list it is given and never raises on bad data.
+    """
+    checks: List[Check] = []
+
+    if 'type' in schema:
+        type_name = schema['type']
+        is_type = TYPE_CHECKS[type_name]
+
+        def check_type(value, path, errors):
+            if not is_type(value):
+                errors.append(f"{path}: expected {type_name}, got {type(value).__name__}")
+        checks.append(check_type)
+    else:
+        is_type = None
+
+    if 'enum' in schema:
+        allowed = schema['enum']
+        allowed_set = frozenset(v for v in allowed if not isinstance(v, (dict, list)))
+
+        def check_enum(value, path, errors):
+            if isinstance(value, (dict, list)) or value not in allowed_set:
+                errors.append(f"{path}: {value!r} is not one of {allowed}")
+        checks.append(check_enum)
+
+    if 'pattern' in schema:
+        pattern = re.compile(schema['pattern'])
+
+        def check_pattern(value, path, errors):
+            if isinstance(value, str) and not pattern.search(value):
+                errors.append(f"{path}: {value!r} does not match {pattern.pattern!r}")
+        checks.append(check_pattern)
+
+    if 'minLength' in schema:
+        min_length = schema['minLength']
+
+        def check_min_length(value, path, errors):
+            if isinstance(value, str) and len(value) < min_length:
+                errors.append(f"{path}: shorter than {min_length} characters")
+        checks.append(check_min_length)
+
+    for keyword, fails, word in (('minimum', lambda v, n: v < n, '>='),
+                                 ('maximum', lambda v, n: v > n, '<=')):
+        if keyword in schema:
+            def check_bound(value, path, errors, bound=schema[keyword], fails=fails, word=word):
+                if TYPE_CHECKS['number'](value) and fails(value, bound):
+                    errors.append(f"{path}: {value} must be {word} {bound}")
+            checks.append(check_bound)
+
+    if 'required' in schema:
+        required = schema['required']
+
+        def check_required(value, path, errors):
+            if isinstance(value, dict):
+                for key in required:
+                    if key not in value:
+                        errors.append(f"{path}: missing required field '{key}'")
+        checks.append(check_required)
+
+    if 'properties' in schema:
+        properties = {key: compile_schema(sub) for key, sub in schema['properties'].items()}
+
+        def check_properties(value, path, errors):
+            if isinstance(value, dict):
+                for key, sub_value in value.items():
+                    check = properties.get(key)
+                    if check is not None:
+                        check(sub_value, f"{path}.{key}", errors)
+        checks.append(check_properties)
+
+    if 'items' in schema:
+        item_check = compile_schema(schema['items'])
+
+        def check_items(value, path, errors):
+            if isinstance(value, list):
+                for i, item in enumerate(value):
+                    item_check(item, f"{path}[{i}]", errors)
+        checks.append(check_items)
+
+    # Once the type is wrong the remaining checks only add noise
+    def check_all(value, path, errors):
+        if is_type is not None and not is_type(value):
+            checks[0](value, path, errors)
+            return
+        for check in checks:
+            check(value, path, errors)
+
+    return check_all
+
+
+class CardValidator:
+    def __init__(self, schema_path: Path = SCHEMA_PATH):
+        with open(schema_path, 'r', encoding='utf-8') as f:
+            self.schema = json.load(f)
+        self._check = compile_schema(self.schema)
+
+    def validate(self, card: Any) -> List[str]:
+        """Return every schema error for a card (empty if valid)."""
+        errors: List[str] = []
+        self._check(card, 'card', errors)
+        return errors
+
+    def validate_cards(self, cards: List[Any]) -> List[Tuple[int, List[str]]]:
+        """Validate a batch, returning (index, errors) for each invalid card."""
+        results = []
+        for i, card in enumerate(cards):
+            errors = self.validate(card)
+            if errors:
+                results.append((i, errors))
+        return results
+
+
+def iter_card_files(paths: List[Path]) -> Iterator[Path]:
+    """Expand directories into the card files beneath them."""
+    for path in paths:
+        if path.is_dir():
+            for child in sorted(path.rglob('*')):
+                if child.suffix in ('.json', '.jsonl') and 'schema' not in child.parts:
+                    yield child
+        else:
+            yield path
+
+
+def iter_file_batches(path: Path, batch_size: int = BATCH_SIZE) -> Iterator[List[Any]]:
+    """Read a .json card set or a .jsonl stream in batches."""
+    if path.suffix == '.jsonl':
+        batch = []
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                if line.strip():
+                    batch.append(json.loads(line))
+                    if len(batch) >= batch_size:
+                        yield batch
+                        batch = []
+        if batch:
+            yield batch
+        return
+    cards = read_card_file(path)
+    for start in range(0, len(cards), batch_size):
+        yield cards[start:start + batch_size]
+
+
+_worker_validator: Optional[CardValidator] = None
+
+
+def _validate_batch(batch: List[Any]) -> List[Tuple[int, List[str]]]:
+    global _worker_validator
+    if _worker_validator is None:
+        _worker_validator = CardValidator()
+    return _worker_validator.validate_cards(batch)
+
+
+def validate_paths(paths: List[Path], workers: int = 1) -> Tuple[Dict[str, List[Tuple[str, List[str]]]], int]:
+    """Validate every card under the given paths.
+
+    Returns a map of file -> [(card id, errors)] for invalid cards and the
+    total number of cards checked.
+    """
+    tasks = ((path, batch) for path in iter_card_files(paths) for batch in iter_file_batches(path))
+    report: Dict[str, List[Tuple[str, List[str]]]] = {}
+    total = 0
+
+    def collect(path, batch, invalid):
+        for index, errors in invalid:
+            card = batch[index]
+            card_id = card.get('id', f'#{index + 1}') if isinstance(card, dict) else f'#{index + 1}'
+            report.setdefault(str(path), []).append((card_id, errors))
+
+    if workers <= 1:
+        for path, batch in tasks:
+            total += len(batch)
+            collect(path, batch, _validate_batch(batch))
+        return report, total
+
+    # Keep a bounded number of batches in flight so large files stream
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        for path, batch in tasks:
+            pending.append((path, batch, pool.submit(_validate_batch, batch)))
+            if len(pending) >= workers * 2:
+                done_path, done_batch, future = pending.popleft()
+                total += len(done_batch)
+                collect(done_path, done_batch, future.result())
+        while pending:
+            done_path, done_batch, future = pending.popleft()
+            total += len(done_batch)
+            collect(done_path, done_batch, future.result())
+    return report, total
+
+
+def card_hash(card: Any) -> str:
+    """Content hash of a single card."""
+    return hashlib.sha1(json.dumps(card, sort_keys=True).encode('utf-8')).hexdigest()
+
+
+class IncrementalValidator:
+    """Validates only new or modified cards, using a persistent cache.
+
+    The cache records, per card file, its stamp, the ids it defines and the
+    schema errors for each card content hash. Unchanged files are not even
+    parsed; changed files only re-validate cards whose hash is new. The id
+    index built from the cache drives the cross-card checks: duplicate ids
+    within a file and decklist entries that do not resolve to a card.
+    """
+
+    def __init__(self, validator: Optional[CardValidator] = None, cache_path: Path = CACHE_PATH):
+        self.validator = validator or CardValidator()
+        self.cache_path = cache_path
+        self.schema_hash = file_digest(SCHEMA_PATH)
+        self.cache = self.load_cache()
+        self.checked = 0
+        self.reused = 0
+
+    def load_cache(self) -> Dict[str, Any]:
+        try:
+            with open(self.cache_path, 'r', encoding='utf-8') as f:
+                cache = json.load(f)
+        except (OSError, ValueError):
+            cache = None
+        # A schema change invalidates every cached result
+        if not cache or cache.get('schema') != self.schema_hash:
+            cache = {'schema': self.schema_hash, 'files': {}}
+        return cache
+
+    def save_cache(self) -> None:
+        try:
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.cache_path, 'w', encoding='utf-8') as f:
+                json.dump(self.cache, f)
+        except OSError as e:
+            print(f"Warning: could not write validation cache {self.cache_path}: {e}")
+
+    def update_file(self, path: Path) -> Dict[str, Any]:
+        """Bring one file's cache entry up to date and return it."""
+        key = source_key(path)
+        entry = self.cache['files'].get(key)
+        stamp = source_stamp(path)
+        if entry and entry['mtime'] == stamp['mtime'] and entry['size'] == stamp['size']:
+            self.reused += len(entry['ids'])
+            return entry
+
+        digest = file_digest(path)
+        if entry and entry['sha1'] == digest:
+            entry.update(stamp)
+            self.reused += len(entry['ids'])
+            return entry
+
+        previous = entry['results'] if entry else {}
+        ids = []
+        hashes = []
+        results = {}
+        for card in (card for batch in iter_file_batches(path) for card in batch):
+            content = card_hash(card)
+            if content in previous:
+                self.reused += 1
+                errors = previous[content]
+            else:
+                self.checked += 1
+                errors = self.validator.validate(card)
+            results[content] = errors
+            hashes.append(content)
+            ids.append(card.get('id') if isinstance(card, dict) else None)
+
+        entry = dict(stamp, sha1=digest, ids=ids, hashes=hashes, results=results)
+        self.cache['files'][key] = entry
+        return entry
+
+    def run(self, paths: List[Path],
+            decklists: Optional[List[Path]] = None) -> Dict[str, List[Tuple[str, List[str]]]]:
+        """Validate the given card files plus cross-card and decklist checks.
+
+        Only the given files are reported on, but decklist ids resolve
+        against the whole catalog as well, so a narrow run does not flag
+        cards defined in other sets.
+        """
+        report: Dict[str, List[Tuple[str, List[str]]]] = {}
+        files = list(iter_card_files(paths))
+        for path in files:
+            entry = self.update_file(path)
+            key = source_key(path)
+            invalid = [(card_id, entry['results'][content])
+                       for card_id, content in zip(entry['ids'], entry['hashes'])
+                       if entry['results'][content]]
+            if invalid:
+                report.setdefault(key, []).extend(invalid)
+
+            counts: Dict[str, int] = {}
+            for card_id in entry['ids']:
+                counts[card_id] = counts.get(card_id, 0) + 1
+            for card_id, count in counts.items():
+                if count > 1:
+                    report.setdefault(key, []).append(
+                        (card_id, [f"duplicate id {card_id} appears {count} times"]))
+
+        # Refreshing the rest of the catalog does not count towards this run's totals
+        checked, reused = self.checked, self.reused
+        known_ids = set()
+        for path in {*files, *catalog_sources()}:
+            known_ids.update(self.update_file(path)['ids'])
+        self.checked, self.reused = checked, reused
+
+        for path in decklists if decklists is not None else sorted(DECKLIST_DIR.glob('*.json')):
+            with open(path, 'r', encoding='utf-8') as f:
+                deck = json.load(f).get('decklist', {})
+            missing = sorted({card_id for card_id in deck.get('cards', []) if card_id not in known_ids})
+            if missing:
+                report.setdefault(source_key(path), []).append(
+                    (deck.get('name', path.stem), [f"unknown card id {card_id}" for card_id in missing]))
+
+        # Forget only files that have been deleted; other runs still use the rest
+        for key in list(self.cache['files']):
+            if not (CARDS_DIR / key).exists():
+                del self.cache['files'][key]
+        self.save_cache()
+        return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Validate BrickQuest cards against the card schema')
+    parser.add_argument('paths', nargs='*', help='Card files or directories (default: the catalog sets)')
+    parser.add_argument('--workers', type=int, default=1, help='Validate in N processes')
+    parser.add_argument('--max-errors', type=int, default=20, help='Invalid cards to list per file')
+    parser.add_argument('--incremental', action='store_true',
+                        help='Only re-check new or modified cards; also check ids and decklists')
+
+    args = parser.parse_args()
+
+    if args.incremental and args.workers > 1:
+        parser.error("--workers is not supported with --incremental")
+
+    paths = [Path(p) for p in args.paths] or catalog_sources()
+
+    start = time.perf_counter()
+    if args.incremental:
+        incremental = IncrementalValidator()
+        report = incremental.run(paths)
+        total = incremental.checked + incremental.reused
+        print(f"♻️  Re-checked {incremental.checked} cards, reused {incremental.reused} cached results")
+    else:
+        report, total = validate_paths(paths, args.workers)
+    elapsed = time.perf_counter() - start
+
+    invalid = 0
+    for file_name, cards in report.items():
+        invalid += len(cards)
+        print(f"❌ {file_name}: {len(cards)} invalid cards")
+        for card_id, errors in cards[:args.max_errors]:
+            print(f"  {card_id}:")
+            for error in errors:
+                print(f"    - {error}")
+        if len(cards) > args.max_errors:
+            print(f"  ... and {len(cards) - args.max_errors} more")
+
+    rate = total / elapsed if elapsed > 0 else float('inf')
+    print(f"📊 Validated {total} cards in {elapsed:.3f}s ({rate:,.0f} cards/sec), {invalid} invalid")
+    if invalid:
+        raise SystemExit(1)
+
+
+if __name__ == '__main__':
+    main()